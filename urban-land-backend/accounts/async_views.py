@@ -0,0 +1,90 @@
+# accounts/async_views.py
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q
+from django.views.decorators.http import require_GET
+
+from config.async_api import apaginate, async_login_required, json_response
+from land import snapshot
+from land.async_views import serialize_parcels
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from records.models import OwnershipRecord
+from .models import User
+
+
+@require_GET
+@async_login_required
+async def my_parcels(request):
+    """Async MyParcelsViewSet.list"""
+    queryset = LandParcel.objects.none()
+    if request.user.role == 'owner':
+        profile = await OwnerProfile.objects.filter(user=request.user).afirst()
+        if profile is not None:
+            parcel_ids = OwnershipRecord.objects.filter(
+                owner=profile,
+                is_current_owner=True
+            ).values_list('parcel_id', flat=True)
+            queryset = LandParcel.objects.filter(parcel_id__in=parcel_ids)
+
+    async def serialize(parcels):
+        return await serialize_parcels(request, parcels)
+
+    return await apaginate(request, queryset, serialize)
+
+
+@require_GET
+@async_login_required
+async def dashboard_stats(request):
+    """Async dashboard_stats: same payload, grouped into a few aggregate queries (land figures as stale)"""
+    user = request.user
+    if user.role not in ['admin', 'officer']:
+        return json_response({
+            'totalUsers': 0,
+            'totalOwners': 0,
+            'totalLands': 0,
+            'activeLands': 0,
+            'inactiveLands': 0,
+            'pendingLands': 0,
+            'landValue': 0,
+            'userDistribution': {'owners': 0, 'officers': 0, 'admins': 0},
+            'ownersWithProfiles': 0,
+            'totalRegisteredOwners': 0,
+            'recentActivities': [],
+        })
+
+    users = await User.objects.aaggregate(
+        total=Count('id'),
+        owners=Count('id', filter=Q(role='owner')),
+        officers=Count('id', filter=Q(role='officer')),
+        admins=Count('id', filter=Q(role='admin')),
+    )
+    parcels = await sync_to_async(snapshot.current)()
+    active_lands = int(parcels['is_active'].sum())
+    total_owners = await OwnerProfile.objects.acount()
+    recent_activities = [
+        {
+            'id': owner.id,
+            'type': 'owner_registration',
+            'description': f'New owner registered: {owner.first_name} {owner.last_name}',
+            'time': 'Recently'
+        }
+        async for owner in OwnerProfile.objects.order_by('-date_created')[:5]
+    ]
+
+    return json_response({
+        'totalUsers': users['total'],
+        'totalOwners': total_owners,
+        'totalLands': len(parcels),
+        'activeLands': active_lands,
+        'inactiveLands': len(parcels) - active_lands,
+        'pendingLands': 0,
+        'landValue': parcels.total('market_value') or 0,
+        'userDistribution': {
+            'owners': users['owners'],
+            'officers': users['officers'],
+            'admins': users['admins'],
+        },
+        'ownersWithProfiles': total_owners,
+        'totalRegisteredOwners': users['owners'],
+        'recentActivities': recent_activities,
+    })
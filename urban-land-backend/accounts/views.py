@@ -11,6 +11,7 @@ from .serializers import (
 
 # Import the correct serializer from land app
 from land.serializers import LandParcelSerializer
+from land import snapshot
 from land.models import LandParcel
 from owners.models import OwnerProfile
 from records.models import OwnershipRecord
@@ -22,6 +23,7 @@ from django.db.models import Count, Sum, Q
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
+    """Land figures come from the parcel snapshot and may be up to PARCEL_SNAPSHOT_MAX_AGE seconds stale"""
     try:
         user = request.user
         
@@ -42,9 +44,10 @@ def dashboard_stats(request):
             users_with_owner_role = User.objects.filter(role='owner').count()
             
             # Land statistics
-            total_lands = LandParcel.objects.count()
-            active_lands = LandParcel.objects.filter(is_active=True).count()
-            inactive_lands = LandParcel.objects.filter(is_active=False).count()
+            parcels = snapshot.current()
+            total_lands = len(parcels)
+            active_lands = int(parcels['is_active'].sum())
+            inactive_lands = total_lands - active_lands
             
             # If you have a status field in LandParcel model, use this instead:
             # active_lands = LandParcel.objects.filter(status='Active').count()
@@ -55,9 +58,7 @@ def dashboard_stats(request):
             pending_lands = 0
             
             # Total land value
-            total_land_value = LandParcel.objects.aggregate(
-                total_value=Sum('current_market_value')
-            )['total_value'] or 0
+            total_land_value = parcels.total('market_value') or 0
             
             # Recent activities (last 5 registered owners)
             recent_owners = OwnerProfile.objects.order_by('-date_created')[:5]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_work_queue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TurnaroundStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application_type', models.CharField(blank=True, max_length=50)),
+                ('decided', models.PositiveIntegerField(default=0)),
+                ('total_days', models.PositiveBigIntegerField(default=0)),
+                ('histogram', models.JSONField(default=list)),
+                ('median_days', models.PositiveIntegerField(blank=True, null=True)),
+                ('p90_days', models.PositiveIntegerField(blank=True, null=True)),
+                ('backlog', models.PositiveIntegerField(default=0)),
+                ('oldest_pending', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reviewer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('reviewer__isnull', False)), fields=('application_type', 'reviewer'), name='unique_turnaround_per_reviewer'), models.UniqueConstraint(condition=models.Q(('reviewer__isnull', True)), fields=('application_type',), name='unique_turnaround_all_reviewers')],
+            },
+        ),
+    ]
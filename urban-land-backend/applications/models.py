@@ -15,6 +15,20 @@ class Application(models.Model):
     submitted_date = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=50, default="submitted")
 
+    # Review work queue (applications.queue): the officer holding the lease,
+    # the token of the claim that took it and when it lapses
+    assigned_to = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="assigned_applications"
+    )
+    lease_token = models.UUIDField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "submitted_date"], name="application_queue_idx"),
+            models.Index(fields=["assigned_to", "lease_expires_at"], name="application_reviewer_idx"),
+        ]
+
 class Approval(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE)
     reviewer = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -33,3 +47,37 @@ class Payment(models.Model):
     payment_date = models.DateField(auto_now_add=True)
     payment_type = models.CharField(max_length=50)
     status = models.CharField(max_length=50, default="pending")
+
+
+class TurnaroundStats(models.Model):
+    """
+    Running turnaround statistics (submitted_date to final Approval) for one
+    application type and reviewer. A blank type covers all types and a null
+    reviewer covers all reviewers; backlog fields are kept on the
+    all-reviewer rows only. Maintained by applications.sla.
+    """
+    application_type = models.CharField(max_length=50, blank=True)
+    reviewer = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    decided = models.PositiveIntegerField(default=0)
+    total_days = models.PositiveBigIntegerField(default=0)
+    # Decisions per turnaround day, the last bucket holding everything longer
+    histogram = models.JSONField(default=list)
+    median_days = models.PositiveIntegerField(null=True, blank=True)
+    p90_days = models.PositiveIntegerField(null=True, blank=True)
+    backlog = models.PositiveIntegerField(default=0)
+    oldest_pending = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["application_type", "reviewer"],
+                condition=models.Q(reviewer__isnull=False),
+                name="unique_turnaround_per_reviewer",
+            ),
+            models.UniqueConstraint(
+                fields=["application_type"],
+                condition=models.Q(reviewer__isnull=True),
+                name="unique_turnaround_all_reviewers",
+            ),
+        ]
@@ -0,0 +1,94 @@
+# applications/queue.py
+"""
+Review work queue for officers.
+
+A submitted application is claimable when nobody holds a live lease on it.
+claim() leases the oldest claimable applications to one officer:
+
+- On databases with SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL, MySQL 8)
+  the candidate rows are locked while they are leased, and concurrent
+  claims skip them instead of waiting, so officers never block each other.
+- Elsewhere each claim stamps its candidates with a fresh lease token using
+  an UPDATE that re-checks claimability (compare-and-set). Rows another
+  officer won in the meantime are simply not updated; the claim then reads
+  back what it holds by token and tops up with new candidates.
+
+Leases lapse after APPLICATION_LEASE_MINUTES and the application becomes
+claimable again without any cleanup job.
+"""
+import datetime
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Application
+
+CLAIMABLE_STATUSES = ("submitted",)
+CAS_ROUNDS = 3
+
+
+def lease_duration():
+    return datetime.timedelta(minutes=settings.APPLICATION_LEASE_MINUTES)
+
+
+def claimable(now=None):
+    now = now or timezone.now()
+    return (Application.objects
+            .filter(status__in=CLAIMABLE_STATUSES)
+            .filter(Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now))
+            .order_by("submitted_date", "id"))
+
+
+def held_by(user, now=None):
+    """The reviewer's queue: applications they hold a live lease on"""
+    return (Application.objects
+            .filter(assigned_to=user, lease_expires_at__gt=now or timezone.now())
+            .order_by("lease_expires_at", "id"))
+
+
+def claim(user, count):
+    """Lease up to ``count`` of the oldest claimable applications to ``user``"""
+    token = uuid.uuid4()
+    now = timezone.now()
+    lease = {"assigned_to": user, "lease_token": token, "lease_expires_at": now + lease_duration()}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(claimable(now).select_for_update(skip_locked=True).values_list("id", flat=True)[:count])
+            Application.objects.filter(id__in=ids).update(**lease)
+    else:
+        claimed = 0
+        for _ in range(CAS_ROUNDS):
+            ids = list(claimable(now).values_list("id", flat=True)[:count - claimed])
+            if not ids:
+                break
+            # The claimable() condition is re-checked by the UPDATE itself
+            claimed += claimable(now).filter(id__in=ids).update(**lease)
+            if claimed >= count:
+                break
+    return list(Application.objects.filter(lease_token=token).order_by("submitted_date", "id"))
+
+
+def holds(application, user):
+    """Whether ``user`` holds a live lease on the application; locks the row inside a transaction"""
+    return (Application.objects.select_for_update()
+            .filter(pk=application.pk, assigned_to=user, lease_expires_at__gt=timezone.now())
+            .exists())
+
+
+def renew(application, user):
+    """Extend the reviewer's live lease; returns False if they no longer hold it"""
+    now = timezone.now()
+    return bool(Application.objects
+                .filter(pk=application.pk, assigned_to=user, lease_expires_at__gt=now)
+                .update(lease_expires_at=now + lease_duration()))
+
+
+def release(application, user):
+    """Give the application back to the queue; returns False if the reviewer did not hold it"""
+    return bool(Application.objects
+                .filter(pk=application.pk, assigned_to=user, lease_expires_at__gt=timezone.now())
+                .update(assigned_to=None, lease_token=None, lease_expires_at=None))
@@ -4,12 +4,17 @@ from .models import Application, Approval, Payment
 class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
-        fields = "__all__"
+        exclude = ["lease_token"]
+        # Leases only change through the work queue actions and the status
+        # through approvals
+        read_only_fields = ["status", "assigned_to", "lease_expires_at"]
 
 class ApprovalSerializer(serializers.ModelSerializer):
     class Meta:
         model = Approval
         fields = "__all__"
+        # Always the officer recording the approval
+        read_only_fields = ["reviewer"]
 
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
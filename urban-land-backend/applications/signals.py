@@ -0,0 +1,47 @@
+# applications/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import sla
+from .models import Application, Approval
+
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        sla.submitted(instance)
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    sla.withdrawn(instance)
+
+
+def _state(approval):
+    return approval.application_id, approval.status, approval.date, approval.reviewer_id
+
+
+@receiver(pre_save, sender=Approval)
+def approval_saving(sender, instance, raw=False, **kwargs):
+    instance._sla_previous = None
+    if not raw and instance.pk is not None:
+        instance._sla_previous = (Approval.objects.filter(pk=instance.pk)
+                                  .values_list("application_id", "status", "date", "reviewer_id")
+                                  .first())
+
+
+@receiver(post_save, sender=Approval)
+def approval_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sla.approval_changed(instance, getattr(instance, "_sla_previous", None))
+
+
+@receiver(post_delete, sender=Approval)
+def approval_deleted(sender, instance, **kwargs):
+    # After commit, so an application deleted together with its approvals
+    # (and already out of the backlog) is left alone
+    # delete() clears the instance's pk, so keep a copy
+    deleted = Approval(pk=instance.pk, application_id=instance.application_id)
+    previous = _state(instance)
+    transaction.on_commit(lambda: sla.approval_changed(deleted, previous))
@@ -0,0 +1,271 @@
+# applications/sla.py
+"""
+Application processing SLA statistics.
+
+An application is decided by its first Approval with a final status; its
+turnaround is the days from submitted_date to that approval's date. Each
+decision is folded into the TurnaroundStats rows for its type, for all
+types and for its reviewer (blank type), which keep a per-day histogram so
+median and p90 are updated without looking at other applications.
+
+Rows for all reviewers also keep the backlog: undecided applications and
+the oldest submitted_date among them. The dashboard reads these rows only.
+
+Approvals can be corrected or withdrawn: each change re-derives the
+application's decision from its approvals before and after the change,
+takes the old decision out of the rows and counts the new one. rebuild()
+(the rebuild_sla_stats command) repairs any drift.
+"""
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import Application, Approval, TurnaroundStats
+
+FINAL_STATUSES = ("approved", "rejected")
+# Status an application returns to when its decision is withdrawn
+UNDECIDED_STATUS = "submitted"
+# Turnarounds longer than this share the last histogram bucket
+HISTOGRAM_DAYS = 365
+
+
+def pending():
+    return Application.objects.exclude(status__in=FINAL_STATUSES)
+
+
+def percentile(histogram, fraction):
+    """Smallest day count covering ``fraction`` of the decisions"""
+    total = sum(histogram)
+    if not total:
+        return None
+    needed = fraction * total
+    seen = 0
+    for days, count in enumerate(histogram):
+        seen += count
+        if seen >= needed:
+            return days
+    return len(histogram) - 1
+
+
+def add_decision(stats, days):
+    histogram = stats.histogram or [0] * (HISTOGRAM_DAYS + 1)
+    histogram[min(max(days, 0), HISTOGRAM_DAYS)] += 1
+    stats.histogram = histogram
+    stats.decided += 1
+    stats.total_days += max(days, 0)
+    stats.median_days = percentile(histogram, 0.5)
+    stats.p90_days = percentile(histogram, 0.9)
+
+
+def remove_decision(stats, days):
+    histogram = stats.histogram or [0] * (HISTOGRAM_DAYS + 1)
+    bucket = min(max(days, 0), HISTOGRAM_DAYS)
+    histogram[bucket] = max(histogram[bucket] - 1, 0)
+    stats.histogram = histogram
+    stats.decided = max(stats.decided - 1, 0)
+    stats.total_days = max(stats.total_days - max(days, 0), 0)
+    stats.median_days = percentile(histogram, 0.5)
+    stats.p90_days = percentile(histogram, 0.9)
+
+
+def _locked_rows(keys):
+    """TurnaroundStats for (application_type, reviewer_id) keys, created if missing and locked"""
+    rows = []
+    for application_type, reviewer_id in sorted(set(keys), key=lambda key: (key[0], key[1] or 0)):
+        stats, _ = TurnaroundStats.objects.get_or_create(application_type=application_type, reviewer_id=reviewer_id)
+        rows.append(TurnaroundStats.objects.select_for_update().get(pk=stats.pk))
+    return rows
+
+
+def _oldest_pending(application_type):
+    queryset = pending()
+    if application_type:
+        queryset = queryset.filter(application_type=application_type)
+    return queryset.aggregate(oldest=Min("submitted_date"))["oldest"]
+
+
+def submitted(application):
+    """Count a new application in the backlog"""
+    with transaction.atomic():
+        for stats in _locked_rows([(application.application_type, None), ("", None)]):
+            stats.backlog += 1
+            if stats.oldest_pending is None or application.submitted_date < stats.oldest_pending:
+                stats.oldest_pending = application.submitted_date
+            stats.save()
+
+
+def deciding(approvals):
+    """(status, date, reviewer_id) of the first final one of (pk, status, date, reviewer_id) approvals, or None"""
+    final = sorted((date, pk, status, reviewer_id) for pk, status, date, reviewer_id in approvals
+                   if status in FINAL_STATUSES)
+    if not final:
+        return None
+    date, _, status, reviewer_id = final[0]
+    return status, date, reviewer_id
+
+
+def _count_decision(application, decision, sign):
+    """Fold a decision into (sign 1) or out of (sign -1) the application's stats rows"""
+    _, date, reviewer_id = decision
+    days = (date - application.submitted_date).days
+    keys = [(application.application_type, None), ("", None), ("", reviewer_id)]
+    for stats in _locked_rows(keys):
+        if sign > 0:
+            add_decision(stats, days)
+        else:
+            remove_decision(stats, days)
+        if stats.reviewer_id is None:
+            if sign > 0:
+                stats.backlog = max(stats.backlog - 1, 0)
+                if stats.oldest_pending == application.submitted_date:
+                    stats.oldest_pending = _oldest_pending(stats.application_type)
+            else:
+                stats.backlog += 1
+                if stats.oldest_pending is None or application.submitted_date < stats.oldest_pending:
+                    stats.oldest_pending = application.submitted_date
+        stats.save()
+
+
+def _redecide(application_id, approval, previous):
+    with transaction.atomic():
+        application = Application.objects.select_for_update().filter(pk=application_id).first()
+        if application is None:
+            return False
+        after = list(Approval.objects.filter(application_id=application_id)
+                     .values_list("pk", "status", "date", "reviewer_id"))
+        before = [row for row in after if row[0] != approval.pk]
+        if previous is not None and previous[0] == application_id:
+            before.append((approval.pk, *previous[1:]))
+        old, new = deciding(before), deciding(after)
+        if old == new:
+            return False
+
+        # The status goes first: _count_decision reads the backlog from it
+        application.status = new[0] if new else UNDECIDED_STATUS
+        application.assigned_to = None
+        application.lease_token = None
+        application.lease_expires_at = None
+        application.save(update_fields=["status", "assigned_to", "lease_token", "lease_expires_at"])
+        if old:
+            _count_decision(application, old, -1)
+        if new:
+            _count_decision(application, new, 1)
+    return True
+
+
+def approval_changed(approval, previous=None):
+    """
+    Re-derive the decision of the approval's application (and of the one it
+    was moved from) after ``approval`` was saved or deleted. ``previous`` is
+    its (application_id, status, date, reviewer_id) before the change, None
+    for a new approval. A changed decision marks the application with it (or
+    returns it to the backlog), ends any review lease and moves the stats
+    from the old decision to the new one. Returns True if a decision changed.
+    """
+    application_ids = {approval.application_id}
+    if previous is not None:
+        application_ids.add(previous[0])
+    changed = False
+    for application_id in sorted(application_ids):
+        changed = _redecide(application_id, approval, previous) or changed
+    return changed
+
+
+def withdrawn(application):
+    """Drop a deleted, undecided application from the backlog"""
+    if application.status in FINAL_STATUSES:
+        return
+    with transaction.atomic():
+        for stats in _locked_rows([(application.application_type, None), ("", None)]):
+            stats.backlog = max(stats.backlog - 1, 0)
+            if stats.oldest_pending == application.submitted_date:
+                stats.oldest_pending = _oldest_pending(stats.application_type)
+            stats.save()
+
+
+def rebuild():
+    """
+    Recompute every TurnaroundStats row from Applications and Approvals.
+    Applications whose status disagrees with their first final approval are
+    marked with it first, and ones marked decided without a final approval
+    go back to the backlog. Returns the number of decisions counted.
+    """
+    first = {}
+    rows = (Approval.objects.filter(status__in=FINAL_STATUSES)
+            .order_by("application_id", "date", "pk")
+            .values_list("application_id", "status", "date", "reviewer_id",
+                         "application__submitted_date", "application__application_type", "application__status"))
+    for application_id, *row in rows.iterator(chunk_size=5000):
+        first.setdefault(application_id, row)
+
+    stats = {}
+
+    def row_for(application_type, reviewer_id):
+        key = (application_type, reviewer_id)
+        if key not in stats:
+            stats[key] = TurnaroundStats(application_type=application_type, reviewer_id=reviewer_id)
+        return stats[key]
+
+    with transaction.atomic():
+        for decision in FINAL_STATUSES:
+            ids = [application_id for application_id, (status, _, _, _, _, current) in first.items()
+                   if status == decision and current != decision]
+            for start in range(0, len(ids), 5000):
+                Application.objects.filter(pk__in=ids[start:start + 5000]).update(
+                    status=decision, assigned_to=None, lease_token=None, lease_expires_at=None
+                )
+        undecided = (Application.objects.filter(status__in=FINAL_STATUSES)
+                     .exclude(approval__status__in=FINAL_STATUSES))
+        undecided.update(status=UNDECIDED_STATUS)
+
+        for status, date, reviewer_id, submitted_date, application_type, _ in first.values():
+            days = (date - submitted_date).days
+            for key in ((application_type, None), ("", None), ("", reviewer_id)):
+                add_decision(row_for(*key), days)
+
+        backlog = (pending().values("application_type")
+                   .annotate(count=Count("pk"), oldest=Min("submitted_date"))
+                   .values_list("application_type", "count", "oldest"))
+        for application_type, count, oldest in backlog:
+            for key in ((application_type, None), ("", None)):
+                row = row_for(*key)
+                row.backlog += count
+                if row.oldest_pending is None or oldest < row.oldest_pending:
+                    row.oldest_pending = oldest
+
+        TurnaroundStats.objects.all().delete()
+        TurnaroundStats.objects.bulk_create(stats.values())
+    return len(first)
+
+
+def summary(stats, today):
+    row = {
+        "decided": stats.decided,
+        "mean_days": round(stats.total_days / stats.decided, 1) if stats.decided else None,
+        "median_days": stats.median_days,
+        "p90_days": stats.p90_days,
+    }
+    if stats.reviewer_id is None:
+        row["backlog"] = stats.backlog
+        row["backlog_age_days"] = (today - stats.oldest_pending).days if stats.oldest_pending else None
+    return row
+
+
+def dashboard(today=None):
+    """Overall, per-type and per-reviewer turnaround and backlog from the stored rows"""
+    today = today or timezone.localdate()
+    result = {"overall": None, "by_type": {}, "by_reviewer": [], "updated_at": None}
+    for stats in TurnaroundStats.objects.select_related("reviewer").order_by("application_type", "reviewer_id"):
+        row = summary(stats, today)
+        if result["updated_at"] is None or stats.updated_at > result["updated_at"]:
+            result["updated_at"] = stats.updated_at
+        if stats.reviewer_id is not None:
+            # A reviewer whose decisions were all withdrawn has nothing to show
+            if stats.decided:
+                result["by_reviewer"].append({"reviewer": stats.reviewer_id,
+                                              "reviewer_name": stats.reviewer.username, **row})
+        elif stats.application_type:
+            result["by_type"][stats.application_type] = row
+        else:
+            result["overall"] = row
+    return result
@@ -1,3 +1,123 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from land.models import LandParcel
+from . import queue, sla
+from .models import Application, Approval
+
+
+class ApplicationAccessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        cls.owner = User.objects.create_user("owner", password="x")
+        cls.other_owner = User.objects.create_user("other", password="x")
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+        cls.second_officer = User.objects.create_user("second", password="x", role="officer")
+        cls.application = Application.objects.create(
+            applicant=cls.owner, parcel=cls.parcel, application_type="lease",
+        )
+        Application.objects.create(applicant=cls.other_owner, parcel=cls.parcel, application_type="lease")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_owner_only_sees_own_applications(self):
+        response = self.client_for(self.owner).get("/api/applications/")
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.application.pk])
+
+        response = self.client_for(self.officer).get("/api/applications/")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_owner_applies_for_themselves_without_setting_status(self):
+        response = self.client_for(self.owner).post("/api/applications/", {
+            "applicant": self.other_owner.pk, "parcel": self.parcel.pk,
+            "application_type": "subdivision", "status": "approved",
+        })
+        self.assertEqual(response.status_code, 201, response.data)
+        created = Application.objects.get(pk=response.data["id"])
+        self.assertEqual((created.applicant, created.status), (self.owner, "submitted"))
+
+    def test_only_the_lease_holder_decides(self):
+        queue.claim(self.officer, 1)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.assigned_to, self.officer)
+
+        response = self.client_for(self.second_officer).post(
+            "/api/approvals/", {"application": self.application.pk, "status": "approved"})
+        self.assertEqual(response.status_code, 403)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, "submitted")
+
+        response = self.client_for(self.officer).post(
+            "/api/approvals/", {"application": self.application.pk, "status": "approved"})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["reviewer"], self.officer.pk)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, "approved")
+
+
+class SlaTransitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        cls.owner = User.objects.create_user("owner", password="x")
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def setUp(self):
+        self.application = Application.objects.create(
+            applicant=self.owner, parcel=self.parcel, application_type="lease",
+        )
+
+    def overall(self):
+        self.application.refresh_from_db()
+        row = sla.dashboard()["overall"]
+        return self.application.status, row["decided"], row["backlog"]
+
+    def decide(self, status="approved"):
+        return Approval.objects.create(application=self.application, reviewer=self.officer, status=status)
+
+    def assertMatchesRebuild(self):
+        incremental = sla.dashboard()
+        sla.rebuild()
+        rebuilt = sla.dashboard()
+        for result in (incremental, rebuilt):
+            del result["updated_at"]
+        self.assertEqual(incremental, rebuilt)
+
+    def test_corrected_decision_replaces_the_old_one(self):
+        approval = self.decide()
+        approval.status = "rejected"
+        approval.save()
+        self.assertEqual(self.overall(), ("rejected", 1, 0))
+        self.assertMatchesRebuild()
+
+    def test_withdrawn_decision_returns_to_the_backlog(self):
+        approval = self.decide()
+        self.assertEqual(self.overall(), ("approved", 1, 0))
+        approval.status = "pending"
+        approval.save()
+        self.assertEqual(self.overall(), ("submitted", 0, 1))
+        self.assertMatchesRebuild()
+
+    def test_deleted_decision_falls_back_to_the_next_approval(self):
+        first = self.decide()
+        self.decide("rejected")
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.overall(), ("rejected", 1, 0))
+        self.assertMatchesRebuild()
+
+    def test_rebuild_repairs_drifted_status(self):
+        Application.objects.filter(pk=self.application.pk).update(status="approved")
+        sla.rebuild()
+        self.assertEqual(self.overall(), ("submitted", 0, 1))
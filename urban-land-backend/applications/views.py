@@ -1,14 +1,125 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from accounts.permissions import IsAdminOrOfficer
+from . import queue, sla
 from .models import Application, Approval, Payment
 from .serializers import ApplicationSerializer, ApprovalSerializer, PaymentSerializer
 
 class ApplicationViewSet(viewsets.ModelViewSet):
-    queryset = Application.objects.all()
+    queryset = Application.objects.order_by('submitted_date', 'id')
     serializer_class = ApplicationSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_fields = {
+        'status': ['exact'],
+        'application_type': ['exact'],
+        'parcel': ['exact'],
+        'applicant': ['exact'],
+        'assigned_to': ['exact', 'isnull'],
+        'submitted_date': ['gte', 'lte'],
+    }
+    ordering_fields = ['submitted_date', 'id']
+    officer_actions = ('claim', 'mine', 'renew', 'release', 'sla')
+
+    def get_permissions(self):
+        if self.action in self.officer_actions:
+            return [IsAdminOrOfficer()]
+        return super().get_permissions()
+
+    def is_staff(self):
+        return self.request.user.role in ['admin', 'officer']
+
+    def get_queryset(self):
+        # Owners only see their own applications
+        if self.is_staff():
+            return self.queryset
+        return self.queryset.filter(applicant=self.request.user)
+
+    def perform_create(self, serializer):
+        # Owners apply for themselves; staff may file on an applicant's behalf
+        if self.is_staff():
+            serializer.save()
+        else:
+            serializer.save(applicant=self.request.user)
+
+    def perform_update(self, serializer):
+        if self.is_staff():
+            serializer.save()
+        else:
+            serializer.save(applicant=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def claim(self, request):
+        """Lease the next ?count= (default 1) unassigned applications to the calling officer"""
+        try:
+            count = int(request.data.get('count', request.query_params.get('count', 1)))
+        except (TypeError, ValueError):
+            count = 0
+        if not 1 <= count <= settings.APPLICATION_CLAIM_MAX:
+            return Response(
+                {'error': f'count must be between 1 and {settings.APPLICATION_CLAIM_MAX}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        claimed = queue.claim(request.user, count)
+        return Response(self.get_serializer(claimed, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def mine(self, request):
+        """Applications the calling officer currently holds, soonest lease expiry first"""
+        page = self.paginate_queryset(queue.held_by(request.user))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def renew(self, request, pk=None):
+        """Extend the caller's lease on this application"""
+        application = self.get_object()
+        if not queue.renew(application, request.user):
+            return Response({'error': 'You do not hold a lease on this application'},
+                            status=status.HTTP_409_CONFLICT)
+        application.refresh_from_db()
+        return Response(self.get_serializer(application).data)
+
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None):
+        """Put this application back in the queue"""
+        application = self.get_object()
+        if not queue.release(application, request.user):
+            return Response({'error': 'You do not hold a lease on this application'},
+                            status=status.HTTP_409_CONFLICT)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'])
+    def sla(self, request):
+        """Turnaround (count, mean, median, p90 days) and backlog age overall, per type and per reviewer"""
+        return Response(sla.dashboard())
 
 class ApprovalViewSet(viewsets.ModelViewSet):
     queryset = Approval.objects.all()
     serializer_class = ApprovalSerializer
+    permission_classes = [IsAdminOrOfficer]
+    filterset_fields = ['application', 'reviewer', 'status']
+
+    def check_lease(self, application, decision):
+        """Only the officer holding the application's review lease may decide it"""
+        if decision in sla.FINAL_STATUSES and not queue.holds(application, self.request.user):
+            raise PermissionDenied('You do not hold a lease on this application')
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            self.check_lease(serializer.validated_data['application'],
+                             serializer.validated_data.get('status', 'pending'))
+            serializer.save(reviewer=self.request.user)
+
+    def perform_update(self, serializer):
+        approval = serializer.instance
+        with transaction.atomic():
+            self.check_lease(serializer.validated_data.get('application', approval.application),
+                             serializer.validated_data.get('status', approval.status))
+            serializer.save(reviewer=self.request.user)
 
 class PaymentViewSet(viewsets.ModelViewSet):
     queryset = Payment.objects.all()
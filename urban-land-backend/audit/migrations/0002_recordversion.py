@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('version', models.PositiveIntegerField()),
+                ('is_snapshot', models.BooleanField(default=False)),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['model_label', 'object_id', 'version'],
+                'constraints': [models.UniqueConstraint(fields=('model_label', 'object_id', 'version'), name='unique_record_version')],
+            },
+        ),
+    ]
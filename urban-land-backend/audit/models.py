@@ -6,3 +6,26 @@ class AuditLog(models.Model):
     action = models.CharField(max_length=255)
     timestamp = models.DateTimeField(auto_now_add=True)
     details = models.TextField(blank=True, null=True)
+
+
+class RecordVersion(models.Model):
+    """One saved version of a tracked row: changed fields only, or a full snapshot"""
+    model_label = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    version = models.PositiveIntegerField()
+    is_snapshot = models.BooleanField(default=False)
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['model_label', 'object_id', 'version']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['model_label', 'object_id', 'version'],
+                name='unique_record_version',
+            ),
+        ]
+
+    def __str__(self):
+        kind = "snapshot" if self.is_snapshot else "delta"
+        return f"{self.model_label}:{self.object_id} v{self.version} ({kind})"
@@ -1,3 +1,58 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import IntegrityError
 from django.test import TestCase
 
-# Create your tests here.
+from land.models import LandParcel
+from . import versioning
+from .models import RecordVersion
+
+
+class VersionHistoryTests(TestCase):
+    def make_parcel(self):
+        return LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential", cadastral_number="CAD-1",
+            annual_tax_value=Decimal("100.00"),
+        )
+
+    def test_first_change_of_row_without_history_keeps_original_state(self):
+        parcel = self.make_parcel()
+        RecordVersion.objects.all().delete()
+
+        parcel.annual_tax_value = Decimal("250.00")
+        LandParcel.objects.bulk_update([parcel], ["annual_tax_value"])
+
+        self.assertEqual(versioning.reconstruct(LandParcel, parcel.pk, 1)["fields"]["annual_tax_value"], "100.00")
+        self.assertEqual(versioning.reconstruct(LandParcel, parcel.pk)["fields"]["annual_tax_value"], "250.00")
+        self.assertEqual([entry["changes"] for entry in versioning.history(LandParcel, parcel.pk)][1:],
+                         [{"annual_tax_value": "250.00"}])
+
+    def test_save_of_row_without_history(self):
+        parcel = self.make_parcel()
+        RecordVersion.objects.all().delete()
+
+        parcel.location = "Block 2"
+        parcel.save()
+
+        self.assertEqual(versioning.reconstruct(LandParcel, parcel.pk, 1)["fields"]["location"], "Block 1")
+        self.assertEqual(versioning.reconstruct(LandParcel, parcel.pk, 2)["fields"]["location"], "Block 2")
+
+    def test_version_write_is_retried_after_a_conflict(self):
+        parcel = self.make_parcel()
+        original = versioning._append_versions
+        attempts = []
+
+        def conflicting(model, changes, using):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise IntegrityError("UNIQUE constraint failed: unique_record_version")
+            return original(model, changes, using)
+
+        with mock.patch.object(versioning, "_append_versions", conflicting):
+            parcel.location = "Block 3"
+            parcel.save()
+
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(list(RecordVersion.objects.filter(object_id=parcel.pk).values_list("version", flat=True)),
+                         [1, 2])
@@ -0,0 +1,304 @@
+# audit/versioning.py
+"""
+Compact version history for registered models.
+
+Each save stores only the fields that changed, packed with msgpack. Every
+VERSION_SNAPSHOT_INTERVAL versions (and for the first version of a row) a
+full snapshot is written instead, so rebuilding any version reads one
+snapshot plus the deltas recorded after it. A row first changed after it
+was written without history (rows older than versioning, or written
+around it) gets its state before the change as snapshot v1 and the change
+as v2, so its original values are kept.
+
+Version numbers are assigned under a lock on the versioned rows, and
+retried in a savepoint if a concurrent writer still took the same number.
+"""
+import datetime
+from decimal import Decimal
+
+import msgpack
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Max, Q
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import Signal
+
+from .models import RecordVersion
+
+SNAPSHOT_INTERVAL = getattr(settings, 'VERSION_SNAPSHOT_INTERVAL', 20)
+LOOKUP_CHUNK = 1000
+WRITE_ATTEMPTS = 3
+
+# model class -> concrete fields whose values are versioned
+_registry = {}
+
+# Sent after VersionedQuerySet bulk writes (which skip post_save) with
+# sender=model and pks=the primary keys written, and created=True from
+# bulk_create(); update() only sends it for registered models, the ones
+# whose pks it looks up anyway. For registered models bulk_update() and
+# update() also pass previous={pk: stored state before the write}
+bulk_saved = Signal()
+
+
+def register(model):
+    """Record versions of ``model`` on save() and through VersionedQuerySet"""
+    _registry[model] = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and not getattr(field, 'auto_now', False)
+    ]
+    label = model._meta.label_lower
+    pre_save.connect(_remember_previous, sender=model, dispatch_uid=f"versioning-pre-{label}")
+    post_save.connect(_record_save, sender=model, dispatch_uid=f"versioning-post-{label}")
+
+
+def is_registered(model):
+    return model in _registry
+
+
+def _encode(field, value):
+    """Normalize a field value to a compact, comparable msgpack primitive"""
+    if isinstance(field, models.FileField):
+        return getattr(value, 'name', value) or None
+    if value is None:
+        return None
+    value = field.to_python(value)
+    if isinstance(value, Decimal):
+        return f"{value:.{field.decimal_places}f}"
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def _pack(state):
+    return msgpack.packb(state, use_bin_type=True)
+
+
+def _unpack(payload):
+    return msgpack.unpackb(bytes(payload), raw=False)
+
+
+def capture(instance):
+    """Full versioned state of an instance"""
+    return {
+        field.attname: _encode(field, getattr(instance, field.attname))
+        for field in _registry[type(instance)]
+    }
+
+
+def _chunks(items, size=LOOKUP_CHUNK):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def current_states(model, pks, using=None):
+    """Stored state of each pk, read straight from the table"""
+    fields = _registry[model]
+    pk_name = model._meta.pk.attname
+    states = {}
+    for chunk in _chunks(pks):
+        rows = (model._base_manager.using(using)
+                .filter(pk__in=chunk)
+                .values(pk_name, *[field.attname for field in fields]))
+        for row in rows:
+            states[row[pk_name]] = {
+                field.attname: _encode(field, row[field.attname]) for field in fields
+            }
+    return states
+
+
+def write_versions(model, changes, using=None):
+    """
+    Append one version per changed object.
+
+    ``changes`` maps pk -> (delta, full_state, previous_state). The delta is
+    stored unless a snapshot is due, in which case the full state is stored
+    instead. previous_state is the state before the write (None for a new
+    row); it becomes version 1 of a row that has no history yet.
+    """
+    changes = {pk: change for pk, change in changes.items() if change[0]}
+    if not changes:
+        return []
+
+    for attempt in range(WRITE_ATTEMPTS):
+        try:
+            with transaction.atomic(using=using):
+                return _append_versions(model, changes, using)
+        except IntegrityError:
+            # Another writer took the same version number despite the lock
+            # (SQLite has no row locks); read the heads again
+            if attempt == WRITE_ATTEMPTS - 1:
+                raise
+
+
+def _append_versions(model, changes, using):
+    label = model._meta.label_lower
+    heads = {}
+    for chunk in _chunks(sorted(changes)):
+        # Serializes concurrent version writes of the same rows
+        list(model._base_manager.using(using).select_for_update()
+             .filter(pk__in=chunk).order_by('pk').values_list('pk', flat=True))
+        rows = (RecordVersion.objects.using(using)
+                .filter(model_label=label, object_id__in=chunk)
+                .values('object_id')
+                .annotate(
+                    latest=Max('version'),
+                    last_snapshot=Max('version', filter=Q(is_snapshot=True)),
+                ))
+        heads.update({row['object_id']: row for row in rows})
+
+    versions = []
+    for pk, (delta, full_state, previous_state) in changes.items():
+        head = heads.get(pk)
+        if head is None and previous_state is not None:
+            versions.append(RecordVersion(
+                model_label=label, object_id=pk, version=1, is_snapshot=True, payload=_pack(previous_state),
+            ))
+            head = {'latest': 1, 'last_snapshot': 1}
+        number = head['latest'] + 1 if head else 1
+        snapshot = head is None or number - (head['last_snapshot'] or 0) >= SNAPSHOT_INTERVAL
+        versions.append(RecordVersion(
+            model_label=label,
+            object_id=pk,
+            version=number,
+            is_snapshot=snapshot,
+            payload=_pack(full_state if snapshot else delta),
+        ))
+    return RecordVersion.objects.using(using).bulk_create(versions, batch_size=LOOKUP_CHUNK)
+
+
+def _remember_previous(sender, instance, raw=False, using=None, **kwargs):
+    instance._version_previous = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._version_previous = current_states(sender, [instance.pk], using).get(instance.pk)
+
+
+def _record_save(sender, instance, created, raw=False, using=None, update_fields=None, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_version_previous', None)
+    instance._version_previous = None
+
+    if created or previous is None:
+        state = capture(instance)
+        write_versions(sender, {instance.pk: (state, state, None)}, using)
+        return
+
+    fields = _registry[sender]
+    if update_fields is not None:
+        fields = [field for field in fields if field.name in update_fields]
+    current = {field.attname: _encode(field, getattr(instance, field.attname)) for field in fields}
+    delta = {name: value for name, value in current.items() if previous[name] != value}
+    write_versions(sender, {instance.pk: (delta, {**previous, **current}, previous)}, using)
+
+
+class VersionedQuerySet(models.QuerySet):
+    """QuerySet whose bulk write paths also record versions for registered models"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bulk_saved.send(sender=self.model, pks=[obj.pk for obj in objs if obj.pk is not None], created=True)
+        if is_registered(self.model):
+            # Backends that do not return primary keys leave pk unset; those rows
+            # get their history (a snapshot of the state before) on their next save.
+            changes = {}
+            for obj in objs:
+                if obj.pk is not None:
+                    state = capture(obj)
+                    changes[obj.pk] = (state, state, None)
+            write_versions(self.model, changes, self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        if not is_registered(self.model):
+            updated = super().bulk_update(objs, fields, batch_size=batch_size)
+            bulk_saved.send(sender=self.model, pks=[obj.pk for obj in objs])
+            return updated
+
+        tracked = [field for field in _registry[self.model] if field.name in fields or field.attname in fields]
+        with transaction.atomic(using=self.db, savepoint=False):
+            previous = current_states(self.model, [obj.pk for obj in objs], self.db)
+            # A plain QuerySet so the per-batch update() below is not versioned twice
+            updated = models.QuerySet(self.model, using=self.db).bulk_update(
+                objs, fields, batch_size=batch_size
+            )
+            changes = {}
+            for obj in objs:
+                before = previous.get(obj.pk)
+                if before is None:
+                    continue
+                after = {field.attname: _encode(field, getattr(obj, field.attname)) for field in tracked}
+                delta = {name: value for name, value in after.items() if before[name] != value}
+                changes[obj.pk] = (delta, {**before, **after}, before)
+            write_versions(self.model, changes, self.db)
+        bulk_saved.send(sender=self.model, pks=[obj.pk for obj in objs], previous=previous)
+        return updated
+
+    def update(self, **kwargs):
+        if not is_registered(self.model):
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(self.values_list('pk', flat=True))
+            previous = current_states(self.model, pks, self.db)
+            rows = super().update(**kwargs)
+            current = current_states(self.model, pks, self.db)
+            changes = {}
+            for pk, after in current.items():
+                before = previous.get(pk)
+                delta = {name: value for name, value in after.items() if (before or {}).get(name) != value}
+                changes[pk] = (delta, after, before)
+            write_versions(self.model, changes, self.db)
+        bulk_saved.send(sender=self.model, pks=pks, previous=previous)
+        return rows
+
+    update.alters_data = True
+
+
+def reconstruct(model, pk, version=None):
+    """
+    Rebuild an object's versioned fields as of ``version`` (latest if None).
+
+    Reads the nearest snapshot at or before the version and applies the
+    deltas after it. Returns None when no such version exists.
+    """
+    versions = RecordVersion.objects.filter(model_label=model._meta.label_lower, object_id=pk)
+    if version is not None:
+        versions = versions.filter(version__lte=version)
+
+    base = (versions.filter(is_snapshot=True)
+            .order_by('-version')
+            .values_list('version', flat=True)
+            .first())
+    if base is None:
+        return None
+
+    state = {}
+    number = base
+    for number, payload in versions.filter(version__gte=base).order_by('version').values_list('version', 'payload'):
+        state.update(_unpack(payload))
+    return {'version': number, 'fields': state}
+
+
+def history(model, pk):
+    """Every version of an object with the field values it changed"""
+    rows = (RecordVersion.objects
+            .filter(model_label=model._meta.label_lower, object_id=pk)
+            .order_by('version')
+            .values_list('version', 'is_snapshot', 'created_at', 'payload'))
+
+    state = {}
+    entries = []
+    for number, is_snapshot, created_at, payload in rows:
+        values = _unpack(payload)
+        changes = {name: value for name, value in values.items() if state.get(name, object()) != value}
+        state.update(values)
+        entries.append({
+            'version': number,
+            'is_snapshot': is_snapshot,
+            'created_at': created_at,
+            'changes': changes,
+        })
+    return entries
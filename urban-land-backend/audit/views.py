@@ -1,7 +1,32 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .models import AuditLog
 from .serializers import AuditLogSerializer
+from . import versioning
 
 class AuditLogViewSet(viewsets.ModelViewSet):
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
+
+
+class VersionHistoryMixin:
+    """Version history endpoints for viewsets of versioned models"""
+
+    @action(detail=True, methods=['get'])
+    def versions(self, request, pk=None):
+        """List recorded versions with the fields each one changed"""
+        obj = self.get_object()
+        return Response(versioning.history(type(obj), obj.pk))
+
+    @action(detail=True, methods=['get'], url_path=r'versions/(?P<version>\d+)')
+    def version_detail(self, request, pk=None, version=None):
+        """Rebuild the object as it was at a given version"""
+        obj = self.get_object()
+        state = versioning.reconstruct(type(obj), obj.pk, int(version))
+        if state is None:
+            return Response(
+                {'error': f'Version {version} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(state)
@@ -0,0 +1,90 @@
+"""
+Compare the sync and async read endpoints at a fixed worker count.
+
+Run the server twice with the same number of workers, once per mode:
+
+    gunicorn config.wsgi:application -w 2 --bind 127.0.0.1:8000
+    gunicorn config.asgi:application -w 2 -k uvicorn_worker.UvicornWorker --bind 127.0.0.1:8000
+
+and point this script at each:
+
+    python benchmarks/async_concurrency.py --token <access token> --concurrency 64
+
+Each sync endpoint is paired with its api/async/ twin. With more concurrent
+clients than workers the sync endpoints queue behind busy workers, while the
+async ones keep accepting requests while earlier ones wait on the database,
+so throughput and p95 latency diverge as --concurrency grows.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ENDPOINT_PAIRS = [
+    ("/api/parcels/", "/api/async/parcels/"),
+    ("/api/my-parcels/", "/api/async/my-parcels/"),
+    ("/api/accounts/dashboard-stats/", "/api/async/accounts/dashboard-stats/"),
+]
+
+
+def fetch(url, token):
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            ok = response.status < 400
+    except urllib.error.URLError:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(url, token, concurrency, total):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(lambda _: fetch(url, token), range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    return {
+        "requests": total,
+        "errors": sum(1 for _, ok in results if not ok),
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True, help="JWT access token")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'endpoint':45} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for pair in ENDPOINT_PAIRS:
+        for path in pair:
+            stats = run(args.base_url + path, args.token, args.concurrency, args.requests)
+            results[path] = stats
+            print(f"{path:45} {stats['throughput_rps']:>8} {stats['p50_ms']:>8} "
+                  f"{stats['p95_ms']:>8} {stats['errors']:>7}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"concurrency": args.concurrency, "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,15 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving through ASGI lets the async read endpoints under api/async/ wait on
+the database without holding a worker. start.sh switches to this mode with
+SERVER_MODE=asgi, running gunicorn with uvicorn workers:
+
+    gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker
+
+Sync DRF views keep working in this mode; Django runs them in a thread.
+The same application also serves the change feed WebSocket at ws/changes/.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +22,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+# Set up Django before importing anything that touches models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+from notifications.auth import JWTAuthMiddleware  # noqa: E402
+from notifications.events import open_feed  # noqa: E402
+from notifications.routing import websocket_urlpatterns  # noqa: E402
+
+open_feed()
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": AllowedHostsOriginValidator(
+        JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+    ),
+})
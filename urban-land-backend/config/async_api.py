@@ -0,0 +1,116 @@
+# config/async_api.py
+"""
+Helpers shared by the async read endpoints (api/async/...).
+
+DRF views are sync-only, so these endpoints are plain async Django views
+that authenticate the JWT, query with the async ORM and render with DRF's
+JSONRenderer so the payload matches the sync endpoints.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.models import User
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status,
+        content_type="application/json",
+    )
+
+
+async def aauthenticate(request):
+    """Return the active user for the request's bearer token, or None"""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    return await auser_for_token(raw_token)
+
+
+async def auser_for_token(raw_token):
+    """Return the active user an access token belongs to, or None"""
+    authentication = JWTAuthentication()
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    try:
+        user = await User.objects.aget(
+            **{jwt_settings.USER_ID_FIELD: token[jwt_settings.USER_ID_CLAIM]}
+        )
+    except (User.DoesNotExist, KeyError):
+        return None
+    return user if user.is_active else None
+
+
+def async_login_required(view):
+    """Authenticate with JWT and expose the user as request.user, or answer 401"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aauthenticate(request)
+        if user is None:
+            return json_response(
+                {"detail": "Authentication credentials were not provided."},
+                status=401
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def drf_request(request):
+    """Wrap a Django request so viewset filter backends can read query params"""
+    wrapped = Request(request, authenticators=())
+    wrapped.user = request.user
+    return wrapped
+
+
+async def apaginate(request, queryset, serialize):
+    """
+    Async equivalent of PageNumberPagination: same page size, page param and
+    response shape. ``serialize`` turns the list of page objects into data.
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 0
+
+    count = await queryset.acount()
+    num_pages = max(1, -(-count // page_size))
+    if page_number < 1 or page_number > num_pages:
+        return json_response({"detail": "Invalid page."}, status=404)
+
+    offset = (page_number - 1) * page_size
+    objects = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_link = None
+    if page_number < num_pages:
+        next_link = replace_query_param(url, "page", page_number + 1)
+    previous_link = None
+    if page_number > 1:
+        previous_link = (
+            remove_query_param(url, "page") if page_number == 2
+            else replace_query_param(url, "page", page_number - 1)
+        )
+
+    return json_response({
+        "count": count,
+        "next": next_link,
+        "previous": previous_link,
+        "results": await serialize(objects),
+    })
@@ -0,0 +1,33 @@
+# config/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .routers import begin_request, end_request
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class DatabaseRoutingMiddleware:
+    """Mark safe-method requests as replica-readable for ReplicaRouter"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = begin_request(request.method in SAFE_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            end_request(token)
+
+    async def __acall__(self, request):
+        token = begin_request(request.method in SAFE_METHODS)
+        try:
+            return await self.get_response(request)
+        finally:
+            end_request(token)
@@ -0,0 +1,58 @@
+# config/routers.py
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Routing decision for the request being handled, set by DatabaseRoutingMiddleware.
+# None outside requests (management commands, shells), which always use default.
+_request_state = ContextVar("db_request_state", default=None)
+
+
+class RequestRoutingState:
+    def __init__(self, replica=None):
+        self.replica = replica
+        self.pinned = replica is None
+
+    def pin_to_primary(self):
+        self.pinned = True
+
+
+def begin_request(read_only):
+    """Start routing for a request; read-only requests get one replica for their lifetime"""
+    replicas = settings.DATABASE_REPLICAS
+    replica = random.choice(replicas) if read_only and replicas else None
+    return _request_state.set(RequestRoutingState(replica))
+
+
+def end_request(token):
+    _request_state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads from safe-method requests to a read replica.
+
+    Writes always go to default, and once a request has written anything its
+    remaining reads stay on default so it never reads behind its own write.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state.pinned:
+            return "default"
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.pin_to_primary()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror default, so objects from any of them can be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from default through replication
+        return db not in settings.DATABASE_REPLICAS
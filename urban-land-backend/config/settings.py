@@ -14,6 +14,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import tempfile
 import dj_database_url
 from dotenv import load_dotenv
 
@@ -63,13 +64,21 @@ INSTALLED_APPS = [
     'records',
     'applications',
     'audit',
+    'notifications',
+    'core',
+    'monitoring',
+    'valuation',
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.middleware.RequestTimingMiddleware',
+    'monitoring.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'config.middleware.DatabaseRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -148,6 +157,101 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Channel layer for the change feed (notifications app). Redis in production
+# so events reach sockets held by any worker; in-memory otherwise (single
+# process only, which is what tests and local development need).
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+
+# Django cache, used by the response caches (core.response_cache): Redis
+# when configured so all workers share entries and invalidations; otherwise
+# per-process local memory with least-recently-used eviction. LocMem is only
+# correct with a single worker process: a write bumps the version and list
+# generation tokens in its own process only, so other workers keep serving
+# their cached retrieves for up to RESPONSE_CACHE_TTL and list pages for up
+# to LIST_CACHE_TTL. Set REDIS_URL whenever more than one process serves
+# the API.
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))},
+        }
+    }
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+# Cached list pages are fresh for LIST_CACHE_TTL seconds, and after that or
+# after a write may be served stale for LIST_CACHE_STALE_SECONDS while one
+# request re-renders them
+LIST_CACHE_TTL = int(os.environ.get("LIST_CACHE_TTL", "60"))
+LIST_CACHE_STALE_SECONDS = int(os.environ.get("LIST_CACHE_STALE_SECONDS", "10"))
+
+# Events for the same socket arriving within this window go out as one frame
+NOTIFICATIONS_COALESCE_SECONDS = float(os.environ.get("NOTIFICATIONS_COALESCE_SECONDS", "0.25"))
+
+# Per-request SQL/serializer timing (monitoring.middleware.RequestTimingMiddleware).
+# Fraction of requests to instrument; 0 disables it. With DEBUG on, any request
+# sent with an X-Request-Timing header is instrumented too.
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get("REQUEST_TIMING_SAMPLE_RATE", "0"))
+REQUEST_TIMING_SLOW_MS = float(os.environ.get("REQUEST_TIMING_SLOW_MS", "500"))
+# A statement run this many times in one request is reported as a likely N+1
+REQUEST_TIMING_DUPLICATE_THRESHOLD = 5
+
+# On-demand request profiles (monitoring.middleware.ProfilingMiddleware),
+# kept as a ring buffer of the newest PROFILE_MAX_FILES
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "20"))
+PROFILE_SAMPLE_INTERVAL = 0.002  # seconds between stack samples
+
+# Officers' application review leases (applications.queue)
+APPLICATION_LEASE_MINUTES = int(os.environ.get("APPLICATION_LEASE_MINUTES", "30"))
+APPLICATION_CLAIM_MAX = 50
+
+# /api/batch/ (core.views.batch): sub-requests per batch, and threads used
+# when a batch asks to run in parallel
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "50"))
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", "4"))
+
+# Ownership and encumbrance certificates (records.certificates): rendered
+# files are cached per parcel data version under CERTIFICATE_DIR
+CERTIFICATE_DIR = os.environ.get("CERTIFICATE_DIR", os.path.join(BASE_DIR, "certificates"))
+CERTIFICATE_WORKERS = int(os.environ.get("CERTIFICATE_WORKERS", "2"))
+CERTIFICATE_TIMEOUT = 60  # seconds to wait for a render
+
+# Column-store parcel snapshot (land.snapshot) behind the parcel stats,
+# types and dashboard figures. With PARCEL_SNAPSHOT_DIR set, workers share
+# one memory-mapped copy written there; otherwise each keeps its own.
+PARCEL_SNAPSHOT_DIR = os.environ.get("PARCEL_SNAPSHOT_DIR", "")
+PARCEL_SNAPSHOT_MAX_AGE = int(os.environ.get("PARCEL_SNAPSHOT_MAX_AGE", "300"))
+PARCEL_SNAPSHOT_OVERLAP = 300  # seconds of last_updated re-read on each refresh
+
+# Prometheus metrics (monitoring.metrics), served at /metrics. Each worker
+# writes its counters to METRICS_DIR at most every METRICS_FLUSH_SECONDS;
+# gunicorn clears the directory on startup. Scrapes need
+# "Authorization: Bearer <METRICS_TOKEN>" or an admin's JWT; METRICS_PUBLIC=True
+# opens the endpoint to anyone (only behind a private network).
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), "land-metrics"))
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", "1"))
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC") == "True"
 
 
 # Database
@@ -163,14 +267,42 @@ WSGI_APPLICATION = 'config.wsgi.application'
 #         'PORT': '3306',
 #     }
 # }
+def database_config(url):
+    return dj_database_url.parse(
+        url,
+        conn_max_age=600,
+        ssl_require=not url.startswith("sqlite")
+    )
+
+
 DATABASES = {
     "default": dj_database_url.config(
         default=os.environ.get("DATABASE_URL"),
         conn_max_age=600,
-        ssl_require=True
+        ssl_require=not os.environ.get("DATABASE_URL", "").startswith("sqlite")
     )
 }
 
+# Read replicas, comma separated. Reads from GET/HEAD/OPTIONS requests are
+# routed to one of them (see config/routers.py); writes stay on default.
+# Locally, two SQLite files work:
+#   DATABASE_URL=sqlite:///primary.sqlite3
+#   DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+DATABASE_REPLICAS = []
+for index, url in enumerate(DATABASE_REPLICA_URLS):
+    alias = f"replica_{index}"
+    DATABASES[alias] = database_config(url)
+    # Tests run against default only; replicas read the same test database
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -0,0 +1,75 @@
+import copy
+
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from .routers import ReplicaRouter, begin_request, end_request
+
+REPLICA = "replica"
+
+# A second alias on the default database, as a replica that mirrors it in
+# tests (TEST MIRROR). Added before the test databases are set up.
+if REPLICA not in connections.settings:
+    replica = copy.deepcopy(connections.settings["default"])
+    replica["TEST"] = {**replica["TEST"], "MIRROR": "default"}
+    if replica["ENGINE"] == "django.db.backends.sqlite3":
+        # The shared-cache test database locks tables the test transaction
+        # on default has written unless the mirror reads uncommitted rows
+        replica["OPTIONS"] = {**replica["OPTIONS"], "init_command": "PRAGMA read_uncommitted = 1"}
+    connections.settings[REPLICA] = replica
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TestCase):
+    databases = {"default", REPLICA}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="admin")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def capture(self):
+        return CaptureQueriesContext(connections["default"]), CaptureQueriesContext(connections[REPLICA])
+
+    def test_get_reads_from_replica(self):
+        primary, replica = self.capture()
+        with primary, replica:
+            response = self.client.get("/api/owners/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica.captured_queries)
+        self.assertEqual(primary.captured_queries, [])
+
+    def test_writes_and_later_reads_go_to_default(self):
+        primary, replica = self.capture()
+        with primary, replica:
+            response = self.client.post("/api/parcels/", {
+                "location": "Block 1", "area": 120.5, "land_use_type": "Residential", "cadastral_number": "CAD-R1",
+                "registration_date": "2024-01-15",
+            }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(any(query["sql"].startswith("INSERT") for query in primary.captured_queries))
+        self.assertEqual(replica.captured_queries, [])
+
+    def test_read_after_write_in_safe_request_stays_on_default(self):
+        router = ReplicaRouter()
+        token = begin_request(True)
+        try:
+            self.assertEqual(router.db_for_read(User), REPLICA)
+            self.assertEqual(router.db_for_write(User), "default")
+            self.assertEqual(router.db_for_read(User), "default")
+        finally:
+            end_request(token)
+
+    def test_outside_requests_use_default(self):
+        self.assertEqual(ReplicaRouter().db_for_read(User), "default")
+
+    def test_migrations_never_target_replicas(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate("default", "land"))
+        self.assertFalse(router.allow_migrate(REPLICA, "land"))
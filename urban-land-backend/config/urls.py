@@ -6,7 +6,15 @@ from land.views import LandParcelViewSet
 from records.views import OwnershipRecordViewSet, DocumentViewSet
 from applications.views import ApplicationViewSet, ApprovalViewSet, PaymentViewSet
 from audit.views import AuditLogViewSet
-from owners.views import OwnerProfileViewSet
+from owners.views import OwnerProfileViewSet, portal
+from monitoring.views import ProfileViewSet, metrics_view
+from valuation.views import PriceIndexViewSet
+from transactions.views import LandTransactionViewSet
+from payments.views import BillingRunViewSet, OwnerBalanceViewSet, ParcelBalanceViewSet
+from core.views import batch
+from accounts import async_views as accounts_async
+from land import async_views as land_async
+from owners import async_views as owners_async
 from rest_framework_simplejwt.views import TokenRefreshView
 from django.conf import settings
 
@@ -20,19 +28,35 @@ router.register(r"documents", DocumentViewSet, basename="document")
 router.register(r"applications", ApplicationViewSet, basename="application")
 router.register(r"approvals", ApprovalViewSet, basename="approval")
 router.register(r"payments", PaymentViewSet, basename="payment")
+router.register(r"transactions", LandTransactionViewSet, basename="landtransaction")
 router.register(r"audit-logs", AuditLogViewSet, basename="auditlog")
 router.register(r"my-parcels", MyParcelsViewSet, basename="my-parcels")
+router.register(r"profiles", ProfileViewSet, basename="profile")
+router.register(r"analytics/price-index", PriceIndexViewSet, basename="price-index")
+router.register(r"ledger/parcels", ParcelBalanceViewSet, basename="parcel-balance")
+router.register(r"ledger/owners", OwnerBalanceViewSet, basename="owner-balance")
+router.register(r"ledger/billing-runs", BillingRunViewSet, basename="billing-run")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/token/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("api/owners/me/", OwnerProfileViewSet.as_view({"get": "retrieve"})),
+    path("api/portal/", portal, name="portal"),
+    path("api/batch/", batch, name="batch"),
     
     # Add dashboard stats under api/accounts/
     path("api/accounts/dashboard-stats/", dashboard_stats, name='dashboard_stats'),
     
+    # Async versions of the hot read endpoints; they only free the worker
+    # while waiting on the database when served through config.asgi
+    path("api/async/parcels/", land_async.parcel_list, name="async_parcel_list"),
+    path("api/async/parcels/<int:pk>/", land_async.parcel_detail, name="async_parcel_detail"),
+    path("api/async/my-parcels/", accounts_async.my_parcels, name="async_my_parcels"),
+    path("api/async/owners/me/", owners_async.owner_me, name="async_owner_me"),
+    path("api/async/accounts/dashboard-stats/", accounts_async.dashboard_stats, name="async_dashboard_stats"),
+    
     path("api/", include(router.urls)),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,164 @@
+# core/benchmarks.py
+"""
+In-process API benchmarks: latency percentiles, SQL query count and peak
+memory per endpoint, run through Django's test client against the
+configured database (normally one filled by ``manage.py seed_registry``).
+"""
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from core.response_cache import bump, bump_generation
+from land.models import LandParcel
+from records.models import OwnershipRecord
+
+BENCHMARK_ADMIN = "bench_admin"
+
+# name -> (role the request runs as, path template)
+ENDPOINTS = {
+    "parcel-list": ("admin", "/api/parcels/"),
+    "parcel-list-filtered": ("admin", "/api/parcels/?status=active&land_use_zone=Residential&ordering=-date_created"),
+    "parcel-detail": ("admin", "/api/parcels/{parcel_id}/"),
+    "parcel-stats": ("admin", "/api/parcels/stats/"),
+    "parcel-facets": ("admin", "/api/parcels/facets/?status=active&search=Mouza"),
+    "owner-list": ("admin", "/api/owners/"),
+    "ownershiprecord-list": ("admin", "/api/ownership-records/"),
+    "ownershiprecord-parcel-history": ("admin", "/api/ownership-records/parcel_history/?parcel_id={parcel_id}"),
+    "dashboard-stats": ("admin", "/api/accounts/dashboard-stats/"),
+    "my-parcels": ("owner", "/api/my-parcels/"),
+    "owner-portal": ("owner", "/api/portal/"),
+    "landtransaction-list": ("admin", "/api/transactions/?transaction_type=sale"),
+    "landtransaction-timeline": ("admin", "/api/transactions/parcel/{parcel_id}/"),
+}
+
+
+# Cached endpoints measured again with their response cache invalidated
+# before every request, so the ORM and serializer path stays under budget:
+# name -> (endpoint, invalidate(parcel_id))
+COLD_ENDPOINTS = {
+    "parcel-list-cold": ("parcel-list", lambda parcel_id: bump_generation("parcel")),
+    "parcel-list-filtered-cold": ("parcel-list-filtered", lambda parcel_id: bump_generation("parcel")),
+    "parcel-detail-cold": ("parcel-detail", lambda parcel_id: bump("parcel", [parcel_id])),
+    "parcel-facets-cold": ("parcel-facets", lambda parcel_id: bump_generation("parcel")),
+}
+
+
+def benchmark_users():
+    """The admin and owner whose tokens the benchmark requests carry"""
+    admin = User.objects.filter(username=BENCHMARK_ADMIN).first()
+    if admin is None:
+        admin = User.objects.create_user(BENCHMARK_ADMIN, password=None, role="admin")
+    record = (OwnershipRecord.objects
+              .filter(is_current_owner=True)
+              .select_related("owner__user")
+              .order_by("pk")
+              .first())
+    owner = record.owner.user if record else None
+    return {"admin": admin, "owner": owner}
+
+
+def make_client(user):
+    token = RefreshToken.for_user(user).access_token
+    return Client(
+        HTTP_AUTHORIZATION=f"Bearer {token}",
+        HTTP_HOST=settings.ALLOWED_HOSTS[0],
+    )
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(client, path, iterations, warmup, before=None):
+    def get():
+        if before is not None:
+            before()
+        return client.get(path)
+
+    for _ in range(warmup):
+        get()
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = get()
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    # Django resets connection.queries when each request starts, so count
+    # with an execute wrapper instead of CaptureQueriesContext; reads may be
+    # routed to a replica, so wrap every alias
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(count_query))
+        get()
+
+    tracemalloc.start()
+    try:
+        get()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "queries": len(queries),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run(names=None, iterations=50, warmup=5):
+    users = benchmark_users()
+    clients = {role: make_client(user) for role, user in users.items() if user is not None}
+    parcel = LandParcel.objects.order_by("pk").values_list("pk", flat=True).first()
+
+    endpoints = {name: (role, template, None) for name, (role, template) in ENDPOINTS.items()}
+    for name, (endpoint, invalidate) in COLD_ENDPOINTS.items():
+        endpoints[name] = (*ENDPOINTS[endpoint], invalidate)
+
+    results = {}
+    for name, (role, template, invalidate) in endpoints.items():
+        if names and name not in names:
+            continue
+        if role not in clients or ("{parcel_id}" in template and parcel is None):
+            continue
+        path = template.format(parcel_id=parcel)
+        before = None if invalidate is None else (lambda invalidate=invalidate: invalidate(parcel))
+        results[name] = {"path": path, **measure(clients[role], path, iterations, warmup, before)}
+    return results
+
+
+def check_budgets(results, budgets, names=None):
+    """
+    Return a message for every metric above its budget, and for every
+    budgeted endpoint (of ``names``, if given) that was not measured: run()
+    skips endpoints without a benchmark user or parcel
+    """
+    failures = []
+    for name, limits in budgets.items():
+        if names and name not in names:
+            continue
+        measured = results.get(name)
+        if measured is None:
+            failures.append(f"{name}: not measured (no benchmark user or parcel for it)")
+            continue
+        for metric, limit in limits.items():
+            if measured[metric] > limit:
+                failures.append(f"{name}: {metric} {measured[metric]} exceeds budget {limit}")
+    return failures
@@ -0,0 +1,132 @@
+# core/lean.py
+"""
+Lean read-only serializers for list endpoints.
+
+A LeanSerializer renders values() rows with the same output as its DRF
+``serializer_class``. Plain column fields, including dotted sources over
+foreign keys, are read straight from the row and formatted by the DRF
+field's own to_representation, compiled once per serializer instead of
+once per row and object. The other fields (nested serializers, method
+fields) are computed by the subclass in compute(), usually from lookups
+batched in prepare() for the whole page.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Returned by compute() for a field the DRF serializer leaves out
+SKIP = object()
+
+# Fields whose to_representation returns database values of these types unchanged
+_PASSTHROUGH = (
+    (serializers.BooleanField, bool),
+    (serializers.IntegerField, int),
+    (serializers.FloatField, float),
+    (serializers.ChoiceField, str),
+    (serializers.CharField, str),
+)
+
+
+def model_column(model, source):
+    """The values() lookup and model field for a dotted source of plain fields, or (None, None)"""
+    parts = source.split(".")
+    field = None
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None, None
+        if index < len(parts) - 1:
+            if not (field.many_to_one or field.one_to_one) or field.related_model is None:
+                return None, None
+            model = field.related_model
+        elif not field.concrete or field.many_to_many:
+            return None, None
+    lookup = "__".join(parts[:-1] + [field.attname if field.is_relation else parts[-1]])
+    return lookup, field
+
+
+def formatter(field, model_field):
+    """value -> representation for a non-null column value"""
+    if isinstance(field, serializers.RelatedField):
+        return lambda value: value
+    if isinstance(field, serializers.FileField):
+        attr_class = model_field.attr_class
+        return lambda value: field.to_representation(attr_class(None, model_field, value))
+    for field_class, value_type in _PASSTHROUGH:
+        if isinstance(field, field_class):
+            represent = field.to_representation
+            return lambda value: value if type(value) is value_type else represent(value)
+    return field.to_representation
+
+
+class LeanSerializer:
+    serializer_class = None
+    # Further values() lookups that compute() needs
+    extra_lookups = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        serializer = self.serializer_class(context=self.context)
+        self.model = serializer.Meta.model
+        self.plan = []
+        lookups = {self.model._meta.pk.attname}
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            lookup, model_field = None, None
+            if not isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+                lookup, model_field = model_column(self.model, field.source)
+            if lookup is None:
+                self.plan.append((name, None, None))
+            else:
+                lookups.add(lookup)
+                self.plan.append((name, lookup, formatter(field, model_field)))
+        self.lookups = sorted(lookups | set(self.extra_lookups))
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def prepare(self, rows):
+        """Lookups shared by the page, passed to compute()"""
+        return None
+
+    def compute(self, name, row, prepared):
+        raise NotImplementedError(f"{type(self).__name__} does not compute {name}")
+
+    def render(self, rows):
+        rows = list(rows)
+        prepared = self.prepare(rows)
+        plan, compute = self.plan, self.compute
+        output = []
+        for row in rows:
+            item = {}
+            for name, lookup, represent in plan:
+                if lookup is None:
+                    value = compute(name, row, prepared)
+                    if value is not SKIP:
+                        item[name] = value
+                else:
+                    value = row[lookup]
+                    item[name] = None if value is None else represent(value)
+            output.append(item)
+        return output
+
+    def render_by_pk(self, pks):
+        """{pk: representation} for the given primary keys"""
+        pk = self.model._meta.pk.attname
+        rows = list(self.values(self.model._base_manager.filter(pk__in=set(pks)).order_by()))
+        return {row[pk]: item for row, item in zip(rows, self.render(rows))}
+
+
+class LeanListMixin:
+    """list() through ``lean_serializer_class``: same pages and output, without model instances"""
+    lean_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        lean = self.lean_serializer_class(context=self.get_serializer_context())
+        queryset = lean.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(lean.render(queryset))
+        return self.get_paginated_response(lean.render(page))
@@ -0,0 +1,73 @@
+# core/management/commands/bench_serializers.py
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from land.models import LandParcel
+from land.serializers import LandParcelLeanSerializer, LandParcelSerializer
+from owners.models import OwnerProfile
+from owners.serializers import OwnerProfileLeanSerializer, OwnerProfileSerializer
+from records.models import OwnershipRecord
+from records.serializers import OwnershipRecordLeanSerializer, OwnershipRecordSerializer
+
+# name -> (queryset factory, DRF serializer, lean serializer)
+SERIALIZERS = {
+    "parcels": (lambda: LandParcel.objects.order_by("pk"), LandParcelSerializer, LandParcelLeanSerializer),
+    "owners": (lambda: OwnerProfile.objects.order_by("pk"), OwnerProfileSerializer, OwnerProfileLeanSerializer),
+    "ownership-records": (lambda: OwnershipRecord.objects.order_by("pk"),
+                          OwnershipRecordSerializer, OwnershipRecordLeanSerializer),
+}
+
+
+def run(render, iterations):
+    """(best ms, queries) of render() over iterations"""
+    best = None
+    for _ in range(iterations):
+        queries = []
+        with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+            started = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 2), len(queries), output
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and lean list serializers on one page of rows (time, SQL queries, identical output)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--serializer", action="append", dest="serializers",
+                            choices=sorted(SERIALIZERS), help="Only run these serializers")
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--iterations", type=int, default=10)
+
+    def handle(self, *args, **options):
+        context = {"request": APIRequestFactory().get("/api/")}
+        renderer = JSONRenderer()
+
+        self.stdout.write(f"{'serializer':20} {'rows':>6} {'drf ms':>9} {'lean ms':>9} "
+                          f"{'drf q':>6} {'lean q':>6} {'speedup':>8}")
+        for name in options["serializers"] or SERIALIZERS:
+            queryset, serializer_class, lean_class = SERIALIZERS[name]
+            page_size = options["page_size"]
+
+            drf_ms, drf_queries, expected = run(
+                lambda: renderer.render(serializer_class(queryset()[:page_size], many=True, context=context).data),
+                options["iterations"])
+
+            def lean_render():
+                lean = lean_class(context=context)
+                return renderer.render(lean.render(lean.values(queryset()[:page_size])))
+
+            lean_ms, lean_queries, actual = run(lean_render, options["iterations"])
+            if json.loads(actual) != json.loads(expected):
+                raise CommandError(f"{name}: lean output differs from {serializer_class.__name__}")
+
+            rows = len(json.loads(actual))
+            speedup = f"{drf_ms / lean_ms:.1f}x" if lean_ms else "-"
+            self.stdout.write(f"{name:20} {rows:>6} {drf_ms:>9} {lean_ms:>9} "
+                              f"{drf_queries:>6} {lean_queries:>6} {speedup:>8}")
@@ -0,0 +1,119 @@
+# core/management/commands/boot.py
+import hashlib
+import os
+import socket
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+STATIC_FINGERPRINT_FILE = ".static-fingerprint"
+
+
+class Command(BaseCommand):
+    help = "Prepare a container in one process: migrate, superuser and collectstatic, each only when needed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-static", action="store_true", help="Do not collect static files")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with self.phase("migrate"):
+            self.migrate_if_needed()
+        with self.phase("superuser"):
+            self.ensure_superuser()
+        if not options["skip_static"]:
+            with self.phase("collectstatic"):
+                self.collectstatic_if_changed()
+        with self.phase("settings"):
+            self.report_settings()
+        self.stdout.write(self.style.SUCCESS(f"Boot finished in {time.perf_counter() - started:.2f}s"))
+
+    @contextmanager
+    def phase(self, name):
+        self.stdout.write(f"=== {name.upper()} ===")
+        started = time.perf_counter()
+        yield
+        self.stdout.write(f"    {name} took {time.perf_counter() - started:.2f}s")
+
+    # Migrations
+
+    def migrate_if_needed(self):
+        # The same plan migrate itself would run, so squashed and replaced
+        # migrations count the way migrate counts them
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan:
+            self.stdout.write(f"    up to date ({len(executor.loader.applied_migrations)} applied)")
+            return
+        self.stdout.write(f"    applying {len(plan)} migration(s)")
+        call_command("migrate", interactive=False, verbosity=1)
+
+    # Superuser
+
+    def ensure_superuser(self):
+        User = get_user_model()
+        username = os.environ.get("DJANGO_SUPERUSER_USERNAME", "admin")
+        password = os.environ.get("DJANGO_SUPERUSER_PASSWORD", "admin123")
+        email = os.environ.get("DJANGO_SUPERUSER_EMAIL", "admin@example.com")
+        try:
+            if User.objects.filter(username=username).exists():
+                self.stdout.write("    ✓ Superuser already exists")
+                return
+            try:
+                # If the User model needs an email
+                User.objects.create_superuser(username=username, email=email, password=password)
+            except TypeError:
+                User.objects.create_superuser(username=username, password=password)
+            self.stdout.write(f"    ✓ Superuser created: {username}")
+        except Exception as e:
+            self.stdout.write(f"    Note: Could not create superuser: {e}")
+            self.stdout.write("    You can create one manually with: python manage.py createsuperuser")
+
+    # Static files
+
+    def collectstatic_if_changed(self):
+        fingerprint_path = os.path.join(settings.STATIC_ROOT, STATIC_FINGERPRINT_FILE)
+        current = self.static_fingerprint()
+        try:
+            with open(fingerprint_path) as handle:
+                previous = handle.read().strip()
+        except OSError:
+            previous = None
+
+        if current == previous:
+            self.stdout.write("    unchanged, skipping")
+            return
+        call_command("collectstatic", interactive=False, verbosity=0)
+        os.makedirs(settings.STATIC_ROOT, exist_ok=True)
+        with open(fingerprint_path, "w") as handle:
+            handle.write(current)
+        self.stdout.write("    collected")
+
+    @staticmethod
+    def static_fingerprint():
+        """Hash of every source static file's path and contents"""
+        digests = {}
+        for finder in get_finders():
+            for path, storage in finder.list(["CVS", ".*", "*~"]):
+                # collectstatic keeps the first file found for a path
+                if path not in digests:
+                    with storage.open(path) as handle:
+                        digests[path] = hashlib.file_digest(handle, "sha256").hexdigest()
+        entries = "\n".join(f"{path}:{digest}" for path, digest in sorted(digests.items()))
+        return hashlib.sha256(entries.encode()).hexdigest()
+
+    # Diagnostics
+
+    def report_settings(self):
+        self.stdout.write(f"    Hostname: {socket.gethostname()}")
+        self.stdout.write(f"    DEBUG: {settings.DEBUG}")
+        self.stdout.write(f"    ALLOWED_HOSTS: {settings.ALLOWED_HOSTS}")
+        self.stdout.write(f"    Database: {settings.DATABASES['default']['ENGINE']}")
+        self.stdout.write(f"    SECRET_KEY exists: {'Yes' if settings.SECRET_KEY else 'No'}")
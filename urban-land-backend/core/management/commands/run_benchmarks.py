@@ -0,0 +1,64 @@
+# core/management/commands/run_benchmarks.py
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmarks
+
+DEFAULT_BUDGETS = os.path.join(settings.BASE_DIR, "benchmarks", "budgets.json")
+
+
+class Command(BaseCommand):
+    help = "Benchmark API endpoints (p50/p95 latency, SQL queries, peak memory) and enforce budgets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", action="append", dest="endpoints",
+                            choices=sorted([*benchmarks.ENDPOINTS, *benchmarks.COLD_ENDPOINTS]), help="Only run these endpoints")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--budgets", default=DEFAULT_BUDGETS,
+                            help="JSON file of per-endpoint limits, e.g. {\"parcel-list\": {\"queries\": 25}}")
+        parser.add_argument("--baseline", help="Previous results file to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Allowed relative slowdown of p95 against --baseline")
+
+    def handle(self, *args, **options):
+        results = benchmarks.run(options["endpoints"], options["iterations"], options["warmup"])
+
+        self.stdout.write(f"{'endpoint':34} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KB':>9}")
+        for name, stats in results.items():
+            self.stdout.write(f"{name:34} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                              f"{stats['queries']:>8} {stats['peak_kb']:>9}")
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(results, handle, indent=2)
+
+        failures = []
+        if options["budgets"] and os.path.exists(options["budgets"]):
+            with open(options["budgets"]) as handle:
+                failures += benchmarks.check_budgets(results, json.load(handle), options["endpoints"])
+        if options["baseline"]:
+            with open(options["baseline"]) as handle:
+                baseline = json.load(handle)
+            failures += self.compare(results, baseline, options["tolerance"])
+
+        if failures:
+            raise CommandError("Benchmark budget exceeded:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All endpoints within budget"))
+
+    @staticmethod
+    def compare(results, baseline, tolerance):
+        failures = []
+        for name, stats in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            if stats["queries"] > previous["queries"]:
+                failures.append(f"{name}: queries {stats['queries']} up from {previous['queries']}")
+            if stats["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                failures.append(f"{name}: p95 {stats['p95_ms']}ms up from {previous['p95_ms']}ms")
+        return failures
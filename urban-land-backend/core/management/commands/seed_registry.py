@@ -0,0 +1,192 @@
+# core/management/commands/seed_registry.py
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import User
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from records.models import Document, OwnershipRecord
+from transactions.models import LandTransaction, Payment
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+ZONES = [zone for zone, _ in LandParcel.LAND_USE_ZONE_CHOICES]
+DEVELOPMENT = [status for status, _ in LandParcel.DEVELOPMENT_STATUS_CHOICES]
+STATUSES = ["active"] * 8 + ["inactive", "pending"]
+MOUZAS = [f"Mouza {n:03d}" for n in range(200)]
+FIRST_NAMES = ["Abebe", "Almaz", "Dawit", "Hana", "Kebede", "Meron", "Selam", "Tesfaye", "Yonas", "Zewdu"]
+LAST_NAMES = ["Alemu", "Bekele", "Desta", "Girma", "Haile", "Mekonnen", "Negash", "Tadesse", "Worku", "Yilma"]
+# Price per square metre by zone, before noise
+ZONE_PRICE = {
+    "Residential": 900, "Commercial": 2200, "Industrial": 700,
+    "Agricultural": 120, "Public": 300, "Mixed": 1400,
+}
+SEED_PREFIX = "seed"
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic land registry for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("size", choices=sorted(SIZES), help="Number of parcels: 10k, 100k or 1m")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--flush", action="store_true",
+            help="Delete previously seeded rows first"
+        )
+
+    def handle(self, *args, **options):
+        parcels = SIZES[options["size"]]
+        self.batch_size = options["batch_size"]
+        self.rng = random.Random(options["seed"])
+
+        if options["flush"]:
+            self.flush()
+        elif User.objects.filter(username__startswith=f"{SEED_PREFIX}_").exists():
+            raise CommandError("Seeded data already exists; rerun with --flush to replace it")
+
+        started = time.perf_counter()
+        owner_ids = self.create_owners(max(1, parcels // 2))
+        for offset in range(0, parcels, self.batch_size):
+            count = min(self.batch_size, parcels - offset)
+            with transaction.atomic():
+                self.create_parcel_batch(offset, count, owner_ids)
+            self.stdout.write(f"  {offset + count}/{parcels} parcels")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {parcels} parcels and {len(owner_ids)} owners in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def flush(self):
+        seeded = LandParcel.objects.filter(cadastral_number__startswith=f"{SEED_PREFIX.upper()}-")
+        # Ownership records, documents and transactions cascade with their parcel
+        Payment.objects.filter(parcel__in=seeded).delete()
+        seeded.delete()
+        User.objects.filter(username__startswith=f"{SEED_PREFIX}_").delete()
+
+    def create_owners(self, count):
+        rng = self.rng
+        password = make_password(None)
+        owner_ids = []
+        for offset in range(0, count, self.batch_size):
+            numbers = range(offset, min(count, offset + self.batch_size))
+            with transaction.atomic():
+                users = User.objects.bulk_create(
+                    User(username=f"{SEED_PREFIX}_owner_{n}", role="owner", password=password)
+                    for n in numbers
+                )
+                users = ensure_pks(users, User, "username")
+                profiles = OwnerProfile.objects.bulk_create(
+                    OwnerProfile(
+                        user=user,
+                        national_id=f"SEED{n:09d}",
+                        first_name=rng.choice(FIRST_NAMES),
+                        last_name=rng.choice(LAST_NAMES),
+                        gender=rng.choice(["Male", "Female"]),
+                        date_of_birth=datetime.date(1950, 1, 1) + datetime.timedelta(days=rng.randrange(20000)),
+                        permanent_address=f"{rng.choice(MOUZAS)}, House {rng.randrange(1, 999)}",
+                        owner_type=rng.choice(["Individual"] * 9 + ["Company"]),
+                    )
+                    for n, user in zip(numbers, users)
+                )
+            owner_ids.extend(profile.pk for profile in ensure_pks(profiles, OwnerProfile, "national_id"))
+        return owner_ids
+
+    def create_parcel_batch(self, offset, count, owner_ids):
+        rng = self.rng
+        parcels = []
+        for n in range(offset, offset + count):
+            zone = rng.choice(ZONES)
+            area = round(rng.lognormvariate(6, 0.8), 2)
+            value = Decimal(int(area * ZONE_PRICE[zone] * rng.uniform(0.6, 1.4)))
+            parcels.append(LandParcel(
+                location=f"{rng.choice(MOUZAS)}, Block {rng.randrange(1, 60)}",
+                area=area,
+                land_use_type=zone,
+                land_use_zone=zone,
+                status=rng.choice(STATUSES),
+                cadastral_number=f"{SEED_PREFIX.upper()}-{n:07d}",
+                survey_number=str(rng.randrange(1, 5000)),
+                block_number=str(rng.randrange(1, 60)),
+                sector_number=str(rng.randrange(1, 30)),
+                mouza_name=rng.choice(MOUZAS),
+                registration_date=datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randrange(9000)),
+                registration_number=f"REG-{SEED_PREFIX.upper()}-{n:07d}",
+                current_market_value=value,
+                annual_tax_value=(value * Decimal("0.01")).quantize(Decimal("0.01")),
+                development_status=rng.choice(DEVELOPMENT),
+                has_structures=rng.random() < 0.6,
+            ))
+        # Seed data has no edit history, so skip the versioned manager
+        parcels = ensure_pks(LandParcel._base_manager.bulk_create(parcels), LandParcel, "cadastral_number")
+
+        records, sales, documents, payments = [], [], [], []
+        for parcel in parcels:
+            chain = rng.sample(owner_ids, min(len(owner_ids), rng.choice([1, 1, 2, 3])))
+            acquired = parcel.registration_date
+            for position, owner_id in enumerate(chain):
+                current = position == len(chain) - 1
+                price = (parcel.current_market_value * Decimal(rng.uniform(0.5, 1.1))).quantize(Decimal("0.01"))
+                transfer_date = None if current else acquired + datetime.timedelta(days=rng.randrange(200, 2000))
+                records.append(OwnershipRecord(
+                    parcel=parcel,
+                    owner_id=owner_id,
+                    acquisition_type="Purchase" if position else "Government_Allocation",
+                    acquisition_date=acquired,
+                    acquisition_value=price if position else None,
+                    is_current_owner=current,
+                    verification_status=rng.choice(["Verified"] * 4 + ["Pending"]),
+                    transfer_date=transfer_date,
+                    transfer_type=None if current else "Sale",
+                    transfer_to_id=None if current else chain[position + 1],
+                ))
+                if position:
+                    sales.append(LandTransaction(
+                        parcel=parcel,
+                        seller_id=chain[position - 1],
+                        buyer_id=owner_id,
+                        transaction_type="sale",
+                        transaction_date=acquired,
+                        amount=min(price, Decimal("9999999999.99")),
+                        status="completed",
+                    ))
+                if transfer_date:
+                    acquired = transfer_date
+            documents.append(Document(
+                related_parcel=parcel,
+                doc_type="Title_Deed",
+                document_number=f"TD-{parcel.cadastral_number}",
+                document_date=acquired,
+                is_verified=rng.random() < 0.8,
+            ))
+            for year in (2024, 2025):
+                payments.append(Payment(
+                    payer_id=chain[-1],
+                    parcel=parcel,
+                    amount=parcel.annual_tax_value,
+                    payment_type="tax",
+                    payment_date=datetime.date(year, rng.randrange(1, 13), 1),
+                    status="paid" if year == 2024 or rng.random() < 0.7 else "pending",
+                ))
+
+        OwnershipRecord._base_manager.bulk_create(records, batch_size=self.batch_size)
+        LandTransaction.objects.bulk_create(sales, batch_size=self.batch_size)
+        Document.objects.bulk_create(documents, batch_size=self.batch_size)
+        Payment.objects.bulk_create(payments, batch_size=self.batch_size)
+
+
+def ensure_pks(objs, model, unique_field):
+    """Fill in primary keys on backends whose bulk_create does not return them"""
+    if not objs or objs[0].pk is not None:
+        return objs
+    keys = [getattr(obj, unique_field) for obj in objs]
+    pks = dict(model.objects.filter(**{f"{unique_field}__in": keys}).values_list(unique_field, "pk"))
+    for obj in objs:
+        obj.pk = pks[getattr(obj, unique_field)]
+    return objs
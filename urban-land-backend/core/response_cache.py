@@ -0,0 +1,137 @@
+# core/response_cache.py
+"""
+Caches of serialized retrieve and list responses, invalidated by writes.
+
+Every cached object has a version token in the Django cache. A retrieve is
+cached under the tokens of the objects its response is built from, and
+writes replace the tokens of every object whose response embeds the
+written row (see core.signals), so a changed object is never served from
+the cache. Tokens are replaced after the write commits. A token evicted
+from the cache is regenerated, which also just misses.
+
+Responses expire after RESPONSE_CACHE_TTL seconds; the local-memory
+backend used without Redis also evicts least recently used entries beyond
+its MAX_ENTRIES.
+
+List pages depend on too many rows for per-object tokens, so they are
+stored under their normalized query parameters together with the
+generation tokens of the models they show; any write to one of those
+models starts a new generation. A page from an older generation is still
+served for up to LIST_CACHE_STALE_SECONDS while one request, holding a
+short lock, renders the new one, so a write does not send every reader
+to the database at once.
+"""
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from monitoring import metrics
+
+
+def _version_key(label, pk):
+    return f"objver:{label}:{pk}"
+
+
+def versions(objects):
+    """Current version tokens for [(label, pk)], created where missing"""
+    keys = [_version_key(label, pk) for label, pk in objects]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(label, pks):
+    """Invalidate cached responses built from these objects, once the current transaction commits"""
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+
+    def replace_tokens():
+        cache.set_many({_version_key(label, pk): uuid.uuid4().hex for pk in pks}, timeout=None)
+
+    transaction.on_commit(replace_tokens)
+
+
+def bump_generation(name):
+    """Start a new generation of cached lists that show ``name`` rows"""
+    bump("generation", [name])
+
+
+def normalized_params(request):
+    """Query parameters as a sorted tuple, without empty values or the default page"""
+    params = []
+    for key in sorted(request.query_params):
+        values = sorted(value for value in request.query_params.getlist(key) if value != "")
+        if values and key != "format" and (key, values) != ("page", ["1"]):
+            params.append((key, tuple(values)))
+    return tuple(params)
+
+
+class CachedRetrieveMixin:
+    """
+    Serves retrieve() from the response cache. ``cache_dependencies(obj)``
+    lists the (label, pk) objects the response is built from; the object's
+    own entry is enough when writes to embedded rows bump it.
+    """
+    cache_label = None
+
+    def cache_dependencies(self, obj):
+        return [(self.cache_label, obj.pk)]
+
+    def retrieve(self, request, *args, **kwargs):
+        # get_object() still runs, so permissions and queryset scoping apply
+        instance = self.get_object()
+        tokens = versions(self.cache_dependencies(instance))
+        key = f"response:{self.cache_label}:{instance.pk}:{request.scheme}://{request.get_host()}:{':'.join(tokens)}"
+        data = cache.get(key)
+        metrics.record_cache(f"retrieve:{self.cache_label}", data is not None)
+        if data is None:
+            data = self.get_serializer(instance).data
+            cache.set(key, data, timeout=settings.RESPONSE_CACHE_TTL)
+        return Response(data)
+
+
+class CachedListMixin:
+    """
+    Serves list() from the list cache. Only for lists that do not vary by
+    user; ``list_cache_generations`` names the models whose writes change
+    the rendered page.
+    """
+    cache_label = None
+    list_cache_generations = ()
+
+    def list(self, request, *args, **kwargs):
+        generation = ":".join(versions([("generation", name) for name in self.list_cache_generations]))
+        digest = hashlib.sha1(repr((request.scheme, request.get_host(), normalized_params(request))).encode())
+        key = f"list:{self.cache_label}:{digest.hexdigest()}"
+        now = time.time()
+
+        entry = cache.get(key)
+        if entry is not None:
+            entry_generation, stored_at, data = entry
+            if entry_generation == generation and now - stored_at < settings.LIST_CACHE_TTL:
+                metrics.record_cache(f"list:{self.cache_label}", True)
+                return Response(data)
+            # Stale: one request re-renders, the others keep serving this page
+            if not cache.add(f"{key}:lock", 1, timeout=settings.LIST_CACHE_STALE_SECONDS):
+                metrics.record_cache(f"list:{self.cache_label}", True)
+                return Response(data)
+
+        metrics.record_cache(f"list:{self.cache_label}", False)
+        try:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, (generation, now, response.data),
+                          timeout=settings.LIST_CACHE_TTL + settings.LIST_CACHE_STALE_SECONDS)
+        finally:
+            if entry is not None:
+                cache.delete(f"{key}:lock")
+        return response
@@ -0,0 +1,115 @@
+# core/signals.py
+"""
+Response cache invalidation (core.response_cache).
+
+A parcel response embeds its current owners' names, an owner response its
+current parcels, and an ownership record response its whole owner and
+parcel responses (it is cached under all three tokens). So:
+
+    parcel written     -> the parcel and the owners holding it
+    owner written      -> the owner and the parcels they hold
+    record written     -> the record, its parcel and its owner
+
+Each write also starts a new list cache generation for its model.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from audit.versioning import bulk_saved
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from records.models import OwnershipRecord
+from .response_cache import bump, bump_generation
+
+LOOKUP_CHUNK = 1000
+
+
+def _current_holdings(field, ids, column):
+    """Distinct ``column`` values of current ownership records whose ``field`` is in ids"""
+    ids = list(ids)
+    found = set()
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        found.update(OwnershipRecord.objects
+                     .filter(is_current_owner=True, **{f"{field}__in": ids[start:start + LOOKUP_CHUNK]})
+                     .values_list(column, flat=True))
+    return found
+
+
+def parcels_changed(pks):
+    bump_generation("parcel")
+    bump("parcel", pks)
+    bump("owner", _current_holdings("parcel_id", pks, "owner_id"))
+
+
+def owners_changed(pks):
+    bump_generation("owner")
+    bump("owner", pks)
+    bump("parcel", _current_holdings("owner_id", pks, "parcel_id"))
+
+
+def records_changed(rows):
+    """rows: (pk, parcel_id, owner_id) of the records before and after the write"""
+    rows = list(rows)
+    bump_generation("ownershiprecord")
+    bump("ownershiprecord", [pk for pk, _, _ in rows])
+    bump("parcel", [parcel_id for _, parcel_id, _ in rows])
+    bump("owner", [owner_id for _, _, owner_id in rows])
+
+
+@receiver([post_save, post_delete], sender=LandParcel)
+def parcel_written(sender, instance, raw=False, **kwargs):
+    if not raw:
+        parcels_changed([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=OwnerProfile)
+def owner_written(sender, instance, raw=False, **kwargs):
+    if not raw:
+        owners_changed([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def user_written(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Owner responses show the username; logins only save last_login
+    if not raw and (update_fields is None or "username" in update_fields):
+        pks = list(OwnerProfile.objects.filter(user=instance).values_list("pk", flat=True))
+        if pks:
+            owners_changed(pks)
+
+
+@receiver(pre_save, sender=OwnershipRecord)
+def record_saving(sender, instance, raw=False, **kwargs):
+    instance._cache_previous = None
+    if not raw and instance.pk is not None:
+        instance._cache_previous = (OwnershipRecord.objects
+                                    .filter(pk=instance.pk)
+                                    .values_list("pk", "parcel_id", "owner_id")
+                                    .first())
+
+
+@receiver([post_save, post_delete], sender=OwnershipRecord)
+def record_written(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    rows = [(instance.pk, instance.parcel_id, instance.owner_id)]
+    previous = getattr(instance, "_cache_previous", None)
+    if previous:
+        rows.append(previous)
+    records_changed(rows)
+
+
+@receiver(bulk_saved, sender=LandParcel)
+def parcels_bulk_saved(sender, pks, **kwargs):
+    parcels_changed(pks)
+
+
+@receiver(bulk_saved, sender=OwnershipRecord)
+def records_bulk_saved(sender, pks, previous=None, **kwargs):
+    # Like record_written, the parcel and owner a record moved away from too
+    rows = [(pk, state["parcel_id"], state["owner_id"]) for pk, state in (previous or {}).items()]
+    for start in range(0, len(pks), LOOKUP_CHUNK):
+        rows += (OwnershipRecord.objects
+                 .filter(pk__in=pks[start:start + LOOKUP_CHUNK])
+                 .values_list("pk", "parcel_id", "owner_id"))
+    records_changed(rows)
@@ -0,0 +1,216 @@
+import datetime
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from config import routers
+from core import benchmarks, response_cache
+from land.models import LandParcel
+from land.views import LandParcelViewSet
+from monitoring import metrics
+from owners.models import OwnerProfile
+from records.models import OwnershipRecord
+
+
+class BatchTests(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = User.objects.create_user("clerk", password="x", role="admin")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+
+    def batch(self, *urls):
+        response = self.client.post("/api/batch/", {"requests": list(urls)}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data["responses"]
+
+    def test_async_endpoints_are_batched(self):
+        sync, asynchronous = self.batch("/api/parcels/", "/api/async/parcels/")
+        self.assertEqual((sync["status"], asynchronous["status"]), (200, 200))
+        self.assertEqual(asynchronous["body"]["count"], 1)
+        self.assertEqual(asynchronous["body"]["results"][0]["cadastral_number"], "CAD-1")
+
+    def test_failures_are_logged_not_returned(self):
+        with mock.patch.object(LandParcelViewSet, "list", side_effect=RuntimeError("password=hunter2")), \
+                self.assertLogs("core.views", level="ERROR") as logs:
+            failed, = self.batch("/api/parcels/")
+        self.assertEqual(failed["status"], 500)
+        self.assertEqual(failed["body"], {"error": "Internal server error"})
+        self.assertIn("hunter2", "\n".join(logs.output))
+
+    @override_settings(DATABASE_REPLICAS=["default"])
+    def test_subrequests_are_routed_as_reads(self):
+        seen = []
+
+        def list_parcels(viewset, request, *args, **kwargs):
+            state = routers._request_state.get()
+            seen.append((state.replica, state.pinned))
+            return Response({})
+
+        with mock.patch.object(LandParcelViewSet, "list", list_parcels):
+            self.batch("/api/parcels/")
+            response = self.client.post("/api/batch/", {
+                "requests": ["/api/parcels/", "/api/parcels/?page=2"], "parallel": True,
+            }, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seen, [("default", False)] * 3)
+
+
+class BudgetTests(SimpleTestCase):
+    budgets = {"parcel-list": {"queries": 3}, "owner-portal": {"queries": 5}}
+
+    def test_unmeasured_budget_fails(self):
+        results = {"parcel-list": {"queries": 3}}
+        self.assertEqual(benchmarks.check_budgets(results, self.budgets),
+                         ["owner-portal: not measured (no benchmark user or parcel for it)"])
+
+    def test_only_selected_endpoints_are_checked(self):
+        results = {"parcel-list": {"queries": 4}}
+        self.assertEqual(benchmarks.check_budgets(results, self.budgets, ["parcel-list"]),
+                         ["parcel-list: queries 4 exceeds budget 3"])
+
+
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        cls.owner, cls.buyer = (
+            OwnerProfile.objects.create(
+                user=User.objects.create_user(name, password="x"), national_id=f"N-{name}",
+                first_name=name.title(), last_name="B", gender="Other",
+            )
+            for name in ("owner", "buyer")
+        )
+        cls.record = OwnershipRecord.objects.create(
+            parcel=cls.parcel, owner=cls.owner, ownership_percentage=100,
+            acquisition_date=datetime.date(2021, 3, 4), is_current_owner=True,
+        )
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.officer)
+
+    def get(self, path):
+        """(response data, whether it came from the cache)"""
+        with mock.patch.object(metrics, "record_cache") as record:
+            response = self.api.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.data, record.call_args.args[1]
+
+    def owner_name(self):
+        data, _ = self.get(f"/api/parcels/{self.parcel.pk}/")
+        return data["owner_name"]
+
+    def owned(self, owner):
+        data, _ = self.get(f"/api/owners/{owner.pk}/")
+        return [land["parcel"]["cadastral_number"] for land in data["owned_lands"]]
+
+    def test_retrieve_misses_then_hits_until_the_parcel_is_saved(self):
+        path = f"/api/parcels/{self.parcel.pk}/"
+        self.assertEqual(self.get(path)[1], False)
+        self.assertEqual(self.get(path)[1], True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.parcel.location = "Block 9"
+            self.parcel.save()
+        data, hit = self.get(path)
+        self.assertEqual((data["location"], hit), ("Block 9", False))
+
+    def test_owner_save_and_delete_reach_the_parcel(self):
+        self.assertEqual(self.owner_name(), "Owner B")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.first_name = "Renamed"
+            self.owner.save()
+        self.assertEqual(self.owner_name(), "Renamed B")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.delete()
+        self.assertEqual(self.owner_name(), "No Owner")
+
+    def test_record_delete_reaches_parcel_and_owner(self):
+        self.assertEqual((self.owner_name(), self.owned(self.owner)), ("Owner B", ["CAD-1"]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record.delete()
+        self.assertEqual((self.owner_name(), self.owned(self.owner)), ("No Owner", []))
+
+    def test_bulk_transfer_reaches_the_old_and_new_owner(self):
+        self.assertEqual((self.owned(self.owner), self.owned(self.buyer)), (["CAD-1"], []))
+        with self.captureOnCommitCallbacks(execute=True):
+            OwnershipRecord.objects.filter(pk=self.record.pk).update(owner=self.buyer)
+        self.assertEqual((self.owned(self.owner), self.owned(self.buyer)), ([], ["CAD-1"]))
+        self.assertEqual(self.owner_name(), "Buyer B")
+
+
+class ListCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+        cls.new_parcel(1)
+
+    @staticmethod
+    def new_parcel(number):
+        return LandParcel.objects.create(
+            location=f"Block {number}", area=100.0, land_use_type="Residential",
+            cadastral_number=f"CAD-{number}", registration_date="2024-01-15",
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.officer)
+        patcher = mock.patch.object(response_cache, "cache", mock.Mock(wraps=cache))
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def list(self):
+        """(parcel count, whether the page came from the cache)"""
+        with mock.patch.object(metrics, "record_cache") as record:
+            response = self.api.get("/api/parcels/")
+        self.assertEqual(response.status_code, 200)
+        return response.data["count"], record.call_args.args[1]
+
+    def page_key(self):
+        return next(call.args[0] for call in self.cache.get.call_args_list if call.args[0].startswith("list:"))
+
+    def test_writes_start_a_new_generation(self):
+        self.assertEqual(self.list(), (1, False))
+        self.assertEqual(self.list(), (1, True))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.new_parcel(2)
+        self.assertEqual(self.list(), (2, False))
+        self.assertEqual(self.list(), (2, True))
+
+    def test_unrelated_generation_keeps_the_page(self):
+        self.list()
+        with self.captureOnCommitCallbacks(execute=True):
+            response_cache.bump_generation("payment")
+        self.assertEqual(self.list(), (1, True))
+
+    def test_stale_page_is_served_while_another_request_renders(self):
+        self.list()
+        lock = f"{self.page_key()}:lock"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.new_parcel(2)
+
+        cache.add(lock, 1)  # another worker is re-rendering
+        self.assertEqual(self.list(), (1, True))
+        cache.delete(lock)
+
+        self.assertEqual(self.list(), (2, False))
+        self.assertIn(mock.call(lock, 1, timeout=settings.LIST_CACHE_STALE_SECONDS),
+                      self.cache.add.call_args_list)
+        self.assertIsNone(cache.get(lock))
@@ -0,0 +1,120 @@
+# core/views.py
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from config.routers import begin_request, end_request
+
+BATCH_PATH = "/api/batch/"
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url):
+    """(path, query string) with the query parameters sorted, so equal requests compare equal"""
+    parts = urlsplit(url)
+    query = QueryDict(parts.query)
+    return parts.path, urlencode([(key, value) for key in sorted(query) for value in sorted(query.getlist(key))])
+
+
+def run_subrequest(request, path, query):
+    """GET ``path`` through the URLconf as the batch request's already authenticated user"""
+    if not path.startswith("/api/") or path == BATCH_PATH:
+        return status.HTTP_400_BAD_REQUEST, {"error": "Only GET requests to /api/ endpoints can be batched"}
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {"error": "Not found"}
+
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items()
+                if key not in ("CONTENT_TYPE", "CONTENT_LENGTH")}
+    sub.META.update(REQUEST_METHOD="GET", PATH_INFO=path, QUERY_STRING=query)
+    sub.GET = QueryDict(query)
+    sub.resolver_match = match
+    # Seen by rest_framework.request.Request, so sub-views skip authentication
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+
+    view = match.func
+    if iscoroutinefunction(view):
+        # The async endpoints (api/async/...) authenticate from the copied headers
+        view = async_to_sync(view)
+    # Route like a GET of its own (DatabaseRoutingMiddleware): the batch is
+    # a POST pinned to the primary, and pool threads start without any state
+    routing = begin_request(read_only=True)
+    try:
+        response = view(sub, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        if getattr(response, "data", None) is not None:
+            return response.status_code, response.data
+        if response.streaming or not response.get("Content-Type", "").startswith("application/json"):
+            return response.status_code, None
+        return response.status_code, json.loads(response.content or b"null")
+    except Exception:
+        logger.exception("Batched request to %s failed", path)
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+    finally:
+        end_request(routing)
+
+
+def _run_in_thread(request, path, query):
+    try:
+        return run_subrequest(request, path, query)
+    finally:
+        # Each pool thread opened its own connection
+        connections.close_all()
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several GET requests in one round trip:
+    {"requests": [{"id": "a", "url": "/api/parcels/1/owners/"}, ...], "parallel": false}.
+    Sub-requests share this request's authentication (and, unless parallel,
+    its database connection); identical URLs run once. Responses come back
+    in request order as {"id", "url", "status", "body"}.
+    """
+    items = request.data.get("requests")
+    if not isinstance(items, list) or not items:
+        return Response({"error": "requests must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        return Response({"error": f"At most {settings.BATCH_MAX_REQUESTS} requests per batch"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    requested = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {"url": item}
+        if not isinstance(item, dict) or not isinstance(item.get("url"), str):
+            return Response({"error": f"requests[{index}] needs a url"}, status=status.HTTP_400_BAD_REQUEST)
+        if item.get("method", "GET").upper() != "GET":
+            return Response({"error": "Only GET requests can be batched"}, status=status.HTTP_400_BAD_REQUEST)
+        requested.append((item.get("id", index), item["url"], normalize_url(item["url"])))
+
+    unique = list(dict.fromkeys(key for _, _, key in requested))
+    if request.data.get("parallel") and len(unique) > 1:
+        with ThreadPoolExecutor(max_workers=min(settings.BATCH_MAX_WORKERS, len(unique))) as pool:
+            results = dict(zip(unique, pool.map(lambda key: _run_in_thread(request, *key), unique)))
+    else:
+        results = {key: run_subrequest(request, *key) for key in unique}
+
+    return Response({"responses": [
+        {"id": item_id, "url": url, "status": results[key][0], "body": results[key][1]}
+        for item_id, url, key in requested
+    ]})
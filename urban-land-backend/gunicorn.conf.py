@@ -0,0 +1,25 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings used by start.sh.
+
+The app is imported once in the master and workers fork from it, so each
+worker starts with Django already set up instead of paying the import cost.
+Worker count comes from WEB_CONCURRENCY (gunicorn's default behaviour).
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Never share database sockets opened in the master with forked workers
+    from django.db import connections
+    connections.close_all()
+
+
+def on_starting(server):
+    # Metrics snapshots of a previous run would otherwise be summed in
+    import shutil
+    from django.conf import settings
+    shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class LandConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'land'
+
+    def ready(self):
+        from audit import versioning
+        versioning.register(self.get_model('LandParcel'))
+        from . import signals  # noqa: F401
@@ -0,0 +1,65 @@
+# land/async_views.py
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import ValidationError
+
+from config.async_api import apaginate, async_login_required, drf_request, json_response
+from records.models import OwnershipRecord
+from .models import LandParcel
+from .serializers import LandParcelSerializer
+from .views import LandParcelViewSet
+
+
+async def owner_names_for(parcel_ids):
+    """Primary current owner name per parcel, in one query"""
+    records = (
+        OwnershipRecord.objects
+        .filter(parcel_id__in=parcel_ids, is_current_owner=True)
+        .order_by('parcel_id', '-acquisition_date')
+        .values_list('parcel_id', 'owner__first_name', 'owner__last_name')
+    )
+    names = {}
+    async for parcel_id, first_name, last_name in records:
+        names.setdefault(parcel_id, f"{first_name} {last_name}")
+    return names
+
+
+async def serialize_parcels(request, parcels):
+    owner_names = await owner_names_for([parcel.parcel_id for parcel in parcels])
+    return LandParcelSerializer(
+        parcels,
+        many=True,
+        context={'request': request, 'owner_names': owner_names}
+    ).data
+
+
+@require_GET
+@async_login_required
+async def parcel_list(request):
+    """Async LandParcelViewSet.list with the same filters, search, ordering and pages"""
+    view = LandParcelViewSet(
+        request=drf_request(request),
+        format_kwarg=None,
+        action='list',
+        kwargs={}
+    )
+    try:
+        queryset = view.filter_queryset(view.get_queryset())
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+
+    async def serialize(parcels):
+        return await serialize_parcels(request, parcels)
+
+    return await apaginate(request, queryset, serialize)
+
+
+@require_GET
+@async_login_required
+async def parcel_detail(request, pk):
+    """Async LandParcelViewSet.retrieve"""
+    try:
+        parcel = await LandParcel.objects.aget(pk=pk)
+    except LandParcel.DoesNotExist:
+        return json_response({"detail": "No LandParcel matches the given query."}, status=404)
+    data = await serialize_parcels(request, [parcel])
+    return json_response(data[0])
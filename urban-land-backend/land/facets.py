@@ -0,0 +1,59 @@
+# land/facets.py
+"""
+Facet counts for the parcel filter sidebar: how many parcels of a filtered
+queryset have each value of a facet dimension. PostgreSQL counts every
+dimension in one GROUPING SETS query; other databases run one grouped
+query per dimension. Both run on the queryset's database (a replica for
+routed reads).
+"""
+from django.db import connections
+from django.db.models import Count
+
+DIMENSIONS = ("status", "land_use_zone", "development_status", "is_active")
+
+
+def _ordered(counts):
+    """[{"value", "count"}] by count, most common first"""
+    return [{"value": value, "count": count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))]
+
+
+def _grouped(queryset, dimensions):
+    return {
+        dimension: dict(queryset.values(dimension).annotate(count=Count("pk")).values_list(dimension, "count"))
+        for dimension in dimensions
+    }
+
+
+def _grouping_sets(queryset, dimensions):
+    connection = connections[queryset.db]
+    quote = connection.ops.quote_name
+    columns = [quote(queryset.model._meta.get_field(dimension).column) for dimension in dimensions]
+    sql, params = queryset.values(*dimensions).query.get_compiler(connection=connection).as_sql()
+    groupings = ", ".join(f"GROUPING({column})" for column in columns)
+    sets = ", ".join(f"({column})" for column in columns)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {', '.join(columns)}, {groupings}, COUNT(*) FROM ({sql}) AS filtered "
+            f"GROUP BY GROUPING SETS ({sets})",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    counts = {dimension: {} for dimension in dimensions}
+    size = len(dimensions)
+    for row in rows:
+        # GROUPING(column) is 0 for the column the row is grouped by
+        index = row[size:2 * size].index(0)
+        counts[dimensions[index]][row[index]] = row[-1]
+    return counts
+
+
+def facet_counts(queryset, dimensions=DIMENSIONS):
+    """{dimension: [{"value", "count"}]} over the rows of ``queryset``"""
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor == "postgresql":
+        counts = _grouping_sets(queryset, dimensions)
+    else:
+        counts = _grouped(queryset, dimensions)
+    return {dimension: _ordered(counts[dimension]) for dimension in dimensions}
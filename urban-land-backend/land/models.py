@@ -1,6 +1,7 @@
 from django.db import models
 from owners.models import OwnerProfile
 from django.utils import timezone
+from audit.versioning import VersionedQuerySet
 
 class LandParcel(models.Model):
     # REMOVE this line: owner = models.ForeignKey(OwnerProfile, on_delete=models.CASCADE)
@@ -57,6 +58,8 @@ class LandParcel(models.Model):
     last_updated = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return f"Parcel {self.parcel_id} - {self.cadastral_number}"
     
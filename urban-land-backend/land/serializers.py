@@ -1,5 +1,6 @@
 # land/serializers.py
 from rest_framework import serializers
+from core.lean import LeanSerializer
 from .models import LandParcel
 
 class LandParcelSerializer(serializers.ModelSerializer):
@@ -41,6 +42,10 @@ class LandParcelSerializer(serializers.ModelSerializer):
     
     def get_owner_name(self, obj):
         """Get primary owner name from ownership records"""
+        # Callers that already loaded owners pass them as {parcel_id: name}
+        owner_names = self.context.get('owner_names')
+        if owner_names is not None:
+            return owner_names.get(obj.parcel_id, "No Owner")
         try:
             from records.models import OwnershipRecord
             record = OwnershipRecord.objects.filter(
@@ -54,6 +59,32 @@ class LandParcelSerializer(serializers.ModelSerializer):
         return "No Owner"
 
 
+def current_owner_names(parcel_ids):
+    """Primary current owner name per parcel, as get_owner_name() picks it, in one query"""
+    from records.models import OwnershipRecord
+    names = {}
+    records = (OwnershipRecord.objects
+               .filter(parcel_id__in=parcel_ids, is_current_owner=True)
+               .order_by('parcel_id', '-acquisition_date', 'pk')
+               .values_list('parcel_id', 'owner__first_name', 'owner__last_name'))
+    for parcel_id, first_name, last_name in records:
+        names.setdefault(parcel_id, f"{first_name} {last_name}")
+    return names
+
+
+class LandParcelLeanSerializer(LeanSerializer):
+    """LandParcelSerializer output for list pages, from values() rows"""
+    serializer_class = LandParcelSerializer
+
+    def prepare(self, rows):
+        return self.context.get('owner_names') or current_owner_names([row['parcel_id'] for row in rows])
+
+    def compute(self, name, row, owner_names):
+        if name == 'owner_name':
+            return owner_names.get(row['parcel_id'], "No Owner")
+        return super().compute(name, row, owner_names)
+
+
 # Keep this for backward compatibility if needed
 class ParcelSerializer(LandParcelSerializer):
     """Alias for backward compatibility"""
@@ -0,0 +1,19 @@
+# land/signals.py
+from django.db import models
+from django.dispatch import receiver
+from django.utils import timezone
+
+from audit.versioning import bulk_saved
+from .models import LandParcel
+
+LOOKUP_CHUNK = 1000
+
+
+@receiver(bulk_saved, sender=LandParcel)
+def parcels_bulk_saved(sender, pks, **kwargs):
+    # bulk_update() and update() skip auto_now; the parcel snapshot
+    # (land.snapshot) refreshes from last_updated
+    now = timezone.now()
+    plain = models.QuerySet(LandParcel)
+    for start in range(0, len(pks), LOOKUP_CHUNK):
+        plain.filter(pk__in=pks[start:start + LOOKUP_CHUNK]).update(last_updated=now)
@@ -0,0 +1,305 @@
+# land/snapshot.py
+"""
+Column-store snapshot of the parcel registry for in-process analytics.
+
+The key parcel columns are held as NumPy arrays sorted by id, so counts,
+sums and histograms over the whole registry are array operations instead
+of table scans. Text columns are stored as int32 codes into per-column
+value lists (-1 for NULL); the lists only grow, so codes stay stable
+across refreshes. Decimal columns are stored as int64 cents (NULL_CENTS
+for NULL), so their sums are exact.
+
+The snapshot is refreshed when the parcel list generation token (see
+core.response_cache) changes, or after PARCEL_SNAPSHOT_MAX_AGE seconds.
+Parcel writes bump that token, but only in the writing process unless the
+cache is shared, so the figures built on the snapshot (parcel stats and
+types, the dashboards) can be up to PARCEL_SNAPSHOT_MAX_AGE seconds stale.
+A refresh reads only the rows whose last_updated is at or after the
+previous watermark (less PARCEL_SNAPSHOT_OVERLAP, for transactions that
+committed late), and checks the count and id sum of the table to drop
+deleted rows. land.signals stamps last_updated on bulk writes so they are
+picked up too.
+
+With PARCEL_SNAPSHOT_DIR set, a refreshed snapshot is written there as
+.npy files and every worker memory-maps the same copy; one worker at a
+time refreshes (a cache lock) while the others keep using the previous
+one.
+"""
+import datetime
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from core.response_cache import versions
+from .models import LandParcel
+
+CHUNK_SIZE = 5000
+NULL_CENTS = np.iinfo(np.int64).min
+LOCK_KEY = "parcel-snapshot:lock"
+LOCK_SECONDS = 300
+
+COLUMNS = {
+    "id": np.int64,
+    "area": np.float64,
+    "market_value": np.int64,
+    "tax_value": np.int64,
+    "zone": np.int32,
+    "status": np.int32,
+    "development": np.int32,
+    "mouza": np.int32,
+    "sector": np.int32,
+    "is_active": np.bool_,
+    "registration_date": "datetime64[D]",
+}
+# Coded column -> model field
+CODED = {
+    "zone": "land_use_zone",
+    "status": "status",
+    "development": "development_status",
+    "mouza": "mouza_name",
+    "sector": "sector_number",
+}
+MONEY = ("market_value", "tax_value")
+FIELDS = ("parcel_id", "area", "current_market_value", "annual_tax_value", "land_use_zone", "status",
+          "development_status", "mouza_name", "sector_number", "is_active", "registration_date", "last_updated")
+
+_lock = threading.Lock()
+_current = None
+
+
+class ParcelSnapshot:
+    def __init__(self, columns, codes, generation, watermark, built_at, serial=None):
+        self.columns = columns
+        self.codes = codes
+        self.generation = generation
+        self.watermark = watermark
+        self.built_at = built_at
+        self.serial = serial
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def where(self, **filters):
+        """Boolean mask of the parcels whose columns equal the given values (coded columns by value)"""
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in filters.items():
+            if name in CODED:
+                if value is None:
+                    value = -1
+                elif value in self.codes[name]:
+                    value = self.codes[name].index(value)
+                else:
+                    return np.zeros(len(self), dtype=bool)
+            mask &= self.columns[name] == value
+        return mask
+
+    def value_counts(self, name, mask=None):
+        """{value: count} of a coded column (None for NULL)"""
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        counts = np.bincount(column + 1, minlength=len(self.codes[name]) + 1)
+        values = [None] + self.codes[name]
+        return {values[index]: int(count) for index, count in enumerate(counts) if count}
+
+    def values(self, name, mask=None):
+        """Non-NULL values of a numeric column; money in units rather than cents"""
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        if name in MONEY:
+            return column[column != NULL_CENTS] / 100
+        return column
+
+    def total(self, name, mask=None):
+        """Sum of a numeric column, a Decimal for money columns"""
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        if name in MONEY:
+            return Decimal(int(column[column != NULL_CENTS].sum())).scaleb(-2)
+        return float(column.sum())
+
+    def histogram(self, name, bins=10, mask=None):
+        """(counts, bin edges) of a numeric column's non-NULL values"""
+        return np.histogram(self.values(name, mask), bins=bins)
+
+
+def _cents(value):
+    return NULL_CENTS if value is None else int(value.scaleb(2))
+
+
+def _read(queryset, codes):
+    """(columns, latest last_updated) of the queryset's rows, extending ``codes`` with new values"""
+    lookup = {name: {value: code for code, value in enumerate(values)} for name, values in codes.items()}
+
+    def encode(name, value):
+        if value is None:
+            return -1
+        code = lookup[name].get(value)
+        if code is None:
+            code = lookup[name][value] = len(codes[name])
+            codes[name].append(value)
+        return code
+
+    data = {name: [] for name in COLUMNS}
+    latest = None
+    for (pk, area, market_value, tax_value, zone, status, development, mouza, sector,
+         is_active, registration_date, last_updated) in queryset.values_list(*FIELDS).iterator(chunk_size=CHUNK_SIZE):
+        data["id"].append(pk)
+        data["area"].append(area)
+        data["market_value"].append(_cents(market_value))
+        data["tax_value"].append(_cents(tax_value))
+        data["zone"].append(encode("zone", zone))
+        data["status"].append(encode("status", status))
+        data["development"].append(encode("development", development))
+        data["mouza"].append(encode("mouza", mouza))
+        data["sector"].append(encode("sector", sector))
+        data["is_active"].append(is_active)
+        data["registration_date"].append(registration_date)
+        if latest is None or last_updated > latest:
+            latest = last_updated
+    columns = {name: np.array(values, dtype=COLUMNS[name]) for name, values in data.items()}
+    order = np.argsort(columns["id"], kind="stable")
+    return {name: column[order] for name, column in columns.items()}, latest
+
+
+def build():
+    """A full snapshot of the registry"""
+    generation = versions([("generation", "parcel")])[0]
+    codes = {name: [] for name in CODED}
+    columns, watermark = _read(LandParcel.objects.order_by(), codes)
+    return ParcelSnapshot(columns, codes, generation, watermark, time.time())
+
+
+def refresh(snapshot):
+    """A new snapshot with the rows written since ``snapshot`` was taken"""
+    if snapshot.watermark is None:
+        return build()
+    # Read before the rows, so writes that race with this refresh trigger another
+    generation = versions([("generation", "parcel")])[0]
+    codes = {name: list(values) for name, values in snapshot.codes.items()}
+    since = snapshot.watermark - datetime.timedelta(seconds=settings.PARCEL_SNAPSHOT_OVERLAP)
+    changed, latest = _read(LandParcel.objects.filter(last_updated__gte=since).order_by(), codes)
+
+    ids = snapshot.columns["id"]
+    position = np.searchsorted(ids, changed["id"])
+    existing = position < len(ids)
+    existing[existing] = ids[position[existing]] == changed["id"][existing]
+    added = ~existing
+    columns = {}
+    for name, column in snapshot.columns.items():
+        column = np.array(column)
+        column[position[existing]] = changed[name][existing]
+        columns[name] = np.concatenate([column, changed[name][added]])
+    if added.any():
+        order = np.argsort(columns["id"], kind="stable")
+        columns = {name: column[order] for name, column in columns.items()}
+
+    # Deleted rows are the only change the count and id sum can still reveal
+    table = LandParcel.objects.aggregate(count=Count("pk"), pk_sum=Sum("pk"))
+    if table["count"] != len(columns["id"]) or (table["pk_sum"] or 0) != int(columns["id"].sum()):
+        pks = np.fromiter(LandParcel.objects.values_list("pk", flat=True).iterator(chunk_size=CHUNK_SIZE), np.int64)
+        keep = np.isin(columns["id"], pks)
+        columns = {name: column[keep] for name, column in columns.items()}
+
+    watermark = snapshot.watermark if latest is None else max(snapshot.watermark, latest)
+    return ParcelSnapshot(columns, codes, generation, watermark, time.time())
+
+
+def _meta_path():
+    return os.path.join(settings.PARCEL_SNAPSHOT_DIR, "current.json")
+
+
+def _load_shared():
+    """The snapshot last written to PARCEL_SNAPSHOT_DIR, memory-mapped, or None"""
+    try:
+        with open(_meta_path()) as handle:
+            meta = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if _current is not None and _current.serial == meta["serial"]:
+        return _current
+    directory = os.path.join(settings.PARCEL_SNAPSHOT_DIR, meta["serial"])
+    try:
+        columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+    except OSError:
+        return None
+    watermark = meta["watermark"] and datetime.datetime.fromisoformat(meta["watermark"])
+    return ParcelSnapshot(columns, meta["codes"], meta["generation"], watermark, meta["built_at"], meta["serial"])
+
+
+def publish(snapshot):
+    """Write the snapshot to PARCEL_SNAPSHOT_DIR, make it current and drop all but the previous one"""
+    root = settings.PARCEL_SNAPSHOT_DIR
+    os.makedirs(root, exist_ok=True)
+    serial = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    staging = os.path.join(root, f".{serial}")
+    os.makedirs(staging)
+    for name, column in snapshot.columns.items():
+        np.save(os.path.join(staging, f"{name}.npy"), np.asarray(column))
+    os.rename(staging, os.path.join(root, serial))
+
+    previous = _load_shared()
+    meta = {
+        "serial": serial,
+        "codes": snapshot.codes,
+        "generation": snapshot.generation,
+        "watermark": snapshot.watermark and snapshot.watermark.isoformat(),
+        "built_at": snapshot.built_at,
+    }
+    with open(_meta_path() + ".tmp", "w") as handle:
+        json.dump(meta, handle)
+    os.replace(_meta_path() + ".tmp", _meta_path())
+
+    # Workers still reading an unlinked snapshot keep their mappings
+    keep = {serial, previous.serial if previous else None}
+    for entry in os.listdir(root):
+        if entry not in keep and entry != "current.json" and not entry.startswith("."):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+    snapshot.serial = serial
+    return snapshot
+
+
+def _fresh(snapshot):
+    return (snapshot is not None
+            and snapshot.generation == versions([("generation", "parcel")])[0]
+            and time.time() - snapshot.built_at < settings.PARCEL_SNAPSHOT_MAX_AGE)
+
+
+def current():
+    """The parcel snapshot, refreshed first if parcels were written since it was taken"""
+    global _current
+    shared = bool(settings.PARCEL_SNAPSHOT_DIR)
+    if shared:
+        _current = _load_shared() or _current
+    if _fresh(_current):
+        return _current
+
+    # One refresh at a time; the others keep the previous snapshot
+    if not _lock.acquire(blocking=_current is None):
+        return _current
+    try:
+        if shared:
+            _current = _load_shared() or _current
+            if _fresh(_current):
+                return _current
+            if not cache.add(LOCK_KEY, 1, timeout=LOCK_SECONDS):
+                if _current is None:
+                    _current = build()
+                return _current
+            try:
+                _current = publish(build() if _current is None else refresh(_current))
+            finally:
+                cache.delete(LOCK_KEY)
+        else:
+            _current = build() if _current is None else refresh(_current)
+        return _current
+    finally:
+        _lock.release()
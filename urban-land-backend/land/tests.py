@@ -1,3 +1,251 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, models
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User
+from owners.models import OwnerProfile
+from owners.serializers import OwnerProfileLeanSerializer, OwnerProfileSerializer
+from records.models import OwnershipRecord
+from records.serializers import OwnershipRecordLeanSerializer, OwnershipRecordSerializer
+from core.response_cache import bump_generation
+from . import facets, snapshot, views
+from .models import LandParcel
+from .serializers import LandParcelLeanSerializer, LandParcelSerializer
+
+
+def rendered(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+class LeanSerializerParityTests(TestCase):
+    """The lean list serializers render exactly what the DRF serializers do"""
+
+    @classmethod
+    def setUpTestData(cls):
+        owners = []
+        for number, (first, middle, picture) in enumerate([
+            ("Almaz", None, ""),
+            ("Tesfaye", "Girma", "owners/profile_pictures/tesfaye.png"),
+            ("Hana", "", ""),
+        ]):
+            user = User.objects.create_user(f"owner{number}", password="x", role="owner")
+            owners.append(OwnerProfile.objects.create(
+                user=user, national_id=f"ID{number}", first_name=first, middle_name=middle,
+                last_name="Bekele", gender="Female", permanent_address="Mouza 1",
+                profile_picture=picture, date_of_birth=datetime.date(1980, 1, number + 1),
+            ))
+
+        parcels = []
+        for number in range(4):
+            parcels.append(LandParcel.objects.create(
+                location=f"Block {number}",
+                area=125.5 * (number + 1),
+                land_use_type="Residential",
+                cadastral_number=f"CAD-{number}",
+                registration_number=f"REG-{number}" if number % 2 else None,
+                mouza_name="Mouza 1",
+                land_use_zone="Residential" if number < 3 else None,
+                registration_date=datetime.date(2020, number + 1, 15),
+                current_market_value=Decimal("150000.5") * (number + 1) if number != 2 else None,
+                annual_tax_value=Decimal("1200"),
+                development_status="Developed",
+                has_structures=bool(number % 2),
+                parcel_file="parcel_docs/map.pdf" if number == 1 else "",
+            ))
+
+        for parcel, owner, percentage, current, transfer in [
+            (parcels[0], owners[0], Decimal("100"), True, None),
+            (parcels[1], owners[1], Decimal("60.5"), True, None),
+            (parcels[1], owners[2], Decimal("39.5"), True, None),
+            (parcels[2], owners[0], Decimal("100"), False, datetime.date(2023, 6, 1)),
+            (parcels[2], owners[1], Decimal("100"), True, None),
+        ]:
+            OwnershipRecord.objects.create(
+                parcel=parcel, owner=owner, ownership_percentage=percentage,
+                acquisition_date=datetime.date(2021, 3, 4), acquisition_value=Decimal("99000.10"),
+                is_current_owner=current, transfer_date=transfer,
+                verification_status="Verified" if current else "Pending",
+                mortgage_amount=Decimal("5000") if percentage == 100 else None,
+            )
+
+    def setUp(self):
+        self.context = {"request": APIRequestFactory().get("/api/")}
+
+    def assertParity(self, serializer_class, lean_class, queryset):
+        expected = rendered(serializer_class(queryset, many=True, context=self.context).data)
+        lean = lean_class(context=self.context)
+        actual = rendered(lean.render(lean.values(queryset)))
+        self.assertEqual(actual, expected)
+        for expected_item, actual_item in zip(expected, actual):
+            self.assertEqual(list(actual_item), list(expected_item))
+
+    def test_parcels(self):
+        self.assertParity(LandParcelSerializer, LandParcelLeanSerializer, LandParcel.objects.order_by("pk"))
+
+    def test_owners(self):
+        self.assertParity(OwnerProfileSerializer, OwnerProfileLeanSerializer, OwnerProfile.objects.order_by("pk"))
+
+    def test_ownership_records(self):
+        self.assertParity(OwnershipRecordSerializer, OwnershipRecordLeanSerializer,
+                          OwnershipRecord.objects.order_by("pk"))
+
+    def test_list_endpoint_uses_lean_output(self):
+        admin = User.objects.create_user("admin", password="x", role="admin")
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get("/api/ownership-records/")
+        self.assertEqual(response.status_code, 200)
+        request = APIRequestFactory().get("/api/ownership-records/")
+        expected = rendered(OwnershipRecordSerializer(
+            OwnershipRecord.objects.order_by("-acquisition_date"), many=True, context={"request": request}
+        ).data)
+        self.assertEqual(sorted(response.json()["results"], key=lambda item: item["id"]),
+                         sorted(expected, key=lambda item: item["id"]))
+
+
+class FacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number, (status, zone) in enumerate((("active", "Residential"), ("active", "Commercial"),
+                                                 ("pending", "Residential"))):
+            LandParcel.objects.create(
+                location=f"Block {number}", area=100.0, land_use_type="Residential", land_use_zone=zone,
+                cadastral_number=f"CAD-{number}", registration_date="2024-01-15", status=status,
+            )
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def test_grouped_counts(self):
+        counts = facets.facet_counts(LandParcel.objects.all(), ("status", "land_use_zone"))
+        self.assertEqual(counts, {
+            "status": [{"value": "active", "count": 2}, {"value": "pending", "count": 1}],
+            "land_use_zone": [{"value": "Residential", "count": 2}, {"value": "Commercial", "count": 1}],
+        })
+
+    def test_postgresql_counts_in_one_grouping_sets_query(self):
+        queryset = LandParcel.objects.filter(status="active")
+        connection = connections[queryset.db]
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value.fetchall.return_value = [
+            # status, land_use_zone, GROUPING(status), GROUPING(land_use_zone), COUNT(*)
+            ("active", None, 0, 1, 2),
+            (None, "Residential", 1, 0, 1),
+            (None, "Commercial", 1, 0, 1),
+        ]
+        with mock.patch.object(connection, "vendor", "postgresql"), \
+                mock.patch.object(connection, "cursor", return_value=cursor):
+            counts = facets.facet_counts(queryset, ("status", "land_use_zone"))
+
+        sql, params = cursor.__enter__.return_value.execute.call_args.args
+        self.assertIn("GROUP BY GROUPING SETS", sql)
+        self.assertIn("active", params)
+        self.assertEqual(counts["status"], [{"value": "active", "count": 2}])
+        self.assertEqual(counts["land_use_zone"], [{"value": "Commercial", "count": 1},
+                                                   {"value": "Residential", "count": 1}])
+
+    def test_cache_key_follows_filters_and_generation(self):
+        cache.clear()
+        api = APIClient()
+        api.force_authenticate(self.officer)
+
+        def key(**params):
+            with mock.patch.object(views, "cache", mock.Mock(wraps=cache)) as spy:
+                response = api.get("/api/parcels/facets/", params)
+            self.assertEqual(response.status_code, 200)
+            return spy.get.call_args.args[0], response.data
+
+        active, data = key(status="active")
+        self.assertEqual(data["status"], [{"value": "active", "count": 2}])
+        self.assertEqual(key(status="active", ordering="area", page="2")[0], active)
+        self.assertNotEqual(key(status="pending")[0], active)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_generation("ownershiprecord")
+        self.assertNotEqual(key(status="active")[0], active)
+
+
+class SnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcels = [cls.new_parcel(number) for number in range(3)]
+
+    @staticmethod
+    def new_parcel(number):
+        return LandParcel.objects.create(
+            location=f"Block {number}", area=100.0, land_use_type="Residential", land_use_zone="Residential",
+            cadastral_number=f"CAD-{number}", registration_date="2024-01-15",
+        )
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(snapshot, "_current", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def quietly(self, parcel, **values):
+        """Write without signals, so neither last_updated nor the generation moves unless given"""
+        models.QuerySet(LandParcel).filter(pk=parcel.pk).update(**values)
+
+    def test_late_commit_inside_the_overlap_is_read(self):
+        built = snapshot.build()
+        parcel = self.parcels[0]
+        late = built.watermark - datetime.timedelta(seconds=settings.PARCEL_SNAPSHOT_OVERLAP - 10)
+        self.quietly(parcel, area=250.0, last_updated=late)
+
+        refreshed = snapshot.refresh(built)
+        self.assertEqual(refreshed["area"][refreshed["id"] == parcel.pk].tolist(), [250.0])
+        self.assertEqual(refreshed.watermark, built.watermark)
+
+    def test_delete_and_insert_with_the_same_count(self):
+        built = snapshot.build()
+        deleted = self.parcels[1]
+        models.QuerySet(LandParcel).filter(pk=deleted.pk).delete()
+        # An insert the refresh does not read back (older than the overlap),
+        # so only the id sum shows that a row went away
+        added = self.new_parcel(9)
+        self.quietly(added, last_updated=built.watermark - datetime.timedelta(days=1))
+
+        refreshed = snapshot.refresh(built)
+        self.assertEqual(refreshed["id"].tolist(), [self.parcels[0].pk, self.parcels[2].pk])
+
+    def test_workers_share_the_published_snapshot(self):
+        with override_settings(PARCEL_SNAPSHOT_DIR=tempfile.mkdtemp()):
+            first = snapshot.current()
+            self.assertEqual(len(first), 3)
+
+            snapshot._current = None  # another worker starting up
+            other = snapshot.current()
+            self.assertEqual(other.serial, first.serial)
+            self.assertIsInstance(other["id"], np.memmap)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.new_parcel(9)
+            second = snapshot.current()
+            self.assertNotEqual(second.serial, first.serial)
+            self.assertEqual(len(second), 4)
+
+            snapshot._current = other
+            self.assertEqual(snapshot.current().serial, second.serial)
+            serials = [entry for entry in os.listdir(settings.PARCEL_SNAPSHOT_DIR) if entry != "current.json"]
+            self.assertEqual(sorted(serials), sorted([first.serial, second.serial]))
+
+    def test_snapshot_older_than_max_age_is_refreshed(self):
+        first = snapshot.current()
+        self.quietly(self.parcels[0], area=250.0, last_updated=timezone.now())
+        self.assertIs(snapshot.current(), first)
+
+        first.built_at -= settings.PARCEL_SNAPSHOT_MAX_AGE + 1
+        refreshed = snapshot.current()
+        self.assertIsNot(refreshed, first)
+        self.assertEqual(refreshed["area"][refreshed["id"] == self.parcels[0].pk].tolist(), [250.0])
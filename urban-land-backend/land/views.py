@@ -1,18 +1,35 @@
 # land/views.py
-from rest_framework import viewsets, filters
+import hashlib
+
+from rest_framework import viewsets, filters, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
+from django.http import FileResponse, HttpResponseNotModified
+from . import snapshot
+from .facets import facet_counts
 from .models import LandParcel
-from .serializers import LandParcelSerializer
+from .serializers import LandParcelLeanSerializer, LandParcelSerializer
+from records import certificates
 from records.models import OwnershipRecord
 from owners.models import OwnerProfile
+from audit.views import VersionHistoryMixin
+from core.lean import LeanListMixin
+from core.response_cache import CachedListMixin, CachedRetrieveMixin, normalized_params, versions
+from monitoring import metrics
 
 
-class LandParcelViewSet(viewsets.ModelViewSet):
+class LandParcelViewSet(CachedListMixin, LeanListMixin, CachedRetrieveMixin, VersionHistoryMixin,
+                        viewsets.ModelViewSet):
     """ViewSet for LandParcel with filtering and ordering"""
+    cache_label = 'parcel'
+    lean_serializer_class = LandParcelLeanSerializer
+    # Rows show the current owner's name
+    list_cache_generations = ('parcel', 'owner', 'ownershiprecord')
     queryset = LandParcel.objects.all()
     serializer_class = LandParcelSerializer
     permission_classes = [IsAuthenticated]
@@ -24,7 +41,6 @@ class LandParcelViewSet(viewsets.ModelViewSet):
     filterset_fields = {
         'status': ['exact'],
         'land_use_zone': ['exact'],
-        'land_use_zone': ['exact'],
         'development_status': ['exact'],
         'is_active': ['exact'],
         'registration_date': ['gte', 'lte', 'exact'],
@@ -99,39 +115,45 @@ class LandParcelViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get statistics for land parcels"""
-        total = LandParcel.objects.count()
-        active = LandParcel.objects.filter(status='active').count()
-        inactive = LandParcel.objects.filter(status='inactive').count()
-        pending = LandParcel.objects.filter(status='pending').count()
-        
-        total_value = LandParcel.objects.aggregate(
-            total_value=models.Sum('current_market_value')
-        )['total_value'] or 0
-        
-        total_area = LandParcel.objects.aggregate(
-            total_area=models.Sum('area')
-        )['total_area'] or 0
+        """
+        Get statistics for land parcels, from the parcel snapshot: up to
+        PARCEL_SNAPSHOT_MAX_AGE seconds behind writes made by other workers
+        """
+        parcels = snapshot.current()
+        statuses = parcels.value_counts('status')
         
         return Response({
-            'total': total,
-            'active': active,
-            'inactive': inactive,
-            'pending': pending,
-            'total_value': float(total_value),
-            'total_area': float(total_area),
+            'total': len(parcels),
+            'active': statuses.get('active', 0),
+            'inactive': statuses.get('inactive', 0),
+            'pending': statuses.get('pending', 0),
+            'total_value': float(parcels.total('market_value')),
+            'total_area': parcels.total('area'),
         })
     
     @action(detail=False, methods=['get'])
     def types(self, request):
-        """Get unique land use types"""
-        types = LandParcel.objects.values_list('land_use_zone', flat=True).distinct()
-        zones = LandParcel.objects.values_list('land_use_zone', flat=True).distinct()
+        """Get unique land use zones (from the parcel snapshot, see stats)"""
+        zones = snapshot.current().value_counts('zone')
         
         return Response({
-            'land_use_zones': list(types),
-            'land_use_zones': list(zones),
+            'land_use_zones': sorted(zones, key=lambda zone: (zone is None, zone or '')),
         })
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Count per value of status, land_use_zone, development_status and is_active under the current filters"""
+        generation = ':'.join(versions([('generation', name) for name in self.list_cache_generations]))
+        params = [param for param in normalized_params(request) if param[0] not in ('page', 'ordering')]
+        digest = hashlib.sha1(repr(params).encode()).hexdigest()
+        key = f'facets:parcel:{digest}:{generation}'
+
+        data = cache.get(key)
+        metrics.record_cache('facets:parcel', data is not None)
+        if data is None:
+            data = facet_counts(self.filter_queryset(self.get_queryset()))
+            cache.set(key, data, timeout=settings.LIST_CACHE_TTL)
+        return Response(data)
     
     @action(detail=True, methods=['get'])
     def owners(self, request, pk=None):
@@ -150,4 +172,26 @@ class LandParcelViewSet(viewsets.ModelViewSet):
             owner_data['acquisition_date'] = record.acquisition_date
             owners_data.append(owner_data)
         
-        return Response(owners_data)
\ No newline at end of file
+        return Response(owners_data)
+
+    @action(detail=True, methods=['get'])
+    def certificate(self, request, pk=None):
+        """Ownership and encumbrance certificate as ?output=pdf (default) or png"""
+        parcel = self.get_object()
+        output = request.query_params.get('output', 'pdf')
+        if output not in certificates.OUTPUTS:
+            return Response({'error': f"output must be one of: {', '.join(certificates.OUTPUTS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        data = certificates.certificate_data(parcel.pk)
+        etag = f'"{data["version"]}"'
+        if request.headers.get('If-None-Match') == etag:
+            return HttpResponseNotModified(headers={'ETag': etag})
+        try:
+            file, _ = certificates.certificate(parcel.pk, output, data=data)
+        except TimeoutError:
+            return Response({'error': 'Certificate is still being rendered, retry shortly'},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '5'})
+        response = FileResponse(file, content_type=certificates.OUTPUTS[output],
+                                filename=f'certificate-{parcel.pk}.{output}')
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,244 @@
+# monitoring/metrics.py
+"""
+Request, database and cache metrics in Prometheus text format.
+
+Every worker process counts into its own in-memory registry and writes a
+snapshot to METRICS_DIR/metrics-<pid>-<id>.json at most every
+METRICS_FLUSH_SECONDS (and at exit). The /metrics endpoint sums all snapshot
+files, so the numbers cover every gunicorn worker no matter which one
+answers the scrape. Snapshots of exited workers are folded into
+metrics-retired.json and removed, so counters never go backwards and the
+directory does not grow with every worker restart. Pruning and reading
+share a file lock so a scrape never counts a folded snapshot twice.
+"""
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "http_requests_total": ("counter", "Requests handled, by view, method and status."),
+    "http_request_errors_total": ("counter", "Requests that failed with a 5xx status, by view."),
+    "http_request_duration_seconds": ("histogram", "Request latency, by view."),
+    "db_queries_total": ("counter", "SQL statements executed, by view."),
+    "db_query_duration_seconds_total": ("counter", "Time spent in SQL, by view."),
+    "cache_requests_total": ("counter", "Cache lookups, by cache and result (hit or miss)."),
+    "cache_hit_ratio": ("gauge", "Share of cache lookups that were hits, by cache."),
+}
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] += amount
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                # One count per bucket, then sum and count
+                histogram = self.histograms[key] = [0] * len(DURATION_BUCKETS) + [0.0, 0]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    histogram[index] += 1
+                    break
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": [[name, dict(labels), value] for (name, labels), value in self.counters.items()],
+                "histograms": [[name, dict(labels), list(values)] for (name, labels), values in self.histograms.items()],
+            }
+
+
+registry = Registry()
+_process_file = None
+_last_flush = 0.0
+
+
+def record_request(view, method, status, duration, query_count, db_time):
+    registry.inc("http_requests_total", {"view": view, "method": method, "status": str(status)})
+    if status >= 500:
+        registry.inc("http_request_errors_total", {"view": view})
+    registry.observe("http_request_duration_seconds", {"view": view}, duration)
+    registry.inc("db_queries_total", {"view": view}, query_count)
+    registry.inc("db_query_duration_seconds_total", {"view": view}, db_time)
+    maybe_flush()
+
+
+def record_cache(cache, hit):
+    """Count one lookup in a named application cache"""
+    registry.inc("cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"})
+
+
+def _snapshot_path():
+    global _process_file
+    if _process_file is None:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        _process_file = os.path.join(
+            settings.METRICS_DIR, f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        )
+    return _process_file
+
+
+def flush():
+    path = _snapshot_path()
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as handle:
+        json.dump(registry.snapshot(), handle)
+    os.replace(temporary, path)
+
+
+def maybe_flush():
+    global _last_flush
+    now = time.monotonic()
+    if now - _last_flush >= settings.METRICS_FLUSH_SECONDS:
+        _last_flush = now
+        flush()
+
+
+atexit.register(lambda: registry.counters and flush())
+
+
+RETIRED_FILE = "metrics-retired.json"
+LOCK_FILE = "metrics.lock"
+
+
+def _load(path):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(snapshots):
+    """(counters, histograms) summed over the snapshots"""
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for metric, labels, value in snapshot["counters"]:
+            counters[(metric, tuple(sorted(labels.items())))] += value
+        for metric, labels, values in snapshot["histograms"]:
+            key = (metric, tuple(sorted(labels.items())))
+            if key in histograms:
+                histograms[key] = [a + b for a, b in zip(histograms[key], values)]
+            else:
+                histograms[key] = list(values)
+    return counters, histograms
+
+
+def _worker_alive(name):
+    """False if the worker that wrote snapshot ``name`` has exited"""
+    try:
+        os.kill(int(name.split("-")[1]), 0)
+    except (IndexError, ValueError):
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _prune(directory):
+    """Fold the snapshots of exited workers into the retired snapshot and remove them"""
+    dead = [name for name in os.listdir(directory)
+            if name.startswith("metrics-") and name.endswith(".json") and name != RETIRED_FILE
+            and not _worker_alive(name)]
+    if not dead:
+        return
+    retired_path = os.path.join(directory, RETIRED_FILE)
+    snapshots = [_load(retired_path) or {"counters": [], "histograms": []}]
+    snapshots += filter(None, (_load(os.path.join(directory, name)) for name in dead))
+    counters, histograms = _merge(snapshots)
+    retired = {
+        "counters": [[name, dict(labels), value] for (name, labels), value in counters.items()],
+        "histograms": [[name, dict(labels), values] for (name, labels), values in histograms.items()],
+    }
+    with open(f"{retired_path}.tmp", "w") as handle:
+        json.dump(retired, handle)
+    os.replace(f"{retired_path}.tmp", retired_path)
+    for name in dead:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def collect():
+    """Sum the snapshots of every worker, including this one's latest numbers"""
+    flush()
+    directory = settings.METRICS_DIR
+    with open(os.path.join(directory, LOCK_FILE), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _prune(directory)
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        snapshots = [_load(os.path.join(directory, name))
+                     for name in os.listdir(directory) if name.endswith(".json")]
+    return _merge(filter(None, snapshots))
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render():
+    """All metrics in Prometheus text exposition format"""
+    counters, histograms = collect()
+
+    # Derived gauge
+    lookups = defaultdict(lambda: [0.0, 0.0])
+    for (metric, labels), value in counters.items():
+        if metric == "cache_requests_total":
+            label_map = dict(labels)
+            lookups[label_map["cache"]][label_map["result"] == "hit"] += value
+    gauges = {
+        ("cache_hit_ratio", (("cache", cache),)): hits / (hits + misses)
+        for cache, (misses, hits) in lookups.items() if hits + misses
+    }
+
+    series = defaultdict(list)
+    for (metric, labels), value in sorted(list(counters.items()) + list(gauges.items())):
+        series[metric].append(f"{metric}{_labels(labels)} {_number(value)}")
+    for (metric, labels), values in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, values):
+            cumulative += count
+            series[metric].append(f"{metric}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+        series[metric].append(f"{metric}_bucket{_labels(labels + (('le', '+Inf'),))} {values[-1]}")
+        series[metric].append(f"{metric}_sum{_labels(labels)} {_number(values[-2])}")
+        series[metric].append(f"{metric}_count{_labels(labels)} {values[-1]}")
+
+    lines = []
+    for metric in sorted(series):
+        kind, description = HELP.get(metric, ("untyped", metric))
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(series[metric])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,258 @@
+# monitoring/middleware.py
+import logging
+import random
+import time
+from types import SimpleNamespace
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.permissions import IsAdmin
+from . import metrics, profiler, timing
+
+logger = logging.getLogger("monitoring.slow_requests")
+
+
+class MetricsMiddleware:
+    """
+    Count every request into monitoring.metrics: status, latency and SQL
+    time per view, labelled with the URL name (``parcel-list``,
+    ``ownershiprecord-parcel-history``, ...).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        db = QueryCounter()
+        started = time.perf_counter()
+        status = 500
+        try:
+            with timing.ExecuteWrappers(db):
+                response = self.get_response(request)
+                render(response)
+            status = response.status_code
+        finally:
+            metrics.record_request(
+                view_label(request), request.method, status,
+                time.perf_counter() - started, db.queries, db.time
+            )
+        return response
+
+    async def __acall__(self, request):
+        db = QueryCounter()
+        started = time.perf_counter()
+        status = 500
+        try:
+            with timing.ExecuteWrappers(db):
+                response = await self.get_response(request)
+                render(response)
+            status = response.status_code
+        finally:
+            metrics.record_request(
+                view_label(request), request.method, status,
+                time.perf_counter() - started, db.queries, db.time
+            )
+        return response
+
+
+class QueryCounter:
+    """execute_wrapper counting SQL statements and their time"""
+
+    def __init__(self):
+        self.queries = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.time += time.perf_counter() - started
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.route or "unnamed"
+
+
+class RequestTimingMiddleware:
+    """
+    Opt-in per-request instrumentation.
+
+    A sampled request (REQUEST_TIMING_SAMPLE_RATE, or the X-Request-Timing
+    header when DEBUG is on) records SQL query count and time, repeated
+    statements (N+1 patterns), serializer time and total time. They are
+    returned in a Server-Timing header, and slow requests or repeated
+    statements are logged with the SQL responsible. Unsampled requests pass
+    straight through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.slow_seconds = settings.REQUEST_TIMING_SLOW_MS / 1000
+        self.duplicate_threshold = settings.REQUEST_TIMING_DUPLICATE_THRESHOLD
+        if self.sample_rate > 0 or settings.DEBUG:
+            timing.install_serializer_timer()
+
+    def sampled(self, request):
+        if settings.DEBUG and request.headers.get("X-Request-Timing"):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled(request):
+            return self.get_response(request)
+
+        timer = timing.RequestTimer()
+        token = timing.start(timer)
+        try:
+            with timing.ExecuteWrappers(timer):
+                response = self.get_response(request)
+                render(response)
+        finally:
+            timing.stop(token)
+        return self.report(request, response, timer)
+
+    async def __acall__(self, request):
+        if not self.sampled(request):
+            return await self.get_response(request)
+
+        timer = timing.RequestTimer()
+        token = timing.start(timer)
+        try:
+            with timing.ExecuteWrappers(timer):
+                response = await self.get_response(request)
+                render(response)
+        finally:
+            timing.stop(token)
+        return self.report(request, response, timer)
+
+    def report(self, request, response, timer):
+        total = timer.total_time
+        duplicates = timer.duplicates(self.duplicate_threshold)
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={timer.db_time * 1000:.1f};desc="{timer.query_count} queries"',
+            f'dup;desc="{sum(count for _, count in duplicates)} repeated"',
+            f"serializer;dur={timer.serializer_time * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+        if total >= self.slow_seconds or duplicates:
+            self.log(request, response, timer, total, duplicates)
+        return response
+
+    def log(self, request, response, timer, total, duplicates):
+        lines = [
+            f"{request.method} {request.get_full_path()} -> {response.status_code} "
+            f"in {total * 1000:.0f}ms ({timer.query_count} queries, {timer.db_time * 1000:.0f}ms db, "
+            f"{timer.serializer_time * 1000:.0f}ms serializer)"
+        ]
+        for sql, count in duplicates:
+            lines.append(f"  repeated {count}x (possible N+1): {sql}")
+        for elapsed, sql in timer.slowest_statements():
+            lines.append(f"  {elapsed * 1000:.1f}ms: {sql}")
+        logger.warning("\n".join(lines))
+
+
+def render(response):
+    # DRF responses render lazily; do it while still measuring
+    if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+        response.render()
+
+
+class ProfilingMiddleware:
+    """
+    Profile a single request on demand, for admins only.
+
+    Send ``X-Profile: cprofile`` (cProfile plus stack samples) or
+    ``X-Profile: sample`` (stack samples only, lower overhead), or add
+    ``?_profile=cprofile`` to the URL, together with an admin's bearer token.
+    The stored profile id comes back in ``X-Profile-Id``; profiles are listed
+    and downloaded at /api/profiles/. The flag is ignored for anyone else.
+    Under ASGI the profile covers the event loop thread, so other requests
+    running concurrently on it show up as well.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def requested_mode(request):
+        mode = request.headers.get("X-Profile") or request.GET.get("_profile")
+        if not mode:
+            return None
+        return mode if mode in profiler.MODES else "cprofile"
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = self.requested_mode(request)
+        user = mode and self.admin_user(request)
+        if not user:
+            return self.get_response(request)
+
+        profile = profiler.RequestProfile(mode)
+        profile.start()
+        try:
+            response = self.get_response(request)
+            render(response)
+        finally:
+            profile.stop()
+        response["X-Profile-Id"] = profiler.save(profile, request, response, user)
+        return response
+
+    async def __acall__(self, request):
+        mode = self.requested_mode(request)
+        user = mode and await sync_to_async(self.admin_user)(request)
+        if not user:
+            return await self.get_response(request)
+
+        profile = profiler.RequestProfile(mode)
+        profile.start()
+        try:
+            response = await self.get_response(request)
+            render(response)
+        finally:
+            profile.stop()
+        response["X-Profile-Id"] = await sync_to_async(profiler.save)(profile, request, response, user)
+        return response
+
+    @staticmethod
+    def admin_user(request):
+        return admin_user(request)
+
+
+def admin_user(request):
+    """The admin a plain Django request's bearer token belongs to, or None"""
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if result is None:
+        return None
+    user = result[0]
+    return user if IsAdmin().has_permission(SimpleNamespace(user=user), None) else None
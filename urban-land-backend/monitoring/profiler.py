@@ -0,0 +1,144 @@
+# monitoring/profiler.py
+"""
+Single-request profiling for admins.
+
+A profile is stored as <id>.json (metadata), <id>.prof (cProfile stats,
+loadable with pstats or snakeviz) and <id>.collapsed (sampled stacks in the
+collapsed format flamegraph.pl and speedscope read). Only the newest
+PROFILE_MAX_FILES profiles are kept.
+"""
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+MODES = ("cprofile", "sample")
+
+
+class StackSampler:
+    """Sample one thread's call stack at a fixed interval from a background thread"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                module = frame.f_globals.get("__name__", "?")
+                stack.append(f"{module}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfile:
+    """Profile the code run between start() and stop() on the current thread"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == "cprofile" else None
+        self.sampler = StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.sampler.start()
+        if self.profiler:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+        self.sampler.stop()
+        self.duration = time.perf_counter() - self.started
+
+
+def profile_dir():
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    return settings.PROFILE_DIR
+
+
+def save(profile, request, response, user):
+    directory = profile_dir()
+    # Microseconds keep ids in creation order, so prune() never drops the newest
+    profile_id = f"{timezone.now():%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(directory, profile_id)
+
+    if profile.profiler:
+        profile.profiler.dump_stats(base + ".prof")
+    with open(base + ".collapsed", "w") as handle:
+        handle.write(profile.sampler.collapsed())
+    metadata = {
+        "id": profile_id,
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "mode": profile.mode,
+        "duration_ms": round(profile.duration * 1000, 1),
+        "user": user.username,
+        "created_at": timezone.now().isoformat(),
+        "formats": ["pstats", "collapsed"] if profile.profiler else ["collapsed"],
+    }
+    with open(base + ".json", "w") as handle:
+        json.dump(metadata, handle)
+
+    prune(directory)
+    return profile_id
+
+
+def prune(directory):
+    """Keep only the newest PROFILE_MAX_FILES profiles"""
+    ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json"))
+    for old in ids[:-settings.PROFILE_MAX_FILES]:
+        for extension in (".json", ".prof", ".collapsed"):
+            try:
+                os.remove(os.path.join(directory, old + extension))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles():
+    directory = profile_dir()
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as handle:
+                profiles.append(json.load(handle))
+    return profiles
+
+
+def get_profile(profile_id):
+    path = os.path.join(profile_dir(), f"{os.path.basename(profile_id)}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def profile_file(profile_id, kind):
+    extension = {"pstats": ".prof", "collapsed": ".collapsed"}[kind]
+    path = os.path.join(profile_dir(), os.path.basename(profile_id) + extension)
+    return path if os.path.exists(path) else None
@@ -0,0 +1,11 @@
+# monitoring/signals.py
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import timing
+
+
+@receiver(connection_created)
+def install_query_dispatch(sender, connection, **kwargs):
+    """Chain the request's execute_wrappers (timing.ExecuteWrappers) on every new connection"""
+    timing.install_dispatch(connection)
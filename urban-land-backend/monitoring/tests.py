@@ -0,0 +1,229 @@
+import json
+import os
+import re
+import tempfile
+from unittest import mock
+
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from land.models import LandParcel
+from land.serializers import LandParcelLeanSerializer
+from . import metrics, profiler, timing
+from .middleware import QueryCounter
+
+
+@override_settings(DEBUG=True)
+class AsyncMiddlewareTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("clerk", password="x", role="admin")
+        LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+
+    async def get(self, handler, path, headers=()):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"testserver"), *headers], "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+        }
+        communicator = ApplicationCommunicator(handler, scope)
+        await communicator.send_input({"type": "http.request", "body": b""})
+        start = await communicator.receive_output(timeout=5)
+        body = await communicator.receive_output(timeout=5)
+        await communicator.wait()
+        return start["status"], {name.lower(): value for name, value in start["headers"]}, body["body"]
+
+    def test_middleware_is_not_adapted_under_asgi(self):
+        # Django logs "Asynchronous handler adapted for middleware ..." for each one it wraps
+        with self.assertNoLogs("django.request", level="DEBUG"):
+            ASGIHandler()
+
+    async def test_async_view_is_counted_and_timed(self):
+        handler = ASGIHandler()
+        token = str(AccessToken.for_user(self.user))
+        queries = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+        with mock.patch.object(metrics, "record_request") as record:
+            status, headers, body = await self.get(handler, "/api/async/parcels/", [
+                (b"authorization", f"Bearer {token}".encode()),
+                (b"x-request-timing", b"1"),
+            ])
+
+        self.assertEqual(status, 200, body)
+        self.assertIn(b"CAD-1", body)
+        view, method, recorded_status, _, query_count, _ = record.call_args.args
+        self.assertEqual((view, method, recorded_status), ("async_parcel_list", "GET", 200))
+        self.assertGreater(query_count, 0)
+        timed = int(queries.search(headers[b"server-timing"].decode()).group(1))
+        self.assertEqual(timed, query_count)
+
+
+class MetricsPruneTests(TransactionTestCase):
+    def test_exited_workers_are_folded_into_the_retired_snapshot(self):
+        directory = tempfile.mkdtemp()
+        snapshot = {"counters": [["http_requests_total", {"view": "x"}, 2]], "histograms": []}
+
+        def write(name):
+            with open(os.path.join(directory, name), "w") as handle:
+                json.dump(snapshot, handle)
+
+        with override_settings(METRICS_DIR=directory), \
+                mock.patch.object(metrics, "_process_file", os.path.join(directory, "metrics-live.json")), \
+                mock.patch.object(metrics, "registry", metrics.Registry()):
+            write(f"metrics-{os.getpid()}-alive.json")
+            write("metrics-999999999-gone.json")
+            counters, _ = metrics.collect()
+            self.assertEqual(counters[("http_requests_total", (("view", "x"),))], 4)
+            self.assertNotIn("metrics-999999999-gone.json", os.listdir(directory))
+            self.assertIn(metrics.RETIRED_FILE, os.listdir(directory))
+
+            write("metrics-999999998-gone.json")
+            counters, _ = metrics.collect()
+            self.assertEqual(counters[("http_requests_total", (("view", "x"),))], 6)
+
+
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("clerk", password="x", role="admin")
+        for number in range(3):
+            LandParcel.objects.create(
+                location=f"Block {number}", area=100.0, land_use_type="Residential",
+                cadastral_number=f"CAD-{number}", registration_date="2024-01-15",
+            )
+
+    def get(self, path="/api/parcels/", **headers):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get(path, **headers)
+
+    def server_timing(self, response):
+        return dict(re.findall(r"(\w+);(?:dur=([\d.]+))?", response.get("Server-Timing", "")))
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0, DEBUG=False)
+    def test_unsampled_requests_are_not_timed(self):
+        response = self.get(HTTP_X_REQUEST_TIMING="1")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0, DEBUG=True)
+    def test_header_samples_in_debug(self):
+        response = self.get(HTTP_X_REQUEST_TIMING="1")
+        self.assertEqual(set(self.server_timing(response)), {"db", "dup", "serializer", "total"})
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="\d+ queries"')
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1, REQUEST_TIMING_SLOW_MS=0, REQUEST_TIMING_DUPLICATE_THRESHOLD=2)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        # Not a cached endpoint, so it runs SQL
+        with self.assertLogs("monitoring.slow_requests", level="WARNING") as logs:
+            response = self.get("/api/documents/")
+        self.assertIn("Server-Timing", response)
+        message = logs.output[0]
+        self.assertRegex(message, r"GET /api/documents/ -> 200 in \d+ms \(\d+ queries, \d+ms db, \d+ms serializer\)")
+        self.assertIn("SELECT", message)
+
+    def test_lean_serializers_are_timed(self):
+        timing.install_serializer_timer()
+        timer = timing.RequestTimer()
+        token = timing.start(timer)
+        try:
+            lean = LandParcelLeanSerializer()
+            lean.render(lean.values(LandParcel.objects.order_by("pk")))
+        finally:
+            timing.stop(token)
+        self.assertGreater(timer.serializer_time, 0)
+
+
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="admin")
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        override = override_settings(PROFILE_DIR=directory, PROFILE_MAX_FILES=2)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def get(self, path, user, **headers):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client.get(path, **headers)
+
+    def test_only_admin_tokens_are_profiled(self):
+        response = self.get("/api/documents/", self.officer, HTTP_X_PROFILE="sample")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(profiler.list_profiles(), [])
+
+        response = self.get("/api/documents/?_profile=cprofile", self.admin)
+        profile_id = response["X-Profile-Id"]
+        stored = profiler.get_profile(profile_id)
+        self.assertEqual((stored["path"], stored["mode"], stored["user"]),
+                         ("/api/documents/?_profile=cprofile", "cprofile", "admin"))
+        self.assertIsNotNone(profiler.profile_file(profile_id, "pstats"))
+
+    def test_only_the_newest_profiles_are_kept(self):
+        ids = [self.get("/api/documents/", self.admin, HTTP_X_PROFILE="sample")["X-Profile-Id"]
+               for _ in range(3)]
+        self.assertEqual([profile["id"] for profile in profiler.list_profiles()], ids[:0:-1])
+        self.assertEqual(len(os.listdir(settings.PROFILE_DIR)), 4)  # .json and .collapsed each
+
+    def test_profiles_are_listed_and_retrieved_by_admins(self):
+        profile_id = self.get("/api/documents/", self.admin, HTTP_X_PROFILE="sample")["X-Profile-Id"]
+
+        response = self.get("/api/profiles/", self.admin)
+        self.assertEqual([profile["id"] for profile in response.data], [profile_id])
+        response = self.get(f"/api/profiles/{profile_id}/", self.admin)
+        self.assertEqual((response.data["formats"], response.data["status"]), (["collapsed"], 200))
+        self.assertEqual(self.get("/api/profiles/missing/", self.admin).status_code, 404)
+        self.assertEqual(self.get("/api/profiles/", self.officer).status_code, 403)
+
+
+class MetricsEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="admin")
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def scrape(self, authorization=None):
+        headers = {"HTTP_AUTHORIZATION": authorization} if authorization else {}
+        return self.client.get("/metrics", **headers)
+
+    @override_settings(METRICS_TOKEN="", METRICS_PUBLIC=False)
+    def test_scrapes_need_an_admin_without_a_token(self):
+        self.assertEqual(self.scrape().status_code, 401)
+        self.assertEqual(self.scrape(f"Bearer {AccessToken.for_user(self.officer)}").status_code, 401)
+        self.assertEqual(self.scrape(f"Bearer {AccessToken.for_user(self.admin)}").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="scrape-secret", METRICS_PUBLIC=False)
+    def test_scrape_token(self):
+        self.assertEqual(self.scrape("Bearer wrong").status_code, 401)
+        self.assertEqual(self.scrape("Bearer scrape-secret").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="", METRICS_PUBLIC=True)
+    def test_public_scrapes(self):
+        self.assertEqual(self.scrape().status_code, 200)
+
+
+class QueryDispatchTests(TestCase):
+    def test_wrappers_are_per_context_not_per_connection(self):
+        connection.ensure_connection()
+        installed = list(connection.execute_wrappers)
+        self.assertEqual(installed.count(timing.dispatch), 1)
+
+        counter = QueryCounter()
+        with timing.ExecuteWrappers(counter):
+            self.assertEqual(connection.execute_wrappers, installed)
+            User.objects.count()
+            User.objects.exists()
+        User.objects.count()
+        self.assertEqual(counter.queries, 2)
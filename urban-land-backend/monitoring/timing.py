@@ -0,0 +1,131 @@
+# monitoring/timing.py
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import partial, wraps
+
+from rest_framework.serializers import BaseSerializer
+
+from core.lean import LeanSerializer
+
+# Timer of the request being handled in this context, if it is sampled;
+# a context variable so concurrent async requests keep their own
+_timer = ContextVar("request_timer", default=None)
+# execute_wrappers active in this context (see ExecuteWrappers)
+_wrappers = ContextVar("execute_wrappers", default=())
+
+
+class ExecuteWrappers:
+    """
+    Run ``wrapper`` as an execute_wrapper for every statement issued in this
+    context, on any database alias, so reads routed to a replica are seen too.
+    Only sets a context variable: the wrappers themselves are chained by
+    dispatch(), which each connection gets once when it is opened.
+    """
+
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+        self.token = None
+
+    def __enter__(self):
+        self.token = _wrappers.set(_wrappers.get() + (self.wrapper,))
+        return self
+
+    def __exit__(self, *exc_info):
+        _wrappers.reset(self.token)
+
+
+def dispatch(execute, sql, params, many, context):
+    """execute_wrapper running the wrappers active in the current context, outermost first"""
+    for wrapper in reversed(_wrappers.get()):
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install_dispatch(connection):
+    """Add dispatch() to a connection; execute_wrappers outlives reconnects, so only once"""
+    if dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(dispatch)
+
+
+class RequestTimer:
+    """SQL and serializer timings for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.slowest = []
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.query_count += 1
+            self.db_time += elapsed
+            # Parameters are passed separately, so an N+1 loop shows up as the
+            # same statement text repeated
+            self.statements[sql] += 1
+            self.slowest.append((elapsed, sql))
+            if len(self.slowest) > 20:
+                self.slowest.sort(reverse=True)
+                del self.slowest[10:]
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+    def slowest_statements(self, limit=5):
+        return sorted(self.slowest, reverse=True)[:limit]
+
+
+def current_timer():
+    return _timer.get()
+
+
+def start(timer):
+    return _timer.set(timer)
+
+
+def stop(token):
+    _timer.reset(token)
+
+
+_installed = False
+
+
+def _timed(function):
+    """Add ``function``'s time to the current timer's serializer time, outermost call only"""
+    @wraps(function)
+    def timed(*args, **kwargs):
+        timer = current_timer()
+        if timer is None or timer._serializer_depth:
+            return function(*args, **kwargs)
+        timer._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer._serializer_depth -= 1
+            timer.serializer_time += time.perf_counter() - started
+    return timed
+
+
+def install_serializer_timer():
+    """Time top-level serializer.data and lean serializer render() calls for sampled requests"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
+    # Lean list serializers (core.lean) never touch .data
+    LeanSerializer.render = _timed(LeanSerializer.render)
@@ -0,0 +1,53 @@
+# monitoring/views.py
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from accounts.permissions import IsAdmin
+from . import metrics, profiler
+from .middleware import admin_user
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """Request profiles captured by ProfilingMiddleware"""
+    permission_classes = [IsAdmin]
+    lookup_value_regex = r"[\w-]+"
+
+    def list(self, request):
+        return Response(profiler.list_profiles())
+
+    def retrieve(self, request, pk=None):
+        profile = profiler.get_profile(pk)
+        if profile is None:
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(profile)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Download as ?kind=pstats (cProfile stats) or ?kind=collapsed (flamegraph stacks)"""
+        kind = request.query_params.get("kind", "pstats")
+        if kind not in ("pstats", "collapsed"):
+            return Response(
+                {"error": "kind must be pstats or collapsed"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        path = profiler.profile_file(pk, kind)
+        if path is None:
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=path.rsplit("/", 1)[-1])
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, summed over all worker processes"""
+    if not (settings.METRICS_PUBLIC or scrape_allowed(request)):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def scrape_allowed(request):
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get("Authorization") == f"Bearer {token}":
+        return True
+    return admin_user(request) is not None
@@ -0,0 +1,24 @@
+# notifications/auth.py
+from urllib.parse import parse_qs
+
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+
+from config.async_api import auser_for_token
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate WebSocket connections with the same JWT access token as the API.
+
+    Browsers cannot set headers on WebSocket handshakes, so the token is read
+    from the ``token`` query parameter: ws/changes/?token=<access token>
+    """
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        query = parse_qs(scope.get("query_string", b"").decode())
+        token = query.get("token", [None])[0]
+        user = await auser_for_token(token) if token else None
+        scope["user"] = user or AnonymousUser()
+        return await super().__call__(scope, receive, send)
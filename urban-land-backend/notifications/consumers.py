@@ -0,0 +1,65 @@
+# notifications/consumers.py
+import asyncio
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from .events import STAFF_ROLES, count_subscriber, merge_actions, owner_group, role_group
+
+
+class ChangeFeedConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Push change events to the dashboard (admins and officers) and the owner portal.
+
+    Staff join their role group and owners join their own group. Events that
+    arrive within NOTIFICATIONS_COALESCE_SECONDS of each other are merged and
+    sent as one frame: {"type": "changes", "events": [...]}.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        if user.role in STAFF_ROLES:
+            self.joined_groups = [role_group(user.role)]
+        else:
+            self.joined_groups = [owner_group(user.id)]
+        for group in self.joined_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await count_subscriber(1)
+
+        self.pending = {}
+        self.flush_task = None
+        await self.accept()
+
+    async def disconnect(self, code):
+        if getattr(self, "joined_groups", None):
+            await count_subscriber(-1)
+        for group in getattr(self, "joined_groups", []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+        if getattr(self, "flush_task", None) is not None:
+            self.flush_task.cancel()
+
+    async def receive_json(self, content, **kwargs):
+        # The feed is push-only
+        pass
+
+    async def changes_batch(self, message):
+        for event in message["events"]:
+            key = (event["kind"], event["id"])
+            previous = self.pending.get(key)
+            if previous is not None:
+                event = {**event, "action": merge_actions(previous["action"], event["action"])}
+            self.pending[key] = event
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(settings.NOTIFICATIONS_COALESCE_SECONDS)
+        events = list(self.pending.values())
+        self.pending = {}
+        self.flush_task = None
+        if events:
+            await self.send_json({"type": "changes", "events": events})
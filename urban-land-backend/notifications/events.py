@@ -0,0 +1,118 @@
+# notifications/events.py
+"""
+Change events pushed to WebSocket clients.
+
+Events raised inside a transaction are held until it commits, collapsing
+repeated changes to the same object into one event, and then sent as a
+single batch per group. Nothing is sent for rolled-back transactions.
+
+Feed servers count their open sockets in the Django cache, and no events
+are looked up or sent while the count is zero. Until a feed server has
+started (config.asgi opens the count), or if the count was evicted, it is
+unknown and events are always sent.
+"""
+import logging
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+STAFF_ROLES = ("admin", "officer")
+SUBSCRIBERS_KEY = "notifications:subscribers"
+
+
+def role_group(role):
+    return f"role.{role}"
+
+
+def owner_group(user_id):
+    return f"owner.{user_id}"
+
+
+STAFF_GROUPS = frozenset(role_group(role) for role in STAFF_ROLES)
+
+
+def merge_actions(previous, current):
+    """Net effect of two changes to the same object"""
+    if current == "deleted" or previous is None:
+        return current
+    if previous == "created":
+        return "created"
+    return current
+
+
+def open_feed():
+    """Start counting feed sockets, unless another feed server already does"""
+    cache.add(SUBSCRIBERS_KEY, 0, timeout=None)
+
+
+async def count_subscriber(delta):
+    try:
+        await cache.aincr(SUBSCRIBERS_KEY, delta)
+    except ValueError:
+        # Not counted (yet): events are sent regardless
+        pass
+
+
+def has_subscribers():
+    count = cache.get(SUBSCRIBERS_KEY)
+    return count is None or count > 0
+
+
+class EventBuffer:
+    def __init__(self):
+        self.events = {}
+
+    def add(self, event, groups):
+        key = (event["kind"], event["id"])
+        previous = self.events.get(key)
+        if previous is not None:
+            previous_event, previous_groups = previous
+            event["action"] = merge_actions(previous_event["action"], event["action"])
+            groups = previous_groups | groups
+        self.events[key] = (event, groups)
+
+    def flush(self):
+        batches = defaultdict(list)
+        for event, groups in self.events.values():
+            for group in groups:
+                batches[group].append(event)
+        self.events = {}
+        try:
+            async_to_sync(_send_batches)(batches)
+        except Exception:
+            # A notification failure must never fail the write that caused it
+            logger.exception("Could not publish change events")
+
+
+async def _send_batches(batches):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    for group, events in batches.items():
+        await layer.group_send(group, {"type": "changes.batch", "events": events})
+
+
+def _current_buffer(using):
+    connection = transaction.get_connection(using)
+    buffer = getattr(connection, "_change_event_buffer", None)
+    # The buffer belongs to the open transaction only while its flush is still
+    # scheduled; after a commit or rollback a fresh one is started.
+    if buffer is not None and any(entry[1] == buffer.flush for entry in connection.run_on_commit):
+        return buffer, False
+    buffer = EventBuffer()
+    connection._change_event_buffer = buffer
+    return buffer, True
+
+
+def publish(kind, object_id, action, groups, using=None, **data):
+    """Queue a change event for ``groups``, delivered after the transaction commits"""
+    buffer, is_new = _current_buffer(using)
+    buffer.add({"kind": kind, "id": object_id, "action": action, **data}, set(groups))
+    if is_new:
+        # Outside an atomic block this runs immediately
+        transaction.on_commit(buffer.flush, using=using)
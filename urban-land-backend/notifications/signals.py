@@ -0,0 +1,174 @@
+# notifications/signals.py
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from applications.models import Application, Approval
+from audit.versioning import bulk_saved
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from records.models import Document, OwnershipRecord
+from .events import STAFF_GROUPS, has_subscribers, owner_group, publish
+
+LOOKUP_CHUNK = 1000
+
+
+def _action(created):
+    return "created" if created else "updated"
+
+
+def _parcel_owner_groups(parcel_id, using):
+    user_ids = (
+        OwnershipRecord.objects.using(using)
+        .filter(parcel_id=parcel_id, is_current_owner=True)
+        .values_list('owner__user_id', flat=True)
+    )
+    return {owner_group(user_id) for user_id in user_ids}
+
+
+def _record_owner_groups(record_id, using):
+    user_ids = (
+        OwnershipRecord.objects.using(using)
+        .filter(pk=record_id)
+        .values_list('owner__user_id', flat=True)
+    )
+    return {owner_group(user_id) for user_id in user_ids}
+
+
+@receiver(post_save, sender=LandParcel)
+def parcel_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw or not has_subscribers():
+        return
+    groups = STAFF_GROUPS | _parcel_owner_groups(instance.pk, using)
+    publish('parcel', instance.pk, _action(created), groups, using, status=instance.status)
+
+
+@receiver(post_delete, sender=LandParcel)
+def parcel_deleted(sender, instance, using=None, **kwargs):
+    # Owners hear about it through the cascaded ownership record deletes
+    if has_subscribers():
+        publish('parcel', instance.pk, 'deleted', STAFF_GROUPS, using)
+
+
+def _ownership_event(instance, action, using):
+    owner_ids = [owner for owner in (instance.owner_id, instance.transfer_to_id) if owner is not None]
+    user_ids = (
+        OwnerProfile.objects.using(using)
+        .filter(pk__in=owner_ids)
+        .values_list('user_id', flat=True)
+    )
+    groups = STAFF_GROUPS | {owner_group(user_id) for user_id in user_ids}
+    publish(
+        'ownership_record', instance.pk, action, groups, using,
+        parcel_id=instance.parcel_id,
+        owner_id=instance.owner_id,
+        is_current_owner=instance.is_current_owner,
+        verification_status=instance.verification_status,
+    )
+
+
+@receiver(post_save, sender=OwnershipRecord)
+def ownership_record_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if not raw and has_subscribers():
+        _ownership_event(instance, _action(created), using)
+
+
+@receiver(post_delete, sender=OwnershipRecord)
+def ownership_record_deleted(sender, instance, using=None, **kwargs):
+    if has_subscribers():
+        _ownership_event(instance, 'deleted', using)
+
+
+def _document_event(instance, action, using):
+    groups = set(STAFF_GROUPS)
+    if instance.ownership_record_id is not None:
+        groups |= _record_owner_groups(instance.ownership_record_id, using)
+    elif instance.related_parcel_id is not None:
+        groups |= _parcel_owner_groups(instance.related_parcel_id, using)
+    publish(
+        'document', instance.pk, action, groups, using,
+        parcel_id=instance.related_parcel_id,
+        ownership_record_id=instance.ownership_record_id,
+        doc_type=instance.doc_type,
+        is_verified=instance.is_verified,
+    )
+
+
+@receiver(post_save, sender=Document)
+def document_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if not raw and has_subscribers():
+        _document_event(instance, _action(created), using)
+
+
+@receiver(post_delete, sender=Document)
+def document_deleted(sender, instance, using=None, **kwargs):
+    if has_subscribers():
+        _document_event(instance, 'deleted', using)
+
+
+def _approval_event(instance, action, using):
+    applicants = (
+        Application.objects.using(using)
+        .filter(pk=instance.application_id)
+        .values_list('applicant_id', flat=True)
+    )
+    groups = STAFF_GROUPS | {owner_group(user_id) for user_id in applicants}
+    publish(
+        'approval', instance.pk, action, groups, using,
+        application_id=instance.application_id,
+        status=instance.status,
+    )
+
+
+@receiver(post_save, sender=Approval)
+def approval_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if not raw and has_subscribers():
+        _approval_event(instance, _action(created), using)
+
+
+@receiver(post_delete, sender=Approval)
+def approval_deleted(sender, instance, using=None, **kwargs):
+    if has_subscribers():
+        _approval_event(instance, 'deleted', using)
+
+
+def _chunks(pks):
+    pks = list(pks)
+    for start in range(0, len(pks), LOOKUP_CHUNK):
+        yield pks[start:start + LOOKUP_CHUNK]
+
+
+@receiver(bulk_saved, sender=LandParcel)
+def parcels_bulk_saved(sender, pks, created=False, **kwargs):
+    if not has_subscribers():
+        return
+    for chunk in _chunks(pks):
+        owners = defaultdict(set)
+        current = (OwnershipRecord.objects
+                   .filter(parcel_id__in=chunk, is_current_owner=True)
+                   .values_list('parcel_id', 'owner__user_id'))
+        for parcel_id, user_id in current:
+            owners[parcel_id].add(owner_group(user_id))
+        for pk, status in LandParcel.objects.filter(pk__in=chunk).values_list('pk', 'status'):
+            publish('parcel', pk, _action(created), STAFF_GROUPS | owners[pk], status=status)
+
+
+@receiver(bulk_saved, sender=OwnershipRecord)
+def ownership_records_bulk_saved(sender, pks, created=False, **kwargs):
+    if not has_subscribers():
+        return
+    for chunk in _chunks(pks):
+        rows = (OwnershipRecord.objects
+                .filter(pk__in=chunk)
+                .values_list('pk', 'parcel_id', 'owner_id', 'is_current_owner', 'verification_status',
+                             'owner__user_id', 'transfer_to__user_id'))
+        for pk, parcel_id, owner_id, is_current_owner, verification_status, *user_ids in rows:
+            groups = STAFF_GROUPS | {owner_group(user_id) for user_id in user_ids if user_id is not None}
+            publish(
+                'ownership_record', pk, _action(created), groups,
+                parcel_id=parcel_id,
+                owner_id=owner_id,
+                is_current_owner=is_current_owner,
+                verification_status=verification_status,
+            )
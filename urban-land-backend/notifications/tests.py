@@ -0,0 +1,79 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from land.models import LandParcel
+from . import events
+from .consumers import ChangeFeedConsumer
+
+IN_MEMORY_LAYER = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER, NOTIFICATIONS_COALESCE_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="admin")
+
+    def setUp(self):
+        cache.delete(events.SUBSCRIBERS_KEY)
+        events.open_feed()
+
+    async def subscribe(self, user):
+        communicator = WebsocketCommunicator(ChangeFeedConsumer.as_asgi(), "/ws/changes/")
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    def committed(self, write):
+        """Run write() and the on_commit callbacks its transaction would run"""
+        def run():
+            with self.captureOnCommitCallbacks(execute=True):
+                return write()
+        return sync_to_async(run)()
+
+    @staticmethod
+    def new_parcel(number=1):
+        return LandParcel.objects.create(
+            location=f"Block {number}", area=100.0, land_use_type="Residential",
+            cadastral_number=f"CAD-{number}", registration_date="2024-01-15",
+        )
+
+    async def test_subscriber_receives_saved_parcel(self):
+        communicator = await self.subscribe(self.admin)
+        parcel = await self.committed(self.new_parcel)
+
+        message = await communicator.receive_json_from(timeout=2)
+        self.assertEqual(message["type"], "changes")
+        self.assertEqual(message["events"], [
+            {"kind": "parcel", "id": parcel.pk, "action": "created", "status": "active"},
+        ])
+        await communicator.disconnect()
+
+    async def test_bulk_update_is_published(self):
+        parcel = await self.committed(self.new_parcel)
+        communicator = await self.subscribe(self.admin)
+
+        def bulk_update():
+            LandParcel.objects.filter(pk=parcel.pk).update(status="pending")
+        await self.committed(bulk_update)
+
+        message = await communicator.receive_json_from(timeout=2)
+        self.assertEqual(message["events"], [
+            {"kind": "parcel", "id": parcel.pk, "action": "updated", "status": "pending"},
+        ])
+        await communicator.disconnect()
+
+    async def test_nothing_is_looked_up_or_sent_without_subscribers(self):
+        communicator = await self.subscribe(self.admin)
+        await communicator.disconnect()
+        self.assertFalse(events.has_subscribers())
+
+        with mock.patch.object(events, "_send_batches") as send:
+            await self.committed(self.new_parcel)
+        send.assert_not_called()
@@ -0,0 +1,33 @@
+# owners/async_views.py
+from django.views.decorators.http import require_GET
+
+from config.async_api import async_login_required, json_response
+from records.models import OwnershipRecord
+from .models import OwnerProfile
+from .serializers import OwnerProfileSerializer
+
+
+@require_GET
+@async_login_required
+async def owner_me(request):
+    """The requesting user's own owner profile, with their current lands"""
+    profile = await (
+        OwnerProfile.objects
+        .select_related('user')
+        .filter(user=request.user)
+        .afirst()
+    )
+    if profile is None:
+        return json_response({"detail": "Owner profile not found."}, status=404)
+
+    records = [
+        record async for record in
+        OwnershipRecord.objects
+        .filter(owner=profile, is_current_owner=True)
+        .select_related('parcel')
+    ]
+    data = OwnerProfileSerializer(
+        profile,
+        context={'request': request, 'ownership_records': {profile.id: records}}
+    ).data
+    return json_response(data)
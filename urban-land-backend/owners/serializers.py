@@ -1,5 +1,6 @@
 # owners/serializers.py
 from rest_framework import serializers
+from core.lean import LeanSerializer
 from .models import OwnerProfile
 from accounts.models import User
 
@@ -82,11 +83,16 @@ class OwnerProfileSerializer(serializers.ModelSerializer):
     def get_owned_lands(self, obj):
         """Get all lands owned by this owner"""
         try:
-            from records.models import OwnershipRecord
-            records = OwnershipRecord.objects.filter(
-                owner=obj,
-                is_current_owner=True
-            ).select_related('parcel')
+            # Callers that already loaded records pass them as {owner_id: [records]}
+            ownership_records = self.context.get('ownership_records')
+            if ownership_records is not None:
+                records = ownership_records.get(obj.id, [])
+            else:
+                from records.models import OwnershipRecord
+                records = OwnershipRecord.objects.filter(
+                    owner=obj,
+                    is_current_owner=True
+                ).select_related('parcel')
             
             lands_data = []
             for record in records:
@@ -138,4 +144,60 @@ class OwnerProfileSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+
+def current_owned_lands(owner_ids):
+    """owned_lands per owner, as OwnerProfileSerializer.get_owned_lands builds it, in one query"""
+    from records.models import OwnershipRecord
+    lands = {}
+    records = (OwnershipRecord.objects
+               .filter(owner_id__in=owner_ids, is_current_owner=True)
+               .order_by('owner_id', '-acquisition_date', 'pk')
+               .values_list('owner_id', 'parcel__parcel_id', 'parcel__cadastral_number', 'parcel__location',
+                            'parcel__area', 'parcel__registration_date', 'parcel__current_market_value',
+                            'parcel__annual_tax_value', 'parcel__status', 'ownership_type',
+                            'ownership_percentage', 'acquisition_date', 'acquisition_type'))
+    for (owner_id, parcel_id, cadastral_number, location, area, registration_date, market_value, tax_value,
+         status, ownership_type, percentage, acquisition_date, acquisition_type) in records:
+        lands.setdefault(owner_id, []).append({
+            'parcel': {
+                'parcel_id': parcel_id,
+                'cadastral_number': cadastral_number,
+                'location': location,
+                'area': area,
+                'registration_date': registration_date,
+                'current_market_value': market_value,
+                'annual_tax_value': tax_value,
+                'status': status,
+            },
+            'ownership_type': ownership_type,
+            'ownership_percentage': float(percentage),
+            'acquisition_date': acquisition_date,
+            'acquisition_type': acquisition_type,
+        })
+    return lands
+
+
+class OwnerProfileLeanSerializer(LeanSerializer):
+    """OwnerProfileSerializer output for list pages, from values() rows"""
+    serializer_class = OwnerProfileSerializer
+    file_urls = {
+        'profile_picture_url': 'profile_picture',
+        'id_card_front_url': 'id_card_front',
+        'id_card_back_url': 'id_card_back',
+        'signature_url': 'signature',
+    }
+
+    def prepare(self, rows):
+        return current_owned_lands([row['id'] for row in rows])
+
+    def compute(self, name, row, owned_lands):
+        if name == 'owned_lands':
+            return owned_lands.get(row['id'], [])
+        if name == 'full_name':
+            return " ".join(part for part in (row['first_name'], row['middle_name'], row['last_name']) if part)
+        if name in self.file_urls:
+            file_name = row[self.file_urls[name]]
+            return OwnerProfile._meta.get_field(self.file_urls[name]).storage.url(file_name) if file_name else None
+        return super().compute(name, row, owned_lands)
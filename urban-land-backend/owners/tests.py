@@ -1,3 +1,44 @@
+import datetime
+from decimal import Decimal
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from land.models import LandParcel
+from records.models import OwnershipRecord
+from transactions.models import Payment
+from .models import OwnerProfile
+
+
+class PortalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", password="x")
+        cls.profile = OwnerProfile.objects.create(
+            user=cls.user, national_id="N-1", first_name="A", last_name="B", gender="Other",
+        )
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        OwnershipRecord.objects.create(
+            parcel=cls.parcel, owner=cls.profile, ownership_percentage=100,
+            acquisition_date=datetime.date(2021, 3, 4), is_current_owner=True,
+        )
+        for amount, status, payment_type in (("100.00", "pending", "tax"), ("40.00", "paid", "fee")):
+            Payment.objects.create(
+                payer=cls.profile, parcel=cls.parcel, amount=Decimal(amount), payment_type=payment_type,
+                payment_date=datetime.date(2026, 1, 31), status=status,
+            )
+
+    def test_outstanding_balance_comes_from_the_ledger(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(4):
+            response = client.get("/api/portal/")
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([payment["status"] for payment in response.data["outstanding_payments"]], ["pending"])
+        self.assertEqual(Decimal(response.data["outstanding_total"]), Decimal("100.00"))
+        self.assertEqual(Decimal(response.data["parcels"][0]["balance"]), Decimal("100.00"))
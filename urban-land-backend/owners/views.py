@@ -1,15 +1,37 @@
 # owners/views.py
+import hashlib
+import json
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, Sum
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from core.lean import LeanListMixin
+from core.response_cache import CachedRetrieveMixin
+from records.models import Document, OwnershipRecord
+from transactions.models import Payment
 from .models import OwnerProfile
-from .serializers import OwnerProfileSerializer
+from .serializers import OwnerProfileLeanSerializer, OwnerProfileSerializer
+
+PORTAL_RECENT_DOCUMENTS = 10
+
+
+def _ledger_balance(instance):
+    """Balance owed in the payments ledger (ParcelBalance or OwnerBalance), 0 with no postings"""
+    try:
+        return instance.balance.balance
+    except ObjectDoesNotExist:
+        return 0
 
 
-class OwnerProfileViewSet(viewsets.ModelViewSet):
+class OwnerProfileViewSet(LeanListMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
+    cache_label = "owner"
+    lean_serializer_class = OwnerProfileLeanSerializer
     serializer_class = OwnerProfileSerializer
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [IsAuthenticated]
@@ -64,6 +86,20 @@ class OwnerProfileViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def me(self, request):
+        """The requesting user's own owner profile, with their current lands"""
+        profile = OwnerProfile.objects.select_related("user").filter(user=request.user).first()
+        if profile is None:
+            return Response({"error": "Owner profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        records = list(OwnershipRecord.objects
+                       .filter(owner=profile, is_current_owner=True)
+                       .select_related("parcel"))
+        serializer = self.get_serializer(profile, context={
+            **self.get_serializer_context(), "ownership_records": {profile.id: records},
+        })
+        return Response(serializer.data)
+
     # Extra endpoint for admin search
     @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
     def search(self, request):
@@ -73,4 +109,92 @@ class OwnerProfileViewSet(viewsets.ModelViewSet):
 
         queryset = OwnerProfile.objects.filter(user__username=username)
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def portal(request):
+    """
+    Everything the owner portal shows after login in one response: profile,
+    current parcels with shares and ledger balances, recent documents and
+    pending bills. The outstanding total is the owner's balance in the
+    payments ledger, so part payments, waivers and reversals count. Four
+    queries regardless of holdings; answers If-None-Match with 304.
+    """
+    profile = OwnerProfile.objects.select_related("user", "balance").filter(user=request.user).first()
+    if profile is None:
+        return Response({"error": "Owner profile not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    records = list(OwnershipRecord.objects
+                   .filter(owner=profile, is_current_owner=True)
+                   .select_related("parcel", "parcel__balance")
+                   .order_by("parcel_id"))
+    parcel_ids = [record.parcel_id for record in records]
+
+    documents = (Document.objects
+                 .filter(Q(ownership_record__owner=profile) | Q(related_parcel_id__in=parcel_ids))
+                 .order_by("-uploaded_at", "-pk")
+                 .values("id", "doc_type", "document_number", "document_date", "issuing_authority",
+                         "is_verified", "uploaded_at", "related_parcel_id", "ownership_record__parcel_id",
+                         "file", "file_url")[:PORTAL_RECENT_DOCUMENTS])
+    labels = dict(Document.DOCUMENT_TYPES)
+    file_storage = Document._meta.get_field("file").storage
+
+    payments = list(Payment.objects
+                    .filter(Q(payer=profile) | Q(parcel_id__in=parcel_ids))
+                    .filter(status="pending")
+                    .order_by("payment_date", "pk")
+                    .values("id", "parcel_id", "amount", "payment_type", "payment_date", "period", "status"))
+
+    profile_data = OwnerProfileSerializer(
+        profile, context={"request": request, "ownership_records": {profile.id: records}}
+    ).data
+    # The parcels list below carries the same holdings
+    profile_data.pop("owned_lands", None)
+
+    data = {
+        "profile": profile_data,
+        "parcels": [
+            {
+                "parcel_id": record.parcel.parcel_id,
+                "cadastral_number": record.parcel.cadastral_number,
+                "location": record.parcel.location,
+                "mouza_name": record.parcel.mouza_name,
+                "area": record.parcel.area,
+                "land_use_zone": record.parcel.land_use_zone,
+                "status": record.parcel.status,
+                "current_market_value": record.parcel.current_market_value,
+                "annual_tax_value": record.parcel.annual_tax_value,
+                "ownership_type": record.ownership_type,
+                "ownership_percentage": record.ownership_percentage,
+                "acquisition_date": record.acquisition_date,
+                "balance": _ledger_balance(record.parcel),
+            }
+            for record in records
+        ],
+        "recent_documents": [
+            {
+                "id": document["id"],
+                "doc_type": document["doc_type"],
+                "doc_type_display": labels.get(document["doc_type"], document["doc_type"]),
+                "document_number": document["document_number"],
+                "document_date": document["document_date"],
+                "issuing_authority": document["issuing_authority"],
+                "parcel_id": document["related_parcel_id"] or document["ownership_record__parcel_id"],
+                "is_verified": document["is_verified"],
+                "uploaded_at": document["uploaded_at"],
+                "file_url": file_storage.url(document["file"]) if document["file"] else document["file_url"],
+            }
+            for document in documents
+        ],
+        "outstanding_payments": payments,
+        "outstanding_total": _ledger_balance(profile),
+    }
+    # Round-trip so the ETag covers exactly what is rendered
+    data = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+    etag = '"%s"' % hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(data, headers=headers)
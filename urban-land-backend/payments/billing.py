@@ -0,0 +1,111 @@
+# payments/billing.py
+"""
+Annual tax billing: one transactions.Payment (payment_type "tax", status
+"pending") per active parcel and period, for its annual_tax_value, billed to
+the parcel's current owner and posted to the ledger as a charge.
+
+Parcels are billed in primary-key chunks. Each chunk's bills, ledger
+postings and the run's checkpoint commit together, so after a crash the
+run resumes from the last committed parcel. The unique (parcel, type,
+period) constraint makes a second bill for the same period impossible.
+"""
+import time
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from land.models import LandParcel
+from records.models import OwnershipRecord
+from transactions.models import Payment
+from .folding import fold
+from .models import BillingRun
+
+CHUNK_SIZE = 5000
+
+
+def billable_parcels():
+    return LandParcel.objects.filter(status="active", is_active=True, annual_tax_value__gt=0)
+
+
+def start_or_resume(period, due_date):
+    """The unfinished run for ``period`` (keeping its due date), or a new one"""
+    run = BillingRun.objects.filter(period=period).exclude(status="completed").first()
+    if run is None:
+        return BillingRun.objects.create(period=period, due_date=due_date)
+    run.status = "running"
+    run.error = ""
+    run.save(update_fields=["status", "error"])
+    return run
+
+
+def bill_chunk(run, parcels):
+    """Create the chunk's missing bills and post them; returns (created, existing, amount)"""
+    parcel_ids = [parcel_id for parcel_id, _ in parcels]
+    existing = set(Payment.objects
+                   .filter(parcel_id__in=parcel_ids, payment_type="tax", period=run.period)
+                   .values_list("parcel_id", flat=True))
+    owners = {}
+    for parcel_id, owner_id in (OwnershipRecord.objects
+                                .filter(parcel_id__in=parcel_ids, is_current_owner=True)
+                                .order_by("-ownership_percentage", "pk")
+                                .values_list("parcel_id", "owner_id")):
+        owners.setdefault(parcel_id, owner_id)
+
+    bills = [
+        Payment(
+            parcel_id=parcel_id,
+            payer_id=owners.get(parcel_id),
+            amount=amount,
+            payment_type="tax",
+            payment_date=run.due_date,
+            status="pending",
+            period=run.period,
+        )
+        for parcel_id, amount in parcels
+        if parcel_id not in existing
+    ]
+    # ignore_conflicts covers a concurrent run billing the same parcels; it
+    # skips conflicting rows silently and leaves pks unset, so count and
+    # post the new bills as read back rather than as built
+    Payment.objects.bulk_create(bills, ignore_conflicts=True)
+    created = list(Payment.objects.filter(
+        parcel_id__in=[bill.parcel_id for bill in bills], payment_type="tax", period=run.period,
+    ))
+    fold(created)
+    return len(created), len(existing), sum((bill.amount for bill in created), Decimal(0))
+
+
+def run_billing(run, chunk_size=CHUNK_SIZE, progress=None):
+    """Bill every billable parcel after the run's checkpoint"""
+    parcels = billable_parcels().order_by("pk")
+    try:
+        while True:
+            started = time.perf_counter()
+            chunk = list(parcels.filter(pk__gt=run.last_parcel_id)
+                         .values_list("pk", "annual_tax_value")[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                created, existing, amount = bill_chunk(run, chunk)
+                run.last_parcel_id = chunk[-1][0]
+                run.parcels_scanned += len(chunk)
+                run.bills_created += created
+                run.bills_existing += existing
+                run.amount_billed += amount
+                run.chunks += 1
+                run.seconds += time.perf_counter() - started
+                run.save()
+            if progress:
+                progress(run)
+    except Exception as error:
+        run.status = "failed"
+        run.error = repr(error)
+        run.save(update_fields=["status", "error"])
+        raise
+
+    run.status = "completed"
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "finished_at"])
+    return run
+
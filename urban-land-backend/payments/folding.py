@@ -0,0 +1,152 @@
+# payments/folding.py
+"""
+Post the legacy payment tables (applications.Payment and
+transactions.Payment) to the ledger.
+
+Each row is a bill: it becomes a charge, plus a payment once its status is
+"paid". Postings carry the row as their origin ("<model label>:<pk>"), and
+folding a row again compares them with what the row says now: a charge or
+payment whose parcel, payer, amount or date changed, or a payment whose
+row is no longer paid, is reversed and the current one posted in its
+place. Sources are "<origin>:charge" and "<origin>:payment" for the first
+posting, "...:<n>" for later ones and "<source>:reversed" for reversals,
+so folding is safe to repeat.
+"""
+from collections import defaultdict
+
+from django.utils import timezone
+
+from applications.models import Payment as ApplicationPayment
+from owners.models import OwnerProfile
+from transactions.models import Payment as TransactionPayment
+from .ledger import LOOKUP_CHUNK, post_many
+from .models import LedgerTransaction
+
+CHUNK_SIZE = 2000
+REVERSIBLE = ("charge", "payment")
+
+
+def origin_of(payment):
+    return f"{payment._meta.label_lower}:{payment.pk}"
+
+
+def postings_for(payment, owner_id):
+    if payment.parcel_id is None or not payment.amount or payment.amount <= 0:
+        return []
+    source = origin_of(payment)
+    charge = LedgerTransaction(
+        kind="charge",
+        parcel_id=payment.parcel_id,
+        owner_id=owner_id,
+        amount=payment.amount,
+        date=payment.payment_date,
+        due_date=payment.payment_date,
+        description=payment.payment_type,
+        source=f"{source}:charge",
+        origin=source,
+    )
+    if payment.status != "paid":
+        return [charge]
+    settled = LedgerTransaction(
+        kind="payment",
+        parcel_id=payment.parcel_id,
+        owner_id=owner_id,
+        amount=payment.amount,
+        date=payment.payment_date,
+        description=payment.payment_type,
+        source=f"{source}:payment",
+        origin=source,
+    )
+    return [charge, settled]
+
+
+def owner_ids_for(payments):
+    """OwnerProfile id of each payment's payer (application payments are paid by users)"""
+    payments = list(payments)
+    if not payments:
+        return {}
+    if isinstance(payments[0], TransactionPayment):
+        return {payment.pk: payment.payer_id for payment in payments}
+    profiles = dict(OwnerProfile.objects
+                    .filter(user_id__in={payment.payer_id for payment in payments})
+                    .values_list("user_id", "pk"))
+    return {payment.pk: profiles.get(payment.payer_id) for payment in payments}
+
+
+def reversal_of(posting):
+    return LedgerTransaction(
+        kind=f"{posting.kind}_reversal",
+        parcel_id=posting.parcel_id,
+        owner_id=posting.owner_id,
+        amount=posting.amount,
+        date=timezone.localdate(),
+        description=posting.description,
+        source=f"{posting.source}:reversed",
+        origin=posting.origin,
+    )
+
+
+def _terms(posting):
+    return posting.parcel_id, posting.owner_id, posting.amount, posting.date
+
+
+def reconcile(wanted, posted):
+    """Postings that bring one row's ledger transactions from ``posted`` to ``wanted``"""
+    sources = {posting.source for posting in posted}
+    standing = {posting.kind: posting for posting in posted
+                if posting.kind in REVERSIBLE and f"{posting.source}:reversed" not in sources}
+    wanted = {posting.kind: posting for posting in wanted}
+    postings = []
+    for kind in REVERSIBLE:
+        current, target = standing.get(kind), wanted.get(kind)
+        if current and target and _terms(current) == _terms(target):
+            continue
+        if current:
+            postings.append(reversal_of(current))
+        if target:
+            earlier = sum(1 for posting in posted if posting.kind == kind)
+            if earlier:
+                target.source = f"{target.source}:{earlier}"
+            postings.append(target)
+    return postings
+
+
+def _post_changes(wanted):
+    """Post what brings each origin's ledger transactions to ``wanted[origin]``"""
+    origins = list(wanted)
+    posted = defaultdict(list)
+    for start in range(0, len(origins), LOOKUP_CHUNK):
+        for posting in LedgerTransaction.objects.filter(origin__in=origins[start:start + LOOKUP_CHUNK]).order_by("pk"):
+            posted[posting.origin].append(posting)
+    postings = [posting for origin, target in wanted.items() for posting in reconcile(target, posted[origin])]
+    return len(post_many(postings))
+
+
+def fold(payments):
+    """Post a batch of payments of one model; returns the number of new ledger transactions"""
+    payments = list(payments)
+    owners = owner_ids_for(payments)
+    return _post_changes({origin_of(payment): postings_for(payment, owners[payment.pk]) for payment in payments})
+
+
+def unfold(origins):
+    """Reverse what the deleted payments with these origins had posted; returns the number of reversals"""
+    return _post_changes({origin: [] for origin in origins})
+
+
+def fold_all(progress=None):
+    """Fold both payment tables in primary-key chunks; returns {model label: postings}"""
+    results = {}
+    for model in (ApplicationPayment, TransactionPayment):
+        label = model._meta.label_lower
+        results[label] = 0
+        last_pk = 0
+        while True:
+            chunk = list(model.objects.filter(pk__gt=last_pk).order_by("pk")[:CHUNK_SIZE])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            results[label] += fold(chunk)
+            if progress:
+                progress(label, last_pk, results[label])
+    return results
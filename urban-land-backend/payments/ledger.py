@@ -0,0 +1,138 @@
+# payments/ledger.py
+"""
+Double-entry ledger for parcel charges and payments.
+
+Every posting is a LedgerTransaction with balanced entries (debits and
+credits sum to zero):
+
+    charge            Dr receivable  Cr revenue
+    payment           Dr cash        Cr receivable
+    waiver            Dr revenue     Cr receivable
+    charge reversal   Dr revenue     Cr receivable
+    payment reversal  Dr receivable  Cr cash
+
+Posted transactions are never edited; a charge or payment that turns out
+wrong is reversed and posted again.
+
+The parcel's and owner's Balance rows are locked and updated in the same
+database transaction as the entries, so a balance never disagrees with the
+entries behind it.
+"""
+import datetime
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import LedgerEntry, LedgerTransaction, OwnerBalance, ParcelBalance
+
+ENTRIES = {
+    "charge": (("receivable", 1), ("revenue", -1)),
+    "payment": (("cash", 1), ("receivable", -1)),
+    "waiver": (("revenue", 1), ("receivable", -1)),
+    "charge_reversal": (("revenue", 1), ("receivable", -1)),
+    "payment_reversal": (("receivable", 1), ("cash", -1)),
+}
+# kind -> (Balance total, sign)
+TOTALS = {
+    "charge": ("charged", 1),
+    "payment": ("paid", 1),
+    "waiver": ("waived", 1),
+    "charge_reversal": ("charged", -1),
+    "payment_reversal": ("paid", -1),
+}
+LOOKUP_CHUNK = 1000
+
+
+def post(kind, parcel_id, amount, date, owner_id=None, due_date=None, description="", source=None):
+    """Post one charge, payment or waiver; returns it, or None if ``source`` was already posted"""
+    posted = post_many([LedgerTransaction(
+        kind=kind, parcel_id=parcel_id, owner_id=owner_id, amount=Decimal(amount),
+        date=date, due_date=due_date, description=description, source=source,
+    )])
+    return posted[0] if posted else None
+
+
+def post_many(postings):
+    """
+    Save unsaved LedgerTransactions with their entries and update balances
+    in one database transaction. Postings whose source is already in the
+    ledger (or repeated in the batch) are skipped; the posted ones are
+    returned.
+    """
+    for posting in postings:
+        if posting.kind not in ENTRIES:
+            raise ValueError(f"Unknown ledger posting kind: {posting.kind}")
+        if posting.amount <= 0:
+            raise ValueError("Ledger amounts must be positive")
+
+    with transaction.atomic():
+        postings = _new_postings(postings)
+        if not postings:
+            return []
+        if connection.features.can_return_rows_from_bulk_insert:
+            LedgerTransaction.objects.bulk_create(postings)
+        else:
+            for posting in postings:
+                posting.save()
+        LedgerEntry.objects.bulk_create(
+            LedgerEntry(transaction=posting, account=account, amount=posting.amount * sign)
+            for posting in postings
+            for account, sign in ENTRIES[posting.kind]
+        )
+        _apply_balances(ParcelBalance, "parcel_id", postings)
+        _apply_balances(OwnerBalance, "owner_id", postings)
+    return postings
+
+
+def _new_postings(postings):
+    sources = [posting.source for posting in postings if posting.source]
+    posted = set()
+    for start in range(0, len(sources), LOOKUP_CHUNK):
+        posted.update(LedgerTransaction.objects
+                      .filter(source__in=sources[start:start + LOOKUP_CHUNK])
+                      .values_list("source", flat=True))
+    new = []
+    for posting in postings:
+        if posting.source:
+            if posting.source in posted:
+                continue
+            posted.add(posting.source)
+        new.append(posting)
+    return new
+
+
+def _apply_balances(model, key, postings):
+    postings = [posting for posting in postings if getattr(posting, key) is not None]
+    ids = {getattr(posting, key) for posting in postings}
+    if not ids:
+        return
+    # Create missing rows first so concurrent postings lock the same row
+    model.objects.bulk_create([model(pk=pk) for pk in ids], ignore_conflicts=True)
+    balances = model.objects.select_for_update().in_bulk(list(ids))
+
+    for posting in sorted(postings, key=lambda posting: posting.date):
+        balance = balances[getattr(posting, key)]
+        total, sign = TOTALS[posting.kind]
+        setattr(balance, total, getattr(balance, total) + sign * posting.amount)
+        previous = balance.balance
+        balance.balance = balance.charged - balance.paid - balance.waived
+        if balance.balance <= 0:
+            balance.overdue_since = None
+        elif previous <= 0:
+            balance.overdue_since = posting.due_date or posting.date
+
+    now = timezone.now()
+    for balance in balances.values():
+        balance.updated_at = now
+    model.objects.bulk_update(
+        list(balances.values()), ["charged", "paid", "waived", "balance", "overdue_since", "updated_at"],
+        batch_size=LOOKUP_CHUNK,
+    )
+
+
+def arrears(as_of=None, grace_days=0):
+    """Parcel balances overdue for more than ``grace_days``, oldest first"""
+    cutoff = (as_of or timezone.localdate()) - datetime.timedelta(days=grace_days)
+    # overdue_since is only set while something is owed
+    return ParcelBalance.objects.filter(overdue_since__lt=cutoff).order_by("overdue_since", "parcel_id")
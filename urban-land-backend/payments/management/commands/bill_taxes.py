@@ -0,0 +1,38 @@
+# payments/management/commands/bill_taxes.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payments import billing
+
+
+class Command(BaseCommand):
+    help = "Generate annual tax bills for all active parcels (resumes an unfinished run for the period)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", help="Billing period (default: the current year)")
+        parser.add_argument("--due-date", help="Due date of the bills, YYYY-MM-DD (default: today)")
+        parser.add_argument("--chunk-size", type=int, default=billing.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        period = options["period"] or str(timezone.localdate().year)
+        try:
+            due_date = datetime.date.fromisoformat(options["due_date"]) if options["due_date"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--due-date must be a date in YYYY-MM-DD format")
+
+        run = billing.start_or_resume(period, due_date)
+        if run.chunks:
+            self.stdout.write(f"Resuming billing run {run.pk} for {period} after parcel {run.last_parcel_id}")
+        billing.run_billing(
+            run, options["chunk_size"],
+            progress=lambda run: self.stdout.write(
+                f"  {run.parcels_scanned} parcels, {run.bills_created} new bills "
+                f"({run.parcels_scanned / run.seconds:.0f} parcels/s)"
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Billing run {run.pk} for {period}: {run.bills_created} bills created, "
+            f"{run.bills_existing} already billed, {run.amount_billed} billed in {run.seconds:.1f}s"
+        ))
@@ -0,0 +1,21 @@
+# payments/management/commands/fold_payments.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments import folding
+
+
+class Command(BaseCommand):
+    help = "Post existing applications.Payment and transactions.Payment rows to the ledger (safe to rerun)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = folding.fold_all(
+            progress=lambda label, last_pk, posted: self.stdout.write(
+                f"  {label} up to id {last_pk}: {posted} postings"
+            ),
+        )
+        for label, posted in results.items():
+            self.stdout.write(f"{label}: {posted} new ledger transactions")
+        self.stdout.write(self.style.SUCCESS(f"Folded payments in {time.perf_counter() - started:.1f}s"))
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('land', '0001_initial'),
+        ('owners', '0002_ownerprofile_id_card_back_ownerprofile_id_card_front_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OwnerBalance',
+            fields=[
+                ('charged', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('waived', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('overdue_since', models.DateField(blank=True, db_index=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='owners.ownerprofile')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ParcelBalance',
+            fields=[
+                ('charged', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('waived', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('overdue_since', models.DateField(blank=True, db_index=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('parcel', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='land.landparcel')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('charge', 'Charge'), ('payment', 'Payment'), ('waiver', 'Waiver')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('date', models.DateField()),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('source', models.CharField(blank=True, max_length=100, null=True, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_transactions', to='owners.ownerprofile')),
+                ('parcel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_transactions', to='land.landparcel')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('account', models.CharField(choices=[('receivable', 'Receivable'), ('revenue', 'Revenue'), ('cash', 'Cash')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('transaction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='payments.ledgertransaction')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='ledgertransaction',
+            index=models.Index(fields=['parcel', 'date'], name='ledger_parcel_date_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillingRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=20)),
+                ('due_date', models.DateField()),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('last_parcel_id', models.PositiveBigIntegerField(default=0)),
+                ('parcels_scanned', models.PositiveIntegerField(default=0)),
+                ('bills_created', models.PositiveIntegerField(default=0)),
+                ('bills_existing', models.PositiveIntegerField(default=0)),
+                ('amount_billed', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('chunks', models.PositiveIntegerField(default=0)),
+                ('seconds', models.FloatField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
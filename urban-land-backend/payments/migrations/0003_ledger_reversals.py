@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:20
+
+from django.db import migrations, models
+
+
+def set_origins(apps, schema_editor):
+    # Folded sources are "<model label>:<pk>:charge" or "...:payment"
+    LedgerTransaction = apps.get_model('payments', 'LedgerTransaction')
+    pending = []
+    for posting in LedgerTransaction.objects.exclude(source=None).only('source').iterator(chunk_size=2000):
+        posting.origin = posting.source.rsplit(':', 1)[0]
+        pending.append(posting)
+        if len(pending) == 2000:
+            LedgerTransaction.objects.bulk_update(pending, ['origin'])
+            pending = []
+    LedgerTransaction.objects.bulk_update(pending, ['origin'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_billingrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgertransaction',
+            name='origin',
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='ledgertransaction',
+            name='kind',
+            field=models.CharField(choices=[('charge', 'Charge'), ('payment', 'Payment'), ('waiver', 'Waiver'), ('charge_reversal', 'Charge reversal'), ('payment_reversal', 'Payment reversal')], max_length=20),
+        ),
+        migrations.RunPython(set_origins, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,122 @@
+# payments/models.py
 from django.db import models
 
-# Create your models here.
+from land.models import LandParcel
+from owners.models import OwnerProfile
+
+
+class LedgerTransaction(models.Model):
+    """
+    One business event (a charge, a payment, a waiver or the reversal of a
+    charge or payment) recorded as balanced LedgerEntry rows. ``source``
+    identifies the posting so the same event is never posted twice, and
+    ``origin`` the record it was posted from.
+    """
+    KINDS = [
+        ("charge", "Charge"),
+        ("payment", "Payment"),
+        ("waiver", "Waiver"),
+        ("charge_reversal", "Charge reversal"),
+        ("payment_reversal", "Payment reversal"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KINDS)
+    parcel = models.ForeignKey(LandParcel, on_delete=models.CASCADE, related_name="ledger_transactions")
+    owner = models.ForeignKey(
+        OwnerProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_transactions"
+    )
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    date = models.DateField()
+    due_date = models.DateField(null=True, blank=True)
+    description = models.CharField(max_length=255, blank=True)
+    source = models.CharField(max_length=100, null=True, blank=True, unique=True)
+    origin = models.CharField(max_length=100, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["parcel", "date"], name="ledger_parcel_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.amount} on parcel {self.parcel_id}"
+
+
+class LedgerEntry(models.Model):
+    """A debit (positive amount) or credit (negative amount) to one account"""
+    ACCOUNTS = [
+        ("receivable", "Receivable"),
+        ("revenue", "Revenue"),
+        ("cash", "Cash"),
+    ]
+
+    transaction = models.ForeignKey(LedgerTransaction, on_delete=models.CASCADE, related_name="entries")
+    account = models.CharField(max_length=20, choices=ACCOUNTS)
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.account} {self.amount}"
+
+
+class Balance(models.Model):
+    """
+    Running totals kept in step with the ledger. ``overdue_since`` is the
+    due date from which the balance has been continuously positive, and is
+    null whenever nothing is owed, so arrears are a range scan on it.
+    """
+    charged = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    waived = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    balance = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    overdue_since = models.DateField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class ParcelBalance(Balance):
+    parcel = models.OneToOneField(LandParcel, on_delete=models.CASCADE, primary_key=True, related_name="balance")
+
+    def __str__(self):
+        return f"Parcel {self.parcel_id}: {self.balance}"
+
+
+class OwnerBalance(Balance):
+    owner = models.OneToOneField(OwnerProfile, on_delete=models.CASCADE, primary_key=True, related_name="balance")
+
+    def __str__(self):
+        return f"{self.owner}: {self.balance}"
+
+
+class BillingRun(models.Model):
+    """
+    One tax billing run for a period. The run commits a checkpoint
+    (last_parcel_id and the counters) with every chunk of bills, so a
+    crashed run resumes after the last committed chunk.
+    """
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    period = models.CharField(max_length=20)
+    due_date = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    last_parcel_id = models.PositiveBigIntegerField(default=0)
+    parcels_scanned = models.PositiveIntegerField(default=0)
+    bills_created = models.PositiveIntegerField(default=0)
+    bills_existing = models.PositiveIntegerField(default=0)
+    amount_billed = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    chunks = models.PositiveIntegerField(default=0)
+    seconds = models.FloatField(default=0)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Billing {self.period} ({self.status})"
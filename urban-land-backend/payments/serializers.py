@@ -0,0 +1,42 @@
+# payments/serializers.py
+from rest_framework import serializers
+from .models import BillingRun, LedgerEntry, LedgerTransaction, OwnerBalance, ParcelBalance
+
+
+class LedgerEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LedgerEntry
+        fields = ["account", "amount"]
+
+
+class LedgerTransactionSerializer(serializers.ModelSerializer):
+    entries = LedgerEntrySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = LedgerTransaction
+        fields = ["id", "kind", "parcel", "owner", "amount", "date", "due_date",
+                  "description", "source", "entries", "created_at"]
+
+
+class ParcelBalanceSerializer(serializers.ModelSerializer):
+    cadastral_number = serializers.CharField(source="parcel.cadastral_number", read_only=True)
+
+    class Meta:
+        model = ParcelBalance
+        fields = ["parcel", "cadastral_number", "charged", "paid", "waived", "balance",
+                  "overdue_since", "updated_at"]
+
+
+class OwnerBalanceSerializer(serializers.ModelSerializer):
+    full_name = serializers.CharField(source="owner.__str__", read_only=True)
+
+    class Meta:
+        model = OwnerBalance
+        fields = ["owner", "full_name", "charged", "paid", "waived", "balance",
+                  "overdue_since", "updated_at"]
+
+
+class BillingRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BillingRun
+        fields = "__all__"
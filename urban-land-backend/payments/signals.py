@@ -0,0 +1,24 @@
+# payments/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from applications.models import Payment as ApplicationPayment
+from transactions.models import Payment as TransactionPayment
+from .folding import fold, origin_of, unfold
+
+
+@receiver(post_save, sender=ApplicationPayment)
+@receiver(post_save, sender=TransactionPayment)
+def payment_saved(sender, instance, raw=False, **kwargs):
+    # Keeps the ledger in step with new bills and with bills that changed
+    if not raw:
+        fold([instance])
+
+
+@receiver(post_delete, sender=ApplicationPayment)
+@receiver(post_delete, sender=TransactionPayment)
+def payment_deleted(sender, instance, **kwargs):
+    # After commit: when the parcel itself was deleted its ledger went with it
+    origin = origin_of(instance)
+    transaction.on_commit(lambda: unfold([origin]))
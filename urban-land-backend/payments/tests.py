@@ -1,3 +1,124 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.db.models import Sum
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from transactions.models import Payment
+from . import billing, folding
+from .models import BillingRun, LedgerEntry, LedgerTransaction, ParcelBalance
+
+
+class PaymentFoldingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        user = User.objects.create_user("owner", password="x", role="owner")
+        cls.owner = OwnerProfile.objects.create(
+            user=user, national_id="N-1", first_name="A", last_name="B", gender="Other",
+        )
+
+    def new_payment(self, amount="100.00", status="pending"):
+        return Payment.objects.create(
+            payer=self.owner, parcel=self.parcel, amount=Decimal(amount), payment_type="tax",
+            payment_date=datetime.date(2024, 3, 1), status=status,
+        )
+
+    def balance(self):
+        balance = ParcelBalance.objects.get(pk=self.parcel.pk)
+        return balance.charged, balance.paid, balance.balance
+
+    def assertBalanced(self):
+        self.assertEqual(LedgerEntry.objects.aggregate(total=Sum("amount"))["total"], 0)
+
+    def test_paid_bill_is_charged_and_settled(self):
+        self.new_payment(status="paid")
+        self.assertEqual(self.balance(), (Decimal("100.00"), Decimal("100.00"), Decimal("0.00")))
+
+    def test_leaving_paid_reverses_the_payment(self):
+        payment = self.new_payment(status="paid")
+        payment.status = "pending"
+        payment.save()
+
+        self.assertEqual(self.balance(), (Decimal("100.00"), Decimal("0.00"), Decimal("100.00")))
+        self.assertTrue(LedgerTransaction.objects.filter(kind="payment_reversal").exists())
+        self.assertBalanced()
+
+    def test_amount_change_reverses_and_reposts(self):
+        payment = self.new_payment(status="paid")
+        payment.amount = Decimal("80.00")
+        payment.save()
+
+        self.assertEqual(self.balance(), (Decimal("80.00"), Decimal("80.00"), Decimal("0.00")))
+        self.assertEqual(
+            sorted(LedgerTransaction.objects.values_list("kind", flat=True)),
+            ["charge", "charge", "charge_reversal", "payment", "payment", "payment_reversal"],
+        )
+        self.assertEqual(folding.fold([payment]), 0)
+        self.assertBalanced()
+
+    def test_deleted_bill_is_reversed(self):
+        payment = self.new_payment()
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.delete()
+
+        self.assertEqual(self.balance(), (Decimal("0.00"), Decimal("0.00"), Decimal("0.00")))
+        self.assertBalanced()
+
+
+class BillingRunTests(TestCase):
+    period = "2026"
+    due_date = datetime.date(2026, 3, 31)
+
+    @classmethod
+    def setUpTestData(cls):
+        for number, tax in enumerate(("10.00", "20.00", "30.00"), 1):
+            LandParcel.objects.create(
+                location=f"Block {number}", area=100.0, land_use_type="Residential",
+                cadastral_number=f"CAD-{number}", registration_date="2024-01-15", annual_tax_value=Decimal(tax),
+            )
+
+    def bill(self):
+        return billing.run_billing(billing.start_or_resume(self.period, self.due_date), chunk_size=1)
+
+    def counters(self, run):
+        run.refresh_from_db()
+        return run.status, run.bills_created, run.bills_existing, run.amount_billed
+
+    def test_failed_run_resumes_after_its_checkpoint(self):
+        real_bill_chunk = billing.bill_chunk
+        calls = []
+
+        def crash_on_second_chunk(run, parcels):
+            calls.append(parcels[0][0])
+            if len(calls) == 2:
+                raise RuntimeError("worker killed")
+            return real_bill_chunk(run, parcels)
+
+        with mock.patch.object(billing, "bill_chunk", side_effect=crash_on_second_chunk), \
+                self.assertRaises(RuntimeError):
+            self.bill()
+        failed = BillingRun.objects.get()
+        self.assertEqual(self.counters(failed), ("failed", 1, 0, Decimal("10.00")))
+        self.assertEqual(Payment.objects.count(), 1)
+
+        resumed = self.bill()
+        self.assertEqual(resumed.pk, failed.pk)
+        self.assertEqual(self.counters(resumed), ("completed", 3, 0, Decimal("60.00")))
+        self.assertEqual(Payment.objects.count(), 3)
+        self.assertEqual(ParcelBalance.objects.aggregate(total=Sum("charged"))["total"], Decimal("60.00"))
+
+    def test_rerunning_a_period_bills_nothing_twice(self):
+        self.bill()
+        again = self.bill()
+        self.assertEqual(BillingRun.objects.count(), 2)
+        self.assertEqual(self.counters(again), ("completed", 0, 3, Decimal("0.00")))
+        self.assertEqual(Payment.objects.count(), 3)
+        self.assertEqual(ParcelBalance.objects.aggregate(total=Sum("charged"))["total"], Decimal("60.00"))
@@ -1,3 +1,69 @@
-from django.shortcuts import render
+# payments/views.py
+import datetime
 
-# Create your views here.
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from accounts.permissions import IsAdminOrOfficer
+from . import ledger
+from .models import BillingRun, LedgerTransaction, OwnerBalance, ParcelBalance
+from .serializers import (
+    BillingRunSerializer, LedgerTransactionSerializer, OwnerBalanceSerializer, ParcelBalanceSerializer,
+)
+
+
+class LedgerEntriesMixin:
+    """``entries`` action listing the ledger transactions behind a balance"""
+    ledger_filter = None
+
+    @action(detail=True, methods=["get"])
+    def entries(self, request, pk=None):
+        balance = self.get_object()
+        queryset = (LedgerTransaction.objects
+                    .filter(**{self.ledger_filter: balance.pk})
+                    .prefetch_related("entries")
+                    .order_by("-date", "-id"))
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(LedgerTransactionSerializer(page, many=True).data)
+
+
+class ParcelBalanceViewSet(LedgerEntriesMixin, viewsets.ReadOnlyModelViewSet):
+    """What each parcel owes, kept up to date by the ledger"""
+    queryset = ParcelBalance.objects.select_related("parcel").order_by("parcel_id")
+    serializer_class = ParcelBalanceSerializer
+    permission_classes = [IsAdminOrOfficer]
+    filterset_fields = {"balance": ["gte", "lte"]}
+    ledger_filter = "parcel_id"
+
+    @action(detail=False, methods=["get"])
+    def arrears(self, request):
+        """Parcels overdue for more than ?grace_days= days (default 0) as of ?as_of=, oldest first"""
+        try:
+            grace_days = int(request.query_params.get("grace_days", 0))
+            as_of = request.query_params.get("as_of")
+            as_of = datetime.date.fromisoformat(as_of) if as_of else None
+        except ValueError:
+            return Response(
+                {"error": "grace_days must be a number and as_of a YYYY-MM-DD date"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(ledger.arrears(as_of, grace_days).select_related("parcel"))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+class OwnerBalanceViewSet(LedgerEntriesMixin, viewsets.ReadOnlyModelViewSet):
+    """What each owner owes across their parcels"""
+    queryset = OwnerBalance.objects.select_related("owner").order_by("owner_id")
+    serializer_class = OwnerBalanceSerializer
+    permission_classes = [IsAdminOrOfficer]
+    filterset_fields = {"balance": ["gte", "lte"]}
+    ledger_filter = "owner_id"
+
+
+class BillingRunViewSet(viewsets.ReadOnlyModelViewSet):
+    """Tax billing runs with their progress and statistics"""
+    queryset = BillingRun.objects.all()
+    serializer_class = BillingRunSerializer
+    permission_classes = [IsAdminOrOfficer]
+    filterset_fields = ["period", "status"]
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RecordsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'records'
+
+    def ready(self):
+        from audit import versioning
+        versioning.register(self.get_model('OwnershipRecord'))
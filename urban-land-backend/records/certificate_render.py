@@ -0,0 +1,145 @@
+# records/certificate_render.py
+"""
+Pillow rendering of ownership and encumbrance certificates.
+
+Runs in the certificate process pool, so it only uses the plain data built
+by records.certificates and never touches Django.
+"""
+import io
+
+from PIL import Image, ImageDraw, ImageFont
+
+# A4 at 150 dpi
+DPI = 150
+PAGE_SIZE = (1240, 1754)
+MARGIN = 90
+LINE = 30
+TEXT_SIZE = 22
+HEADING_SIZE = 28
+TITLE_SIZE = 38
+INK = (20, 20, 20)
+MUTED = (110, 110, 110)
+RULE = (180, 180, 180)
+
+
+class Pages:
+    """Lays text out top to bottom, starting a new page when one is full"""
+
+    def __init__(self, footer):
+        self.footer = footer
+        self.fonts = {size: ImageFont.load_default(size) for size in (TEXT_SIZE, HEADING_SIZE, TITLE_SIZE)}
+        self.pages = []
+        self.new_page()
+
+    def new_page(self):
+        page = Image.new("RGB", PAGE_SIZE, "white")
+        self.pages.append(page)
+        self.draw = ImageDraw.Draw(page)
+        self.y = MARGIN
+
+    def ensure(self, height):
+        if self.y + height > PAGE_SIZE[1] - MARGIN - LINE:
+            self.new_page()
+
+    def text(self, value, size=TEXT_SIZE, fill=INK):
+        self.ensure(LINE)
+        self.draw.text((MARGIN, self.y), value, font=self.fonts[size], fill=fill)
+        self.y += max(LINE, size + 8)
+
+    def heading(self, value):
+        self.ensure(3 * LINE)
+        self.y += LINE // 2
+        self.text(value, HEADING_SIZE)
+        self.draw.line((MARGIN, self.y, PAGE_SIZE[0] - MARGIN, self.y), fill=RULE, width=2)
+        self.y += LINE // 2
+
+    def field(self, label, value):
+        self.ensure(LINE)
+        self.draw.text((MARGIN, self.y), f"{label}:", font=self.fonts[TEXT_SIZE], fill=MUTED)
+        self.draw.text((MARGIN + 380, self.y), value, font=self.fonts[TEXT_SIZE], fill=INK)
+        self.y += LINE
+
+    def table(self, columns, rows, empty):
+        """columns: [(title, x offset)]; rows: lists of strings"""
+        if not rows:
+            self.text(empty, fill=MUTED)
+            return
+        self.ensure(2 * LINE)
+        for title, offset in columns:
+            self.draw.text((MARGIN + offset, self.y), title, font=self.fonts[TEXT_SIZE], fill=MUTED)
+        self.y += LINE
+        for row in rows:
+            self.ensure(LINE)
+            for (_, offset), value in zip(columns, row):
+                self.draw.text((MARGIN + offset, self.y), value, font=self.fonts[TEXT_SIZE], fill=INK)
+            self.y += LINE
+
+    def finish(self):
+        for number, page in enumerate(self.pages, start=1):
+            draw = ImageDraw.Draw(page)
+            draw.text((MARGIN, PAGE_SIZE[1] - MARGIN),
+                      f"{self.footer}    Page {number} of {len(self.pages)}",
+                      font=self.fonts[TEXT_SIZE], fill=MUTED)
+        return self.pages
+
+
+def _value(value):
+    return "-" if value in (None, "") else str(value)
+
+
+def layout(data):
+    parcel = data["parcel"]
+    pages = Pages(f"Data version {data['version'][:12]}    Issued {data['issued']}")
+    pages.text("Ownership and Encumbrance Certificate", TITLE_SIZE)
+    pages.text(f"Parcel {parcel['parcel_id']} - cadastral number {parcel['cadastral_number']}", fill=MUTED)
+
+    pages.heading("Parcel")
+    for label, key in (
+        ("Location", "location"), ("Mouza", "mouza_name"), ("Survey / block / sector", "survey"),
+        ("Area", "area"), ("Land use", "land_use_type"), ("Zone", "land_use_zone"),
+        ("Development status", "development_status"), ("Status", "status"),
+        ("Registration number", "registration_number"), ("Registration date", "registration_date"),
+        ("Title deed number", "title_deed_number"),
+        ("Boundaries (N / E / S / W)", "boundaries"),
+    ):
+        pages.field(label, _value(parcel.get(key)))
+
+    pages.heading("Current owners")
+    pages.table(
+        [("Owner", 0), ("Type", 420), ("Share %", 620), ("Acquired", 760), ("Deed", 920)],
+        [[_value(row["owner"]), _value(row["ownership_type"]), _value(row["ownership_percentage"]),
+          _value(row["acquisition_date"]), _value(row["deed_number"])] for row in data["owners"]],
+        "No current owners recorded",
+    )
+
+    pages.heading("Encumbrances (mortgages and leases)")
+    pages.table(
+        [("Kind", 0), ("Holder", 160), ("Amount", 560), ("From", 760), ("Until", 920)],
+        [[row["kind"], _value(row["holder"]), _value(row["amount"]), _value(row["start_date"]),
+          _value(row["end_date"])] for row in data["encumbrances"]],
+        "No mortgages or leases recorded",
+    )
+
+    pages.heading("Verified documents")
+    pages.table(
+        [("Document", 0), ("Number", 360), ("Date", 620), ("Issued by", 780)],
+        [[_value(row["doc_type"]), _value(row["document_number"]), _value(row["document_date"]),
+          _value(row["issuing_authority"])] for row in data["documents"]],
+        "No verified documents",
+    )
+    return pages.finish()
+
+
+def render(data, output):
+    """The certificate for ``data`` as PDF or PNG bytes"""
+    pages = layout(data)
+    buffer = io.BytesIO()
+    if output == "pdf":
+        pages[0].save(buffer, "PDF", resolution=DPI, save_all=True, append_images=pages[1:])
+    else:
+        # PNG has no pages, so they are stacked into one tall image
+        sheet = Image.new("RGB", (PAGE_SIZE[0], PAGE_SIZE[1] * len(pages)), "white")
+        for number, page in enumerate(pages):
+            sheet.paste(page, (0, PAGE_SIZE[1] * number))
+        sheet.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
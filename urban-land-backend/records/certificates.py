@@ -0,0 +1,184 @@
+# records/certificates.py
+"""
+Ownership and encumbrance certificates for a parcel.
+
+certificate_data() gathers everything a certificate shows in three queries
+and stamps it with a data version: a hash of that data, of the issue date
+and of RENDER_VERSION. Rendered files are cached on disk as
+CERTIFICATE_DIR/<parcel>/<version>.<pdf|png>, so a certificate is rendered
+at most once a day per version and served from disk until the date rolls
+over or the parcel, its current ownership records or its verified
+documents change.
+
+Rendering (records.certificate_render) is CPU bound and runs in a process
+pool of CERTIFICATE_WORKERS processes; concurrent requests for the same
+uncached certificate in one process share a single render, also across a
+request that timed out waiting for it and its retry.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from land.models import LandParcel
+from .certificate_render import render
+from .models import Document, OwnershipRecord
+
+# Bump when the certificate layout changes so cached files are re-rendered
+RENDER_VERSION = 1
+OUTPUTS = {"pdf": "application/pdf", "png": "image/png"}
+ENCUMBRANCE_TYPES = {"Mortgage": "Mortgage", "Leasehold": "Lease"}
+
+_pool = None
+_lock = threading.RLock()
+_rendering = {}
+
+
+def _name(first, middle, last):
+    return " ".join(part for part in (first, middle, last) if part)
+
+
+def certificate_data(parcel_id, issued=None):
+    """Plain, JSON-serializable certificate contents issued on ``issued`` (today), or None for an unknown parcel"""
+    parcel = (LandParcel.objects.filter(pk=parcel_id)
+              .values("parcel_id", "cadastral_number", "location", "mouza_name", "survey_number",
+                      "block_number", "sector_number", "area", "land_use_type", "land_use_zone",
+                      "development_status", "status", "registration_number", "registration_date",
+                      "title_deed_number", "in_north", "in_east", "in_south", "in_west")
+              .first())
+    if parcel is None:
+        return None
+    parcel["survey"] = " / ".join(parcel.pop(key) or "-" for key in ("survey_number", "block_number", "sector_number"))
+    parcel["boundaries"] = " / ".join(parcel.pop(key) or "-" for key in ("in_north", "in_east", "in_south", "in_west"))
+
+    owners, encumbrances = [], []
+    records = (OwnershipRecord.objects
+               .filter(parcel_id=parcel_id, is_current_owner=True)
+               .order_by("-ownership_percentage", "pk")
+               .values("ownership_type", "ownership_percentage", "acquisition_date", "deed_number",
+                       "start_date", "end_date", "lease_amount", "mortgage_amount", "mortgagee_name",
+                       "owner__first_name", "owner__middle_name", "owner__last_name"))
+    for record in records:
+        owner = _name(record["owner__first_name"], record["owner__middle_name"], record["owner__last_name"])
+        kind = ENCUMBRANCE_TYPES.get(record["ownership_type"])
+        if kind is None:
+            owners.append({
+                "owner": owner,
+                "ownership_type": record["ownership_type"],
+                "ownership_percentage": record["ownership_percentage"],
+                "acquisition_date": record["acquisition_date"],
+                "deed_number": record["deed_number"],
+            })
+        if kind or record["mortgage_amount"]:
+            mortgage = kind != "Lease"
+            encumbrances.append({
+                "kind": "Mortgage" if mortgage else "Lease",
+                "holder": (record["mortgagee_name"] or owner) if mortgage else owner,
+                "amount": record["mortgage_amount"] if mortgage else record["lease_amount"],
+                "start_date": record["start_date"],
+                "end_date": record["end_date"],
+            })
+
+    documents = list(Document.objects
+                     .filter(is_verified=True)
+                     .filter(Q(related_parcel_id=parcel_id) | Q(ownership_record__parcel_id=parcel_id))
+                     .order_by("doc_type", "document_date", "pk")
+                     .values("doc_type", "document_number", "document_date", "issuing_authority"))
+    labels = dict(Document.DOCUMENT_TYPES)
+    for document in documents:
+        document["doc_type"] = labels.get(document["doc_type"], document["doc_type"])
+
+    # Round-trip through JSON so the data hashes and pickles the same everywhere
+    data = json.loads(json.dumps(
+        {"parcel": parcel, "owners": owners, "encumbrances": encumbrances, "documents": documents,
+         "issued": issued or timezone.localdate()},
+        sort_keys=True, default=str,
+    ))
+    canonical = json.dumps([RENDER_VERSION, data], sort_keys=True)
+    data["version"] = hashlib.sha256(canonical.encode()).hexdigest()
+    return data
+
+
+def cache_path(parcel_id, version, output):
+    return os.path.join(settings.CERTIFICATE_DIR, str(parcel_id), f"{version}.{output}")
+
+
+def _executor():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.CERTIFICATE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _store(path, content):
+    """Write atomically and drop the parcel's older versions of the same output"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "wb") as file:
+        file.write(content)
+    os.replace(temporary, path)
+    extension = os.path.splitext(path)[1]
+    for name in os.listdir(directory):
+        other = os.path.join(directory, name)
+        if name.endswith(extension) and other != path:
+            try:
+                os.remove(other)
+            except FileNotFoundError:
+                pass
+
+
+def _finished(path, future):
+    """Done callback: store the render even if every waiter timed out, and forget it"""
+    global _pool
+    with _lock:
+        if _rendering.get(path) is future:
+            del _rendering[path]
+    if future.cancelled():
+        return
+    if isinstance(future.exception(), BrokenProcessPool):
+        with _lock:
+            _pool = None
+    elif future.exception() is None and not os.path.exists(path):
+        _store(path, future.result())
+
+
+def certificate(parcel_id, output="pdf", data=None):
+    """
+    (open file, version) of the parcel's current certificate, rendering it
+    if it is not cached; None for an unknown parcel. Pass ``data`` when
+    certificate_data() was already called. Raises TimeoutError when the
+    render takes longer than CERTIFICATE_TIMEOUT; it keeps running and the
+    next request for it waits on the same render.
+    """
+    data = data or certificate_data(parcel_id)
+    if data is None:
+        return None
+    path = cache_path(parcel_id, data["version"], output)
+    try:
+        return open(path, "rb"), data["version"]
+    except FileNotFoundError:
+        pass
+
+    with _lock:
+        future = _rendering.get(path)
+        if future is None:
+            future = _rendering[path] = _executor().submit(render, data, output)
+            future.add_done_callback(lambda done: _finished(path, done))
+    content = future.result(timeout=settings.CERTIFICATE_TIMEOUT)
+    # The done callback may not have stored it yet; the replace is atomic and idempotent
+    if not os.path.exists(path):
+        _store(path, content)
+    return open(path, "rb"), data["version"]
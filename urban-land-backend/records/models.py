@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from land.models import LandParcel
 from owners.models import OwnerProfile
 from accounts.models import User
+from audit.versioning import VersionedQuerySet
 
 class OwnershipRecord(models.Model):
     OWNERSHIP_TYPES = [
@@ -156,6 +157,8 @@ class OwnershipRecord(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     history_notes = models.TextField(blank=True, null=True)
     
+    objects = VersionedQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-acquisition_date']
         indexes = [
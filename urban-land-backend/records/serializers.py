@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import OwnershipRecord, Document
-from owners.serializers import OwnerProfileSerializer
-from land.serializers import LandParcelSerializer
+from core.lean import SKIP, LeanSerializer
+from owners.serializers import OwnerProfileLeanSerializer, OwnerProfileSerializer
+from land.serializers import LandParcelLeanSerializer, LandParcelSerializer
 
 class OwnershipRecordSerializer(serializers.ModelSerializer):
     # Computed fields
@@ -46,6 +47,35 @@ class OwnershipRecordSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class OwnershipRecordLeanSerializer(LeanSerializer):
+    """OwnershipRecordSerializer output for list pages, from values() rows"""
+    serializer_class = OwnershipRecordSerializer
+    extra_lookups = ('owner_id', 'parcel_id')
+
+    def prepare(self, rows):
+        return (
+            OwnerProfileLeanSerializer(self.context).render_by_pk(row['owner_id'] for row in rows),
+            LandParcelLeanSerializer(self.context).render_by_pk(row['parcel_id'] for row in rows),
+        )
+
+    def compute(self, name, row, prepared):
+        owners, parcels = prepared
+        if name == 'owner':
+            return owners[row['owner_id']]
+        if name == 'parcel':
+            return parcels[row['parcel_id']]
+        if name == 'username':
+            # OwnerProfile has no username, so the DRF serializer skips this field
+            return SKIP
+        if name == 'duration_days':
+            if row['transfer_date']:
+                return (row['transfer_date'] - row['acquisition_date']).days
+            return None
+        if name == 'is_active':
+            return row['is_current_owner'] and row['verification_status'] == 'Verified'
+        return super().compute(name, row, prepared)
+
+
 class DocumentSerializer(serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(
         source='uploaded_by.get_full_name', 
@@ -1,3 +1,109 @@
-from django.test import TestCase
+import datetime
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from . import certificates
+from .models import OwnershipRecord
+
+
+class CertificateVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+
+    def test_issue_date_is_part_of_the_version(self):
+        monday, tuesday = datetime.date(2026, 10, 19), datetime.date(2026, 10, 20)
+        first = certificates.certificate_data(self.parcel.pk, issued=monday)
+        again = certificates.certificate_data(self.parcel.pk, issued=monday)
+        later = certificates.certificate_data(self.parcel.pk, issued=tuesday)
+
+        self.assertEqual(first["issued"], "2026-10-19")
+        self.assertEqual(first["version"], again["version"])
+        self.assertNotEqual(first["version"], later["version"])
+
+
+class CertificateEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        cls.owner = OwnerProfile.objects.create(
+            user=User.objects.create_user("owner", password="x"), national_id="N-1",
+            first_name="A", last_name="B", gender="Other",
+        )
+        cls.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def setUp(self):
+        override = override_settings(CERTIFICATE_DIR=tempfile.mkdtemp(), CERTIFICATE_TIMEOUT=5)
+        override.enable()
+        self.addCleanup(override.disable)
+        # Render in a thread instead of spawning worker processes
+        pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown)
+        self.executor = mock.Mock(wraps=pool)
+        patcher = mock.patch.object(certificates, "_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = APIClient()
+        self.api.force_authenticate(self.officer)
+
+    def get(self, **headers):
+        return self.api.get(f"/api/parcels/{self.parcel.pk}/certificate/", {"output": "png"}, **headers)
+
+    def cached_files(self):
+        return os.listdir(os.path.join(settings.CERTIFICATE_DIR, str(self.parcel.pk)))
+
+    def test_rendered_once_then_served_from_disk(self):
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        body = b"".join(first.streaming_content)
+        second = self.get()
+        self.assertEqual(b"".join(second.streaming_content), body)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(self.executor.submit.call_count, 1)
+
+    def test_matching_etag_is_answered_without_rendering(self):
+        version = certificates.certificate_data(self.parcel.pk)["version"]
+        with mock.patch.object(certificates, "certificate") as render:
+            response = self.get(HTTP_IF_NONE_MATCH=f'"{version}"')
+        self.assertEqual(response.status_code, 304)
+        render.assert_not_called()
+
+    def test_ownership_change_renders_a_new_version(self):
+        before = self.get()["ETag"]
+        OwnershipRecord.objects.create(
+            parcel=self.parcel, owner=self.owner, ownership_percentage=100,
+            acquisition_date=datetime.date(2021, 3, 4), is_current_owner=True,
+        )
+        after = self.get()
+        self.assertNotEqual(after["ETag"], before)
+        self.assertEqual(self.executor.submit.call_count, 2)
+        self.assertEqual(self.cached_files(), [f"{after['ETag'].strip(chr(34))}.png"])
+
+    def test_slow_render_is_503_and_shared_with_the_retry(self):
+        pending = Future()
+        self.executor.submit.side_effect = lambda *args: pending
+        with override_settings(CERTIFICATE_TIMEOUT=0.01):
+            self.assertEqual(self.get().status_code, 503)
+            self.assertEqual(self.get().status_code, 503)
+        self.assertEqual(self.executor.submit.call_count, 1)
+
+        pending.set_result(b"rendered")
+        self.assertFalse(certificates._rendering)
+        response = self.get()
+        self.assertEqual(b"".join(response.streaming_content), b"rendered")
+        self.assertEqual(self.executor.submit.call_count, 1)
@@ -4,12 +4,21 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from .models import OwnershipRecord, Document
-from .serializers import OwnershipRecordSerializer, DocumentSerializer
+from .serializers import OwnershipRecordLeanSerializer, OwnershipRecordSerializer, DocumentSerializer
 from accounts.permissions import IsAdminOrOfficer
+from audit.views import VersionHistoryMixin
+from core.lean import LeanListMixin
+from core.response_cache import CachedRetrieveMixin
 
-class OwnershipRecordViewSet(viewsets.ModelViewSet):
+class OwnershipRecordViewSet(LeanListMixin, CachedRetrieveMixin, VersionHistoryMixin, viewsets.ModelViewSet):
     serializer_class = OwnershipRecordSerializer
+    lean_serializer_class = OwnershipRecordLeanSerializer
     permission_classes = [IsAdminOrOfficer]
+    cache_label = 'ownershiprecord'
+
+    def cache_dependencies(self, obj):
+        # The response nests the full owner and parcel representations
+        return [(self.cache_label, obj.pk), ('owner', obj.owner_id), ('parcel', obj.parcel_id)]
     
     def get_queryset(self):
         queryset = OwnershipRecord.objects.all()
@@ -0,0 +1,20 @@
+# transactions/filters.py
+import django_filters
+from django.db.models import Q
+
+from .models import LandTransaction
+
+
+class LandTransactionFilter(django_filters.FilterSet):
+    """Filter by parcel, party (buyer or seller), type, status and date range"""
+    party = django_filters.NumberFilter(method="filter_party", label="Buyer or seller owner id")
+    date_from = django_filters.DateFilter(field_name="transaction_date", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="transaction_date", lookup_expr="lte")
+
+    class Meta:
+        model = LandTransaction
+        fields = ["parcel", "buyer", "seller", "transaction_type", "status"]
+
+    def filter_party(self, queryset, name, value):
+        # OR of two indexed lookups (buyer, date) and (seller, date)
+        return queryset.filter(Q(buyer_id=value) | Q(seller_id=value))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('land', '0001_initial'),
+        ('owners', '0002_ownerprofile_id_card_back_ownerprofile_id_card_front_and_more'),
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='period',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(fields=('parcel', 'payment_type', 'period'), name='unique_bill_per_period'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('land', '0001_initial'),
+        ('owners', '0002_ownerprofile_id_card_back_ownerprofile_id_card_front_and_more'),
+        ('transactions', '0002_payment_period_payment_unique_bill_per_period'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='landtransaction',
+            index=models.Index(fields=['transaction_date', 'id'], name='landtx_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='landtransaction',
+            index=models.Index(fields=['parcel', 'transaction_date'], name='landtx_parcel_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='landtransaction',
+            index=models.Index(fields=['buyer', 'transaction_date'], name='landtx_buyer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='landtransaction',
+            index=models.Index(fields=['seller', 'transaction_date'], name='landtx_seller_date_idx'),
+        ),
+    ]
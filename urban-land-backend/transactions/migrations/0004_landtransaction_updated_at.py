@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_landtransaction_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='landtransaction',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
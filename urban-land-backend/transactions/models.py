@@ -17,6 +17,16 @@ class LandTransaction(models.Model):
     transaction_date = models.DateField()
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     status = models.CharField(max_length=50, default="pending")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination of the list
+            models.Index(fields=["transaction_date", "id"], name="landtx_date_idx"),
+            models.Index(fields=["parcel", "transaction_date"], name="landtx_parcel_date_idx"),
+            models.Index(fields=["buyer", "transaction_date"], name="landtx_buyer_date_idx"),
+            models.Index(fields=["seller", "transaction_date"], name="landtx_seller_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.parcel.parcel_id} - {self.transaction_type}"
@@ -35,6 +45,16 @@ class Payment(models.Model):
     payment_type = models.CharField(max_length=50, choices=PAYMENT_TYPES)
     payment_date = models.DateField()
     status = models.CharField(max_length=50, default="paid")
+    # Billing period of generated bills, e.g. "2026"; one bill per parcel, type and period
+    period = models.CharField(max_length=20, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["parcel", "payment_type", "period"],
+                name="unique_bill_per_period",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.payer} - {self.amount}"
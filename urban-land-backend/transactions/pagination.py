@@ -0,0 +1,18 @@
+# transactions/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class TransactionCursorPagination(CursorPagination):
+    """
+    Keyset pagination, newest first. Each page continues from the last
+    (transaction_date, id) seen instead of counting and skipping rows, so
+    deep pages cost the same as the first one.
+    """
+    ordering = ("-transaction_date", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class TimelineCursorPagination(TransactionCursorPagination):
+    """The same keyset pagination, oldest first, for a parcel's timeline"""
+    ordering = ("transaction_date", "id")
@@ -2,6 +2,10 @@ from rest_framework import serializers
 from .models import LandTransaction, Payment
 
 class LandTransactionSerializer(serializers.ModelSerializer):
+    cadastral_number = serializers.CharField(source="parcel.cadastral_number", read_only=True)
+    buyer_name = serializers.StringRelatedField(source="buyer", read_only=True)
+    seller_name = serializers.StringRelatedField(source="seller", read_only=True)
+
     class Meta:
         model = LandTransaction
         fields = "__all__"
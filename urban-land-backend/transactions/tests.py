@@ -1,3 +1,85 @@
+import datetime
+from decimal import Decimal
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from land.models import LandParcel
+from owners.models import OwnerProfile
+from .models import LandTransaction
+
+
+class LandTransactionListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel, cls.other_parcel = (
+            LandParcel.objects.create(
+                location=f"Block {number}", area=100.0, land_use_type="Residential",
+                cadastral_number=f"CAD-{number}", registration_date="2024-01-15",
+            )
+            for number in (1, 2)
+        )
+        cls.buyer, cls.seller = (
+            OwnerProfile.objects.create(
+                user=User.objects.create_user(name, password="x"), national_id=f"N-{name}",
+                first_name=name, last_name="B", gender="Other",
+            )
+            for name in ("buyer", "seller")
+        )
+        # Five transactions on one day, so pages split inside a tie on the date
+        same_day = datetime.date(2026, 5, 1)
+        cls.tied = [cls.transaction(same_day) for _ in range(5)]
+        cls.sale = cls.transaction(datetime.date(2026, 1, 10), buyer=cls.buyer)
+        cls.sold = cls.transaction(datetime.date(2025, 6, 1), seller=cls.buyer, transaction_type="lease")
+        cls.elsewhere = cls.transaction(datetime.date(2026, 2, 1), parcel=cls.other_parcel, seller=cls.seller)
+
+    @classmethod
+    def transaction(cls, date, parcel=None, transaction_type="sale", **parties):
+        return LandTransaction.objects.create(
+            parcel=parcel or cls.parcel, transaction_type=transaction_type, transaction_date=date,
+            amount=Decimal("1000.00"), status="completed", **parties,
+        )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(User.objects.create_user("officer", password="x", role="officer"))
+
+    def ids(self, path, **params):
+        response = self.api.get(path, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["id"] for row in response.data["results"]]
+
+    def walk(self, path, **params):
+        """Every page's ids, following the next cursor"""
+        pages = []
+        response = self.api.get(path, {**params, "page_size": 2})
+        while True:
+            pages.append([row["id"] for row in response.data["results"]])
+            if not response.data["next"]:
+                return pages
+            response = self.api.get(response.data["next"])
+
+    def test_filters(self):
+        path = "/api/transactions/"
+        self.assertEqual(set(self.ids(path, party=self.buyer.pk)), {self.sale.pk, self.sold.pk})
+        self.assertEqual(self.ids(path, seller=self.seller.pk), [self.elsewhere.pk])
+        self.assertEqual(self.ids(path, transaction_type="lease"), [self.sold.pk])
+        self.assertEqual(self.ids(path, date_from="2026-01-01", date_to="2026-01-31"), [self.sale.pk])
+        self.assertEqual(self.ids(path, parcel=self.other_parcel.pk), [self.elsewhere.pk])
+
+    def test_cursor_pages_are_stable_across_ties(self):
+        pages = self.walk("/api/transactions/", parcel=self.parcel.pk)
+        ids = [pk for page in pages for pk in page]
+        tied = sorted((row.pk for row in self.tied), reverse=True)
+        self.assertEqual(ids, tied + [self.sale.pk, self.sold.pk])
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+    def test_timeline_is_paginated_oldest_first(self):
+        path = f"/api/transactions/parcel/{self.parcel.pk}/"
+        response = self.api.get(path, {"page_size": 2})
+        self.assertEqual(response.data["parcel"], self.parcel.pk)
 
-# Create your tests here.
+        ids = [pk for page in self.walk(path) for pk in page]
+        self.assertEqual(ids, [self.sold.pk, self.sale.pk] + [row.pk for row in self.tied])
+        self.assertEqual(self.ids(path, transaction_type="lease"), [self.sold.pk])
@@ -1,13 +1,34 @@
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .filters import LandTransactionFilter
 from .models import LandTransaction, Payment
+from .pagination import TimelineCursorPagination, TransactionCursorPagination
 from .serializers import LandTransactionSerializer, PaymentSerializer
 from accounts.permissions import IsAdminOrOfficer
 
 class LandTransactionViewSet(viewsets.ModelViewSet):
-    queryset = LandTransaction.objects.all()
+    queryset = LandTransaction.objects.select_related("parcel", "buyer", "seller")
     serializer_class = LandTransactionSerializer
     permission_classes = [IsAdminOrOfficer]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LandTransactionFilter
+    pagination_class = TransactionCursorPagination
 
+    @action(detail=False, methods=["get"], url_path=r"parcel/(?P<parcel_id>\d+)",
+            pagination_class=TimelineCursorPagination)
+    def timeline(self, request, parcel_id=None):
+        """
+        Every transaction of one parcel, oldest first and cursor-paginated,
+        in one range scan of the (parcel, transaction_date) index. Accepts
+        the same filters as the list.
+        """
+        queryset = self.filter_queryset(self.get_queryset().filter(parcel_id=parcel_id))
+        page = self.paginate_queryset(queryset)
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response.data["parcel"] = int(parcel_id)
+        return response
 
 class PaymentViewSet(viewsets.ModelViewSet):
     queryset = Payment.objects.all()
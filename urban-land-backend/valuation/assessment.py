@@ -0,0 +1,223 @@
+# valuation/assessment.py
+"""
+Batch tax assessment of LandParcel.annual_tax_value.
+
+Parcels are read in primary-key chunks into NumPy arrays, the rate table is
+turned into lookup matrices indexed by (zone, development status), and the
+tax of a whole chunk is computed with array arithmetic. Changed values are
+written back with one bulk_update per chunk, so a re-assessment costs a few
+queries per CHUNK_SIZE parcels instead of a save() per parcel.
+"""
+import heapq
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from land.models import LandParcel
+from .models import TaxRateTable
+
+CHUNK_SIZE = 5000
+# Index 0 stands for "blank": a rate for any zone/status, or a parcel without one
+ZONES = [None] + [zone for zone, _ in LandParcel.LAND_USE_ZONE_CHOICES]
+STATUSES = [None] + [status for status, _ in LandParcel.DEVELOPMENT_STATUS_CHOICES]
+ZONE_CODES = {zone: code for code, zone in enumerate(ZONES)}
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+COLUMNS = ('parcel_id', 'area', 'land_use_zone', 'development_status', 'has_structures',
+           'current_market_value', 'annual_tax_value')
+LARGEST_CHANGES = 10
+CENT = Decimal('0.01')
+
+
+def current_table(date=None):
+    """The newest rate table in effect on ``date`` (today by default)"""
+    date = date or timezone.localdate()
+    return TaxRateTable.objects.filter(effective_from__lte=date).order_by('-version').first()
+
+
+class RateMatrix:
+    """A rate table as arrays indexed by [zone code, status code]"""
+
+    def __init__(self, table):
+        shape = (len(ZONES), len(STATUSES))
+        self.value_rate = np.zeros(shape)
+        self.area_rate = np.zeros(shape)
+        self.surcharge = np.zeros(shape)
+        self.minimum = np.zeros(shape)
+        self.rated = np.zeros(shape, dtype=bool)
+
+        rates = {
+            (ZONE_CODES.get(rate.land_use_zone or None), STATUS_CODES.get(rate.development_status or None)): rate
+            for rate in table.rates.all()
+        }
+        for zone in range(len(ZONES)):
+            for status in range(len(STATUSES)):
+                # Most specific first: exact, zone only, status only, catch-all
+                for key in ((zone, status), (zone, 0), (0, status), (0, 0)):
+                    rate = rates.get(key)
+                    if rate is not None:
+                        self.value_rate[zone, status] = rate.value_rate
+                        self.area_rate[zone, status] = rate.area_rate
+                        self.surcharge[zone, status] = rate.structure_surcharge
+                        self.minimum[zone, status] = rate.minimum_tax
+                        self.rated[zone, status] = True
+                        break
+
+    def assess(self, chunk):
+        """Tax per parcel of a chunk, rounded to cents half up; NaN where no rate applies"""
+        index = (chunk['zone'], chunk['status'])
+        market = np.nan_to_num(chunk['market_value'])
+        tax = market * self.value_rate[index] + chunk['area'] * self.area_rate[index]
+        tax *= 1 + self.surcharge[index] * chunk['has_structures']
+        tax = np.maximum(tax, self.minimum[index])
+        # np.round rounds halves to even; taxes are never negative, so
+        # floor(x + 0.5) is half up. Rounding to 1e-6 cents first drops the
+        # float noise that would push 12.5 cents down to 12.4999...
+        tax = np.floor(np.round(tax * 100, 6) + 0.5) / 100
+        tax[~self.rated[index]] = np.nan
+        return tax
+
+
+def to_cents(value):
+    """A float amount as exact Decimal cents, for writing"""
+    return Decimal(f"{value:.6f}").quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _decimal_column(values):
+    return np.fromiter((np.nan if value is None else float(value) for value in values), float, len(values))
+
+
+def load_chunk(rows):
+    """Turn ``values_list(*COLUMNS)`` rows into column arrays"""
+    pks, area, zone, status, structures, market, tax = zip(*rows)
+    return {
+        'pk': np.array(pks, dtype=np.int64),
+        'area': np.nan_to_num(np.array(area, dtype=float)),
+        'zone': np.fromiter((ZONE_CODES.get(value, 0) for value in zone), np.int64, len(rows)),
+        'status': np.fromiter((STATUS_CODES.get(value, 0) for value in status), np.int64, len(rows)),
+        'has_structures': np.array(structures, dtype=bool),
+        'market_value': _decimal_column(market),
+        'annual_tax_value': _decimal_column(tax),
+    }
+
+
+def iter_chunks(queryset, chunk_size):
+    """Keyset-paginate parcels by primary key"""
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list(*COLUMNS)[:chunk_size])
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        yield load_chunk(rows)
+
+
+class AssessmentReport:
+    """Totals, per-zone breakdown and largest changes of one assessment"""
+
+    def __init__(self, table, dry_run):
+        self.table = table
+        self.dry_run = dry_run
+        self.parcels = 0
+        self.changed = 0
+        self.unrated = 0
+        self.total_before = 0.0
+        self.total_after = 0.0
+        self.zones = {}
+        self._largest = []
+
+    def add(self, chunk, new, changed):
+        rated = ~np.isnan(new)
+        old = np.nan_to_num(chunk['annual_tax_value'])
+        after = np.where(rated, new, old)
+        self.parcels += len(new)
+        self.unrated += int((~rated).sum())
+        self.changed += int(changed.sum())
+        self.total_before += float(old.sum())
+        self.total_after += float(after.sum())
+
+        for code in np.unique(chunk['zone']):
+            in_zone = chunk['zone'] == code
+            stats = self.zones.setdefault(ZONES[code] or 'Unzoned', {
+                'parcels': 0, 'changed': 0, 'total_before': 0.0, 'total_after': 0.0,
+            })
+            stats['parcels'] += int(in_zone.sum())
+            stats['changed'] += int((in_zone & changed).sum())
+            stats['total_before'] += float(old[in_zone].sum())
+            stats['total_after'] += float(after[in_zone].sum())
+
+        delta = np.abs(after - old)
+        for position in np.flatnonzero(changed)[np.argsort(-delta[changed])[:LARGEST_CHANGES]]:
+            item = (float(delta[position]), int(chunk['pk'][position]),
+                    float(chunk['annual_tax_value'][position]), float(new[position]))
+            if len(self._largest) < LARGEST_CHANGES:
+                heapq.heappush(self._largest, item)
+            else:
+                heapq.heappushpop(self._largest, item)
+
+    @property
+    def largest_changes(self):
+        return [
+            {'parcel_id': pk, 'before': None if np.isnan(before) else round(before, 2), 'after': after}
+            for _, pk, before, after in sorted(self._largest, reverse=True)
+        ]
+
+    def as_dict(self):
+        return {
+            'rate_table': self.table.version,
+            'dry_run': self.dry_run,
+            'parcels': self.parcels,
+            'changed': self.changed,
+            'unrated': self.unrated,
+            'total_before': round(self.total_before, 2),
+            'total_after': round(self.total_after, 2),
+            'zones': {
+                zone: {**stats, 'total_before': round(stats['total_before'], 2),
+                       'total_after': round(stats['total_after'], 2)}
+                for zone, stats in sorted(self.zones.items())
+            },
+            'largest_changes': self.largest_changes,
+        }
+
+
+def update_parcels(field, values):
+    """Write {parcel pk: value} to one LandParcel column in a single transaction"""
+    parcels = [LandParcel(parcel_id=pk, **{field: value}) for pk, value in values.items()]
+    with transaction.atomic():
+        # land.signals stamps last_updated on the bulk_saved this sends
+        LandParcel.objects.bulk_update(parcels, [field])
+
+
+def assess(table, queryset=None, dry_run=False, chunk_size=CHUNK_SIZE, diff=None, progress=None):
+    """
+    Recompute annual_tax_value for ``queryset`` (all parcels by default)
+    with ``table``. Only parcels whose value changes are written, each chunk
+    in its own transaction. ``diff`` is an optional csv.writer that receives
+    one row per changed parcel; ``progress`` is called with the running
+    parcel count after each chunk.
+    """
+    matrix = RateMatrix(table)
+    report = AssessmentReport(table, dry_run)
+    queryset = LandParcel.objects.all() if queryset is None else queryset
+
+    for chunk in iter_chunks(queryset, chunk_size):
+        new = matrix.assess(chunk)
+        old = chunk['annual_tax_value']
+        rated = ~np.isnan(new)
+        changed = rated & (np.isnan(old) | (np.abs(new - np.nan_to_num(old)) >= 0.005))
+        report.add(chunk, new, changed)
+
+        positions = np.flatnonzero(changed)
+        if diff is not None:
+            for position in positions:
+                before = old[position]
+                diff.writerow([int(chunk['pk'][position]),
+                               '' if np.isnan(before) else f"{before:.2f}", to_cents(new[position])])
+        if not dry_run and len(positions):
+            update_parcels('annual_tax_value', {
+                int(chunk['pk'][position]): to_cents(new[position]) for position in positions
+            })
+        if progress:
+            progress(report.parcels)
+    return report
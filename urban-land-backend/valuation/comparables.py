@@ -0,0 +1,251 @@
+# valuation/comparables.py
+"""
+Automated parcel valuation from comparable sales.
+
+Sales evidence is every completed LandTransaction sale plus purchase and
+auction OwnershipRecords with an acquisition value (one sale per parcel and
+date). For each land use zone the median price per area over the
+valuation window is stored in PriceAggregate, per mouza and for the whole
+zone. A parcel is valued at its area times the mouza median when the mouza
+has MIN_COMPARABLES sales, otherwise the zone median.
+
+Each zone's aggregate row keeps a fingerprint of the sales and parcels it
+was computed from, so a re-run only recomputes and revalues the zones
+whose evidence changed. Edits are caught by the newest updated_at /
+last_updated, so apply() (which stamps the parcels it writes) makes the
+next run recompute those zones once more.
+"""
+import datetime
+import hashlib
+from decimal import Decimal
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from land.models import LandParcel
+from records.models import OwnershipRecord
+from transactions.models import LandTransaction
+from .assessment import update_parcels
+from .models import ParcelValuation, PriceAggregate
+
+WINDOW_QUARTERS = 8
+MIN_COMPARABLES = 5
+# Confidence multiplier for estimates that fall back to zone-wide comparables
+ZONE_LEVEL_CONFIDENCE = 0.6
+SALE_ACQUISITIONS = ('Purchase', 'Auction')
+CHUNK_SIZE = 5000
+ZONES = [zone for zone, _ in LandParcel.LAND_USE_ZONE_CHOICES]
+
+
+def quarter_start(date):
+    return date.replace(month=3 * ((date.month - 1) // 3) + 1, day=1)
+
+
+def add_quarters(date, quarters):
+    months = date.year * 12 + date.month - 1 + 3 * quarters
+    return date.replace(year=months // 12, month=months % 12 + 1)
+
+
+def valuation_window(as_of=None, quarters=WINDOW_QUARTERS):
+    """The ``quarters`` calendar quarters up to and including as_of's quarter"""
+    current = quarter_start(as_of or timezone.localdate())
+    return add_quarters(current, 1 - quarters), add_quarters(current, 1) - datetime.timedelta(days=1)
+
+
+def transaction_sales():
+    return LandTransaction.objects.filter(transaction_type='sale', status='completed', amount__gt=0)
+
+
+def recorded_purchases():
+    return OwnershipRecord.objects.filter(acquisition_type__in=SALE_ACQUISITIONS, acquisition_value__gt=0)
+
+
+def sales(start=None, end=None, **parcel_filters):
+    """
+    Sales in [start, end] (all of them when no range is given) as
+    {(parcel_id, date): (price, area, zone, mouza)}. A recorded transaction
+    wins over the ownership record of the same sale.
+    """
+    lookups = {f'parcel__{key}': value for key, value in parcel_filters.items()}
+    purchases, transactions = recorded_purchases(), transaction_sales()
+    if start is not None:
+        purchases = purchases.filter(acquisition_date__range=(start, end))
+        transactions = transactions.filter(transaction_date__range=(start, end))
+    found = {}
+    rows = (purchases
+            .filter(parcel__area__gt=0, **lookups)
+            .values_list('parcel_id', 'acquisition_date', 'acquisition_value',
+                         'parcel__area', 'parcel__land_use_zone', 'parcel__mouza_name'))
+    for parcel_id, date, price, *rest in rows.iterator(chunk_size=CHUNK_SIZE):
+        found[(parcel_id, date)] = (price, *rest)
+    rows = (transactions
+            .filter(parcel__area__gt=0, **lookups)
+            .values_list('parcel_id', 'transaction_date', 'amount',
+                         'parcel__area', 'parcel__land_use_zone', 'parcel__mouza_name'))
+    for parcel_id, date, price, *rest in rows.iterator(chunk_size=CHUNK_SIZE):
+        found[(parcel_id, date)] = (price, *rest)
+    return found
+
+
+def fingerprints(start, end):
+    """Per zone, a hash of the sales in the window and of the zone's parcels"""
+    parts = {zone: [f'{start}:{end}'] for zone in ZONES}
+    sources = [
+        (transaction_sales().filter(transaction_date__range=(start, end)), 'amount'),
+        (recorded_purchases().filter(acquisition_date__range=(start, end)), 'acquisition_value'),
+    ]
+    for queryset, amount in sources:
+        rows = (queryset.values('parcel__land_use_zone')
+                .annotate(count=Count('pk'), last=Max('pk'), total=Sum(amount), edited=Max('updated_at'))
+                .values_list('parcel__land_use_zone', 'count', 'last', 'total', 'edited'))
+        for zone, *stats in rows:
+            if zone in parts:
+                parts[zone].append(f'{queryset.model.__name__}:{stats}')
+    rows = (LandParcel.objects.values('land_use_zone')
+            .annotate(count=Count('pk'), last=Max('pk'), area=Sum('area'), edited=Max('last_updated'))
+            .values_list('land_use_zone', 'count', 'last', 'area', 'edited'))
+    for zone, *stats in rows:
+        if zone in parts:
+            parts[zone].append(f'parcels:{stats}')
+    return {zone: hashlib.sha1('|'.join(values).encode()).hexdigest() for zone, values in parts.items()}
+
+
+def summarize(prices_per_area):
+    """(sales, median price per area, dispersion of log price per area)"""
+    logs = np.log(prices_per_area)
+    return len(prices_per_area), float(np.median(prices_per_area)), float(logs.std()) if len(logs) > 1 else 0.0
+
+
+def rebuild_aggregates(zone, start, end, fingerprint):
+    """Recompute and store the zone's PriceAggregate rows; returns them by mouza ('' for the zone)"""
+    evidence = sales(start, end, land_use_zone=zone)
+    mouzas = np.array([mouza or '' for _, _, _, mouza in evidence.values()], dtype=object)
+    prices = np.array([float(price) / area for price, area, _, _ in evidence.values()])
+
+    summaries = {'': summarize(prices) if len(prices) else (0, None, 0.0)}
+    for mouza in np.unique(mouzas):
+        if mouza:
+            summaries[mouza] = summarize(prices[mouzas == mouza])
+
+    PriceAggregate.objects.filter(land_use_zone=zone).delete()
+    PriceAggregate.objects.bulk_create(
+        PriceAggregate(
+            land_use_zone=zone,
+            mouza_name=mouza,
+            window_start=start,
+            window_end=end,
+            sales=count,
+            median_price_per_area=None if median is None else Decimal(f'{median:.2f}'),
+            dispersion=dispersion,
+            fingerprint=fingerprint if not mouza else '',
+        )
+        for mouza, (count, median, dispersion) in summaries.items()
+    )
+    return summaries
+
+
+def _upsert_valuations(valuations):
+    fields = ['estimated_value', 'price_per_area', 'comparables', 'level', 'confidence', 'valued_at']
+    unique_fields = ['parcel'] if connection.features.supports_update_conflicts_with_target else None
+    ParcelValuation.objects.bulk_create(
+        valuations, update_conflicts=True, unique_fields=unique_fields, update_fields=fields,
+        batch_size=CHUNK_SIZE,
+    )
+
+
+def value_zone(zone, summaries):
+    """Estimate every parcel of the zone in vectorized chunks; returns the number valued"""
+    zone_sales, zone_median, zone_dispersion = summaries['']
+    if not zone_sales:
+        ParcelValuation.objects.filter(parcel__land_use_zone=zone).delete()
+        return 0
+
+    usable = [mouza for mouza, (count, _, _) in summaries.items() if mouza and count >= MIN_COMPARABLES]
+    codes = {mouza: code for code, mouza in enumerate(usable)}
+    mouza_sales = np.array([summaries[mouza][0] for mouza in usable], dtype=float)
+    mouza_median = np.array([summaries[mouza][1] for mouza in usable], dtype=float)
+    mouza_dispersion = np.array([summaries[mouza][2] for mouza in usable], dtype=float)
+
+    now = timezone.now()
+    valued = 0
+    last_pk = 0
+    parcels = LandParcel.objects.filter(land_use_zone=zone, area__gt=0).order_by('pk')
+    while True:
+        rows = list(parcels.filter(pk__gt=last_pk).values_list('pk', 'mouza_name', 'area')[:CHUNK_SIZE])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        pks, mouzas, areas = zip(*rows)
+        code = np.fromiter((codes.get(mouza, -1) for mouza in mouzas), np.int64, len(rows))
+        local = code >= 0
+        safe = np.where(local, code, 0)
+        if usable:
+            price = np.where(local, mouza_median[safe], zone_median)
+            comparables = np.where(local, mouza_sales[safe], zone_sales)
+            dispersion = np.where(local, mouza_dispersion[safe], zone_dispersion)
+        else:
+            price = np.full(len(rows), zone_median)
+            comparables = np.full(len(rows), float(zone_sales))
+            dispersion = np.full(len(rows), zone_dispersion)
+        confidence = (comparables / (comparables + MIN_COMPARABLES) * np.exp(-dispersion)
+                      * np.where(local, 1.0, ZONE_LEVEL_CONFIDENCE))
+        value = np.round(np.array(areas, dtype=float) * price, 2)
+
+        _upsert_valuations([
+            ParcelValuation(
+                parcel_id=pks[i],
+                estimated_value=Decimal(f'{value[i]:.2f}'),
+                price_per_area=Decimal(f'{price[i]:.2f}'),
+                comparables=int(comparables[i]),
+                level='mouza' if local[i] else 'zone',
+                confidence=round(float(confidence[i]), 3),
+                valued_at=now,
+            )
+            for i in range(len(rows))
+        ])
+        valued += len(rows)
+    return valued
+
+
+def run(as_of=None, quarters=WINDOW_QUARTERS, full=False, progress=None):
+    """
+    Refresh aggregates and parcel valuations for the zones whose evidence
+    changed (every zone with ``full``). Returns {zone: {sales, valued}}.
+    """
+    start, end = valuation_window(as_of, quarters)
+    current = fingerprints(start, end)
+    stored = dict(PriceAggregate.objects.filter(mouza_name='').values_list('land_use_zone', 'fingerprint'))
+
+    results = {}
+    for zone in ZONES:
+        if not full and stored.get(zone) == current[zone]:
+            continue
+        with transaction.atomic():
+            summaries = rebuild_aggregates(zone, start, end, current[zone])
+            results[zone] = {'sales': summaries[''][0], 'valued': value_zone(zone, summaries)}
+        if progress:
+            progress(zone, results[zone])
+    return results
+
+
+def apply(min_confidence, zones=None):
+    """Copy estimates with at least ``min_confidence`` into current_market_value"""
+    valuations = ParcelValuation.objects.filter(confidence__gte=min_confidence).order_by('parcel_id')
+    if zones:
+        valuations = valuations.filter(parcel__land_use_zone__in=zones)
+
+    updated = 0
+    last_pk = 0
+    while True:
+        rows = list(valuations.filter(parcel_id__gt=last_pk).values_list(
+            'parcel_id', 'estimated_value', 'parcel__current_market_value'
+        )[:CHUNK_SIZE])
+        if not rows:
+            return updated
+        last_pk = rows[-1][0]
+        changed = {parcel_id: estimate for parcel_id, estimate, current in rows if estimate != current}
+        if changed:
+            update_parcels('current_market_value', changed)
+            updated += len(changed)
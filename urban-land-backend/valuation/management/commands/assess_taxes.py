@@ -0,0 +1,78 @@
+# valuation/management/commands/assess_taxes.py
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from land.models import LandParcel
+from valuation import assessment
+from valuation.models import TaxRateTable
+
+
+class Command(BaseCommand):
+    help = "Recompute LandParcel.annual_tax_value from a tax rate table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate-table", type=int, dest="version",
+                            help="Rate table version (default: newest one in effect today)")
+        parser.add_argument("--dry-run", action="store_true", help="Report the changes without writing them")
+        parser.add_argument("--diff", help="Write every changed parcel (parcel_id, before, after) to this CSV file")
+        parser.add_argument("--zone", choices=[zone for zone, _ in LandParcel.LAND_USE_ZONE_CHOICES],
+                            help="Only assess parcels in this land use zone")
+        parser.add_argument("--chunk-size", type=int, default=assessment.CHUNK_SIZE)
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        if options["version"]:
+            table = TaxRateTable.objects.filter(version=options["version"]).first()
+        else:
+            table = assessment.current_table()
+        if table is None:
+            raise CommandError("No tax rate table found; publish one with import_tax_rates")
+
+        queryset = LandParcel.objects.all()
+        if options["zone"]:
+            queryset = queryset.filter(land_use_zone=options["zone"])
+
+        started = time.perf_counter()
+        diff_file = open(options["diff"], "w", newline="") if options["diff"] else None
+        try:
+            diff = None
+            if diff_file:
+                diff = csv.writer(diff_file)
+                diff.writerow(["parcel_id", "before", "after"])
+            report = assessment.assess(
+                table, queryset,
+                dry_run=options["dry_run"],
+                chunk_size=options["chunk_size"],
+                diff=diff,
+                progress=lambda done: self.stderr.write(f"  {done} parcels"),
+            )
+        finally:
+            if diff_file:
+                diff_file.close()
+
+        result = report.as_dict()
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+
+        self.stdout.write(f"Rate table v{table.version} ({table.name})")
+        self.stdout.write(f"{'zone':14} {'parcels':>9} {'changed':>9} {'before':>16} {'after':>16}")
+        for zone, stats in result["zones"].items():
+            self.stdout.write(f"{zone:14} {stats['parcels']:>9} {stats['changed']:>9} "
+                              f"{stats['total_before']:>16,.2f} {stats['total_after']:>16,.2f}")
+        self.stdout.write(f"{'total':14} {result['parcels']:>9} {result['changed']:>9} "
+                          f"{result['total_before']:>16,.2f} {result['total_after']:>16,.2f}")
+        if result["unrated"]:
+            self.stdout.write(self.style.WARNING(f"{result['unrated']} parcels have no matching rate and were left alone"))
+        if result["largest_changes"]:
+            self.stdout.write("Largest changes:")
+            for change in result["largest_changes"]:
+                self.stdout.write(f"  parcel {change['parcel_id']}: {change['before']} -> {change['after']}")
+
+        verb = "Would update" if options["dry_run"] else "Updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['changed']} of {result['parcels']} parcels in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,52 @@
+# valuation/management/commands/estimate_values.py
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from valuation import comparables
+
+
+class Command(BaseCommand):
+    help = "Estimate parcel market values from comparable sales (only zones whose sales changed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--as-of", help="Value as of this date, YYYY-MM-DD (default today)")
+        parser.add_argument("--window-quarters", type=int, default=comparables.WINDOW_QUARTERS,
+                            help="Number of calendar quarters of sales to use")
+        parser.add_argument("--full", action="store_true", help="Recompute every zone, changed or not")
+        parser.add_argument("--apply", action="store_true",
+                            help="Also copy confident estimates into LandParcel.current_market_value")
+        parser.add_argument("--min-confidence", type=float, default=0.5,
+                            help="Minimum confidence (0-1) for --apply")
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options["as_of"]:
+            try:
+                as_of = datetime.date.fromisoformat(options["as_of"])
+            except ValueError:
+                raise CommandError("--as-of must be a date in YYYY-MM-DD format")
+        if options["window_quarters"] < 1:
+            raise CommandError("--window-quarters must be at least 1")
+
+        started = time.perf_counter()
+        start, end = comparables.valuation_window(as_of, options["window_quarters"])
+        self.stdout.write(f"Sales window {start} to {end}")
+        results = comparables.run(
+            as_of, options["window_quarters"], full=options["full"],
+            progress=lambda zone, stats: self.stdout.write(
+                f"  {zone:14} {stats['sales']:>7} sales {stats['valued']:>9} parcels valued"
+            ),
+        )
+        if not results:
+            self.stdout.write("No zone has new sales or parcels; nothing to recompute")
+
+        if options["apply"]:
+            updated = comparables.apply(options["min_confidence"])
+            self.stdout.write(f"Updated current_market_value of {updated} parcels")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Valued {sum(stats['valued'] for stats in results.values())} parcels in "
+            f"{len(results)} zones in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,58 @@
+# valuation/management/commands/import_tax_rates.py
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from valuation.models import TaxRate, TaxRateTable
+
+RATE_FIELDS = ('land_use_zone', 'development_status', 'value_rate', 'area_rate',
+               'structure_surcharge', 'minimum_tax')
+
+
+class Command(BaseCommand):
+    help = "Publish a new tax rate table version from a JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help='JSON file: {"name": ..., "effective_from": "YYYY-MM-DD", "notes": ..., '
+                 '"rates": [{"land_use_zone": ..., "development_status": ..., "value_rate": ..., '
+                 '"area_rate": ..., "structure_surcharge": ..., "minimum_tax": ...}]}'
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"]) as handle:
+            spec = json.load(handle)
+        if not spec.get("rates"):
+            raise CommandError("The file has no rates")
+
+        with transaction.atomic():
+            version = (TaxRateTable.objects.aggregate(latest=Max("version"))["latest"] or 0) + 1
+            table = TaxRateTable.objects.create(
+                version=version,
+                name=spec.get("name", f"Rates v{version}"),
+                effective_from=spec["effective_from"],
+                notes=spec.get("notes", ""),
+            )
+            rates = []
+            for row in spec["rates"]:
+                unknown = set(row) - set(RATE_FIELDS)
+                if unknown:
+                    raise CommandError(f"Unknown rate fields: {', '.join(sorted(unknown))}")
+                # Blank zone / status means "any"
+                values = {**row, "land_use_zone": row.get("land_use_zone") or "",
+                          "development_status": row.get("development_status") or ""}
+                rate = TaxRate(table=table, **values)
+                try:
+                    rate.full_clean(exclude=["table"], validate_constraints=False)
+                except ValidationError as error:
+                    raise CommandError(f"Invalid rate {row}: {error.message_dict}")
+                rates.append(rate)
+            TaxRate.objects.bulk_create(rates)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Published tax rates v{version} with {len(rates)} rates, effective {table.effective_from}"
+        ))
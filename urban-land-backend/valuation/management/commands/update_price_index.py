@@ -0,0 +1,26 @@
+# valuation/management/commands/update_price_index.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from valuation import price_index
+
+
+class Command(BaseCommand):
+    help = "Recompute the land price index for zones with new or changed sales"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Recompute every zone, e.g. after bulk imports that bypass signals")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = price_index.refresh(
+            rebuild=options["rebuild"],
+            progress=lambda zone, rows: self.stdout.write(f"  {zone:14} {rows:>7} rows"),
+        )
+        if not results:
+            self.stdout.write("Price index is up to date")
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {len(results)} zones in {time.perf_counter() - started:.1f}s"
+        ))
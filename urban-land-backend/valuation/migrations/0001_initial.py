@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaxRateTable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('effective_from', models.DateField()),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-version'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaxRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('land_use_zone', models.CharField(blank=True, choices=[('Residential', 'Residential'), ('Commercial', 'Commercial'), ('Industrial', 'Industrial'), ('Agricultural', 'Agricultural'), ('Public', 'Public'), ('Mixed', 'Mixed')], max_length=50)),
+                ('development_status', models.CharField(blank=True, choices=[('Undeveloped', 'Undeveloped'), ('Under_Construction', 'Under Construction'), ('Developed', 'Developed'), ('Government_Hold', 'Government Hold')], max_length=50)),
+                ('value_rate', models.DecimalField(decimal_places=6, default=0, max_digits=8)),
+                ('area_rate', models.DecimalField(decimal_places=4, default=0, max_digits=12)),
+                ('structure_surcharge', models.DecimalField(decimal_places=4, default=0, max_digits=6)),
+                ('minimum_tax', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('table', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='valuation.taxratetable')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('table', 'land_use_zone', 'development_status'), name='unique_tax_rate_per_class')],
+            },
+        ),
+    ]
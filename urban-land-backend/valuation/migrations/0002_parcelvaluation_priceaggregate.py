@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('land', '0001_initial'),
+        ('valuation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParcelValuation',
+            fields=[
+                ('parcel', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='valuation', serialize=False, to='land.landparcel')),
+                ('estimated_value', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('price_per_area', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('comparables', models.PositiveIntegerField()),
+                ('level', models.CharField(choices=[('mouza', 'Zone and mouza comparables'), ('zone', 'Zone comparables')], max_length=10)),
+                ('confidence', models.FloatField()),
+                ('valued_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PriceAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('land_use_zone', models.CharField(choices=[('Residential', 'Residential'), ('Commercial', 'Commercial'), ('Industrial', 'Industrial'), ('Agricultural', 'Agricultural'), ('Public', 'Public'), ('Mixed', 'Mixed')], max_length=50)),
+                ('mouza_name', models.CharField(blank=True, max_length=100)),
+                ('window_start', models.DateField()),
+                ('window_end', models.DateField()),
+                ('sales', models.PositiveIntegerField(default=0)),
+                ('median_price_per_area', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('dispersion', models.FloatField(default=0)),
+                ('fingerprint', models.CharField(blank=True, max_length=64)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('land_use_zone', 'mouza_name'), name='unique_price_aggregate')],
+            },
+        ),
+    ]
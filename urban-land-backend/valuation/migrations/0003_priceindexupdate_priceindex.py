@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('valuation', '0002_parcelvaluation_priceaggregate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceIndexUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('land_use_zone', models.CharField(max_length=50, unique=True)),
+                ('requested_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PriceIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('land_use_zone', models.CharField(choices=[('Residential', 'Residential'), ('Commercial', 'Commercial'), ('Industrial', 'Industrial'), ('Agricultural', 'Agricultural'), ('Public', 'Public'), ('Mixed', 'Mixed')], max_length=50)),
+                ('mouza_name', models.CharField(blank=True, max_length=100)),
+                ('quarter', models.DateField()),
+                ('sales', models.PositiveIntegerField()),
+                ('median_price_per_area', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('median_index', models.FloatField(blank=True, null=True)),
+                ('repeat_pairs', models.PositiveIntegerField(default=0)),
+                ('repeat_sales_index', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('land_use_zone', 'mouza_name', 'quarter'), name='unique_price_index')],
+            },
+        ),
+    ]
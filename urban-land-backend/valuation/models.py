@@ -0,0 +1,133 @@
+# valuation/models.py
+from django.db import models
+
+from accounts.models import User
+from land.models import LandParcel
+
+
+class TaxRateTable(models.Model):
+    """
+    A published set of tax rates. Tables are not edited once used for an
+    assessment; a rate change is published as a new version.
+    """
+    version = models.PositiveIntegerField(unique=True)
+    name = models.CharField(max_length=100)
+    effective_from = models.DateField()
+    notes = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-version']
+
+    def __str__(self):
+        return f"Tax rates v{self.version} ({self.name})"
+
+
+class TaxRate(models.Model):
+    """
+    Rate for one zone / development status combination. A blank zone or
+    status matches any parcel; the most specific matching row wins.
+
+    tax = (market value * value_rate + area * area_rate)
+          * (1 + structure_surcharge if the parcel has structures)
+    and never less than minimum_tax.
+    """
+    table = models.ForeignKey(TaxRateTable, on_delete=models.CASCADE, related_name='rates')
+    land_use_zone = models.CharField(max_length=50, choices=LandParcel.LAND_USE_ZONE_CHOICES, blank=True)
+    development_status = models.CharField(
+        max_length=50, choices=LandParcel.DEVELOPMENT_STATUS_CHOICES, blank=True
+    )
+    value_rate = models.DecimalField(max_digits=8, decimal_places=6, default=0)
+    area_rate = models.DecimalField(max_digits=12, decimal_places=4, default=0)
+    structure_surcharge = models.DecimalField(max_digits=6, decimal_places=4, default=0)
+    minimum_tax = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['table', 'land_use_zone', 'development_status'],
+                name='unique_tax_rate_per_class',
+            ),
+        ]
+
+    def __str__(self):
+        return f"v{self.table.version} {self.land_use_zone or 'any zone'} / {self.development_status or 'any status'}"
+
+
+class PriceAggregate(models.Model):
+    """
+    Sales evidence for one zone and mouza over the valuation window. The
+    row with a blank mouza covers the whole zone and carries the fingerprint
+    of the sales and parcels it was computed from.
+    """
+    land_use_zone = models.CharField(max_length=50, choices=LandParcel.LAND_USE_ZONE_CHOICES)
+    mouza_name = models.CharField(max_length=100, blank=True)
+    window_start = models.DateField()
+    window_end = models.DateField()
+    sales = models.PositiveIntegerField(default=0)
+    median_price_per_area = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    # Standard deviation of log(price per area); 0 when there is a single sale
+    dispersion = models.FloatField(default=0)
+    fingerprint = models.CharField(max_length=64, blank=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['land_use_zone', 'mouza_name'], name='unique_price_aggregate'),
+        ]
+
+    def __str__(self):
+        return f"{self.land_use_zone} / {self.mouza_name or 'all mouzas'}: {self.sales} sales"
+
+
+class ParcelValuation(models.Model):
+    """Latest automated estimate of a parcel's market value"""
+    LEVELS = [
+        ('mouza', 'Zone and mouza comparables'),
+        ('zone', 'Zone comparables'),
+    ]
+
+    parcel = models.OneToOneField(LandParcel, on_delete=models.CASCADE, primary_key=True, related_name='valuation')
+    estimated_value = models.DecimalField(max_digits=15, decimal_places=2)
+    price_per_area = models.DecimalField(max_digits=15, decimal_places=2)
+    comparables = models.PositiveIntegerField()
+    level = models.CharField(max_length=10, choices=LEVELS)
+    confidence = models.FloatField()
+    valued_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Parcel {self.parcel_id}: {self.estimated_value} ({self.confidence:.0%})"
+
+
+class PriceIndex(models.Model):
+    """
+    One quarter of a land price series for a zone, or for a zone and mouza.
+    Indexes are relative to the series' first quarter (= 100); the repeat
+    sales index is only computed for whole-zone series.
+    """
+    land_use_zone = models.CharField(max_length=50, choices=LandParcel.LAND_USE_ZONE_CHOICES)
+    mouza_name = models.CharField(max_length=100, blank=True)
+    quarter = models.DateField()
+    sales = models.PositiveIntegerField()
+    median_price_per_area = models.DecimalField(max_digits=15, decimal_places=2)
+    median_index = models.FloatField(null=True, blank=True)
+    repeat_pairs = models.PositiveIntegerField(default=0)
+    repeat_sales_index = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['land_use_zone', 'mouza_name', 'quarter'], name='unique_price_index'),
+        ]
+
+    def __str__(self):
+        return f"{self.land_use_zone} / {self.mouza_name or 'all mouzas'} {self.quarter}"
+
+
+class PriceIndexUpdate(models.Model):
+    """A zone whose price index is out of date because of new or changed sales"""
+    land_use_zone = models.CharField(max_length=50, unique=True)
+    requested_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.land_use_zone} since {self.requested_at}"
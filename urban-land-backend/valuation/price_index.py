@@ -0,0 +1,148 @@
+# valuation/price_index.py
+"""
+Quarterly land price index per zone and per zone and mouza.
+
+Each series has a median price per area per quarter and a median index
+(first quarter = 100). Whole-zone series also get a repeat-sales index
+(Bailey-Muth-Nourse): every pair of consecutive sales of the same parcel
+gives log(price2 / price1) = b[q2] - b[q1], and the quarter effects b are
+solved by least squares from the accumulated normal equations.
+
+Saving a sale, or moving a parcel with sales to another zone, marks the
+zones involved in PriceIndexUpdate (see signals). refresh() recomputes
+only the marked zones, but each of them in full (every sale and quarter
+of the zone, one vectorized pass), not just the new quarters. It runs
+from cron through update_price_index; the index endpoint only serves the
+stored rows and lists zones still waiting at /stale/.
+"""
+import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .comparables import ZONES, sales
+from .models import PriceIndex, PriceIndexUpdate
+
+
+def quarter_number(date):
+    return date.year * 4 + (date.month - 1) // 3
+
+
+def quarter_date(number):
+    return datetime.date(number // 4, 3 * (number % 4) + 1, 1)
+
+
+def mark_stale(zone):
+    if zone in ZONES:
+        # update_or_create bumps requested_at, so a refresh already running
+        # for this zone leaves the mark in place
+        PriceIndexUpdate.objects.update_or_create(land_use_zone=zone)
+
+
+def grouped_medians(keys, values):
+    """{key: (count, median)} for each distinct key"""
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    unique, starts = np.unique(keys, return_index=True)
+    ends = np.append(starts[1:], len(keys))
+    return {
+        int(key): (int(end - start), float(np.median(values[start:end])))
+        for key, start, end in zip(unique, starts, ends)
+    }
+
+
+def repeat_sales_index(parcels, quarters, prices):
+    """{quarter number: (pairs touching it, index)}, first quarter with a pair = 100"""
+    order = np.lexsort((quarters, parcels))
+    parcels, quarters, prices = parcels[order], quarters[order], prices[order]
+    pair = (parcels[1:] == parcels[:-1]) & (quarters[1:] > quarters[:-1])
+    first, second = quarters[:-1][pair], quarters[1:][pair]
+    if not len(first):
+        return {}
+    change = np.log(prices[1:][pair] / prices[:-1][pair])
+
+    columns = np.unique(np.concatenate([first, second]))
+    i, j = np.searchsorted(columns, first), np.searchsorted(columns, second)
+    size = len(columns)
+    normal = np.zeros((size, size))
+    target = np.zeros(size)
+    np.add.at(normal, (i, i), 1)
+    np.add.at(normal, (j, j), 1)
+    np.add.at(normal, (i, j), -1)
+    np.add.at(normal, (j, i), -1)
+    np.add.at(target, j, change)
+    np.add.at(target, i, -change)
+    pairs = np.bincount(i, minlength=size) + np.bincount(j, minlength=size)
+
+    # The base quarter's effect is fixed at 0
+    effects = np.zeros(size)
+    if size > 1:
+        effects[1:] = np.linalg.lstsq(normal[1:, 1:], target[1:], rcond=None)[0]
+    return {
+        int(quarter): (int(count), float(100 * np.exp(effect)))
+        for quarter, count, effect in zip(columns, pairs, effects)
+    }
+
+
+def compute_zone(zone):
+    """PriceIndex rows (unsaved) for the zone and each of its mouzas"""
+    evidence = sales(land_use_zone=zone)
+    if not evidence:
+        return []
+    parcels = np.fromiter((parcel_id for parcel_id, _ in evidence), np.int64, len(evidence))
+    quarters = np.fromiter((quarter_number(date) for _, date in evidence), np.int64, len(evidence))
+    prices = np.array([float(price) / area for price, area, _, _ in evidence.values()])
+    mouza_names = sorted({mouza or '' for _, _, _, mouza in evidence.values()} - {''})
+    codes = {mouza: code for code, mouza in enumerate(mouza_names, start=1)}
+    mouzas = np.fromiter((codes.get(mouza, 0) for _, _, _, mouza in evidence.values()), np.int64, len(evidence))
+
+    repeat = repeat_sales_index(parcels, quarters, prices)
+    span = int(quarters.max()) + 1
+    series = [('', grouped_medians(quarters, prices))]
+    by_mouza = {code: {} for code in codes.values()}
+    for key, value in grouped_medians(mouzas * span + quarters, prices).items():
+        if key >= span:
+            by_mouza[key // span][key % span] = value
+    series += [(mouza, by_mouza[code]) for mouza, code in codes.items()]
+
+    rows = []
+    for mouza, medians in series:
+        base = medians[min(medians)][1]
+        for quarter, (count, median) in sorted(medians.items()):
+            pairs, repeat_index = repeat.get(quarter, (0, None)) if not mouza else (0, None)
+            rows.append(PriceIndex(
+                land_use_zone=zone,
+                mouza_name=mouza,
+                quarter=quarter_date(quarter),
+                sales=count,
+                median_price_per_area=Decimal(f'{median:.2f}'),
+                median_index=round(100 * median / base, 2),
+                repeat_pairs=pairs,
+                repeat_sales_index=None if repeat_index is None else round(repeat_index, 2),
+            ))
+    return rows
+
+
+def refresh(rebuild=False, progress=None):
+    """Recompute the zones marked stale (every zone with ``rebuild``); returns {zone: rows}"""
+    if rebuild:
+        zones = ZONES
+    else:
+        zones = list(PriceIndexUpdate.objects.values_list('land_use_zone', flat=True))
+
+    results = {}
+    for zone in zones:
+        started = timezone.now()
+        rows = compute_zone(zone)
+        with transaction.atomic():
+            PriceIndex.objects.filter(land_use_zone=zone).delete()
+            PriceIndex.objects.bulk_create(rows, batch_size=5000)
+            # A sale saved while this zone was computed keeps its mark
+            PriceIndexUpdate.objects.filter(land_use_zone=zone, requested_at__lte=started).delete()
+        results[zone] = len(rows)
+        if progress:
+            progress(zone, len(rows))
+    return results
+
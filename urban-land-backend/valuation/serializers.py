@@ -0,0 +1,18 @@
+# valuation/serializers.py
+from rest_framework import serializers
+from .models import PriceIndex
+
+
+class PriceIndexSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PriceIndex
+        fields = [
+            "land_use_zone",
+            "mouza_name",
+            "quarter",
+            "sales",
+            "median_price_per_area",
+            "median_index",
+            "repeat_pairs",
+            "repeat_sales_index",
+        ]
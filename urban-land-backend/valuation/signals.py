@@ -0,0 +1,73 @@
+# valuation/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from audit.versioning import bulk_saved
+from land.models import LandParcel
+from records.models import OwnershipRecord
+from transactions.models import LandTransaction
+from .comparables import SALE_ACQUISITIONS, recorded_purchases, transaction_sales
+from .price_index import mark_stale
+
+LOOKUP_CHUNK = 1000
+
+
+def _parcel_zone(parcel_id):
+    return LandParcel.objects.filter(pk=parcel_id).values_list('land_use_zone', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=LandTransaction)
+def transaction_changed(sender, instance, raw=False, **kwargs):
+    if not raw and instance.transaction_type == 'sale':
+        mark_stale(_parcel_zone(instance.parcel_id))
+
+
+@receiver([post_save, post_delete], sender=OwnershipRecord)
+def ownership_changed(sender, instance, raw=False, **kwargs):
+    if not raw and instance.acquisition_type in SALE_ACQUISITIONS and instance.acquisition_value:
+        mark_stale(_parcel_zone(instance.parcel_id))
+
+
+def _with_sales(pks):
+    """The parcels among ``pks`` with sales evidence"""
+    found = set()
+    for start in range(0, len(pks), LOOKUP_CHUNK):
+        chunk = pks[start:start + LOOKUP_CHUNK]
+        for queryset in (transaction_sales(), recorded_purchases()):
+            found.update(queryset.filter(parcel_id__in=chunk).values_list('parcel_id', flat=True))
+    return found
+
+
+def _zones_moved(moves):
+    """Mark both zones of every (parcel, old zone, new zone) move of a parcel with sales"""
+    moves = [(pk, old, new) for pk, old, new in moves if old != new]
+    if not moves:
+        return
+    with_sales = _with_sales([pk for pk, _, _ in moves])
+    for zone in {zone for pk, old, new in moves if pk in with_sales for zone in (old, new)}:
+        mark_stale(zone)
+
+
+@receiver(pre_save, sender=LandParcel)
+def parcel_saving(sender, instance, raw=False, **kwargs):
+    instance._price_index_zone = None
+    if not raw and instance.pk is not None:
+        instance._price_index_zone = _parcel_zone(instance.pk)
+
+
+@receiver(post_save, sender=LandParcel)
+def parcel_saved(sender, instance, raw=False, created=False, **kwargs):
+    # Its sales leave the old zone's index and join the new zone's
+    if not raw and not created:
+        _zones_moved([(instance.pk, getattr(instance, '_price_index_zone', None), instance.land_use_zone)])
+
+
+@receiver(bulk_saved, sender=LandParcel)
+def parcels_bulk_saved(sender, pks, previous=None, **kwargs):
+    if not previous:
+        return
+    moves = []
+    for start in range(0, len(pks), LOOKUP_CHUNK):
+        rows = LandParcel.objects.filter(pk__in=pks[start:start + LOOKUP_CHUNK]).values_list('pk', 'land_use_zone')
+        moves += [(pk, previous[pk]['land_use_zone'], zone) for pk, zone in rows if pk in previous]
+    _zones_moved(moves)
@@ -0,0 +1,159 @@
+import csv
+import datetime
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from land.models import LandParcel
+from transactions.models import LandTransaction
+from . import assessment, comparables
+from .models import PriceIndex, PriceIndexUpdate, TaxRate, TaxRateTable
+
+
+class PriceIndexStalenessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.parcel = LandParcel.objects.create(
+            location="Block 1", area=100.0, land_use_type="Residential", land_use_zone="Residential",
+            cadastral_number="CAD-1", registration_date="2024-01-15",
+        )
+        LandTransaction.objects.create(
+            parcel=cls.parcel, transaction_type="sale", transaction_date="2024-02-01",
+            amount=50000, status="completed",
+        )
+
+    def setUp(self):
+        PriceIndexUpdate.objects.all().delete()
+
+    def stale_zones(self):
+        return set(PriceIndexUpdate.objects.values_list("land_use_zone", flat=True))
+
+    def test_saving_a_parcel_into_another_zone_marks_both(self):
+        self.parcel.land_use_zone = "Commercial"
+        self.parcel.save()
+        self.assertEqual(self.stale_zones(), {"Residential", "Commercial"})
+
+    def test_bulk_zone_change_marks_both(self):
+        LandParcel.objects.filter(pk=self.parcel.pk).update(land_use_zone="Industrial")
+        self.assertEqual(self.stale_zones(), {"Residential", "Industrial"})
+
+    def test_other_changes_mark_nothing(self):
+        self.parcel.location = "Block 2"
+        self.parcel.save()
+        LandParcel.objects.filter(pk=self.parcel.pk).update(status="pending")
+        self.assertEqual(self.stale_zones(), set())
+
+    def test_reading_the_index_only_serves_stored_rows(self):
+        PriceIndexUpdate.objects.create(land_use_zone="Residential")
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("officer", password="x", role="admin"))
+
+        response = client.get("/api/analytics/price-index/", {"land_use_zone": "Residential"})
+        self.assertEqual((response.status_code, response.data), (200, []))
+        response = client.get("/api/analytics/price-index/stale/")
+        self.assertEqual([row["land_use_zone"] for row in response.data], ["Residential"])
+
+        call_command("update_price_index", stdout=io.StringIO())
+        response = client.get("/api/analytics/price-index/", {"land_use_zone": "Residential"})
+        self.assertEqual([row["sales"] for row in response.data], [1])
+        self.assertEqual(self.stale_zones(), set())
+        self.assertEqual(PriceIndex.objects.filter(land_use_zone="Residential").count(), 1)
+
+class AssessmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.table = TaxRateTable.objects.create(version=1, name="2026", effective_from=datetime.date(2026, 1, 1))
+        for zone, status, rate in (("", "", "0.001"), ("Residential", "", "0.002"),
+                                   ("", "Developed", "0.003"), ("Residential", "Developed", "0.004")):
+            TaxRate.objects.create(table=cls.table, land_use_zone=zone, development_status=status,
+                                   value_rate=Decimal(rate))
+
+    def parcel(self, number, zone=None, status=None, market_value="125.00"):
+        return LandParcel.objects.create(
+            location=f"Block {number}", area=100.0, land_use_type="Residential", cadastral_number=f"CAD-{number}",
+            registration_date="2024-01-15", land_use_zone=zone, development_status=status,
+            current_market_value=Decimal(market_value),
+        )
+
+    def test_most_specific_rate_wins(self):
+        matrix = assessment.RateMatrix(self.table)
+        rate = lambda zone, status: matrix.value_rate[assessment.ZONE_CODES[zone], assessment.STATUS_CODES[status]]
+        self.assertEqual(rate("Residential", "Developed"), 0.004)
+        self.assertEqual(rate("Residential", "Undeveloped"), 0.002)
+        self.assertEqual(rate("Commercial", "Developed"), 0.003)
+        self.assertEqual(rate("Commercial", None), 0.001)
+
+    def test_half_cents_round_up(self):
+        parcel = self.parcel(1)  # 125.00 * 0.001 = 0.125
+        assessment.assess(self.table)
+        parcel.refresh_from_db()
+        self.assertEqual(parcel.annual_tax_value, Decimal("0.13"))
+
+    def test_written_parcels_are_stamped_once(self):
+        parcel = self.parcel(1)
+        before = parcel.last_updated
+        with CaptureQueriesContext(connection) as queries:
+            assessment.update_parcels("annual_tax_value", {parcel.pk: Decimal("5.00")})
+        stamps = [query["sql"] for query in queries if query["sql"].startswith("UPDATE")
+                  and "last_updated" in query["sql"]]
+        self.assertEqual(len(stamps), 1)
+        parcel.refresh_from_db()
+        self.assertGreater(parcel.last_updated, before)
+
+    def test_dry_run_writes_only_the_diff(self):
+        unchanged = self.parcel(1, "Residential", market_value="1000.00")
+        LandParcel.objects.filter(pk=unchanged.pk).update(annual_tax_value=Decimal("2.00"))
+        changed = self.parcel(2, "Residential", "Developed", market_value="1000.00")
+        diff = io.StringIO()
+
+        report = assessment.assess(self.table, dry_run=True, diff=csv.writer(diff))
+
+        self.assertEqual(list(csv.reader(io.StringIO(diff.getvalue()))), [[str(changed.pk), "", "4.00"]])
+        self.assertEqual((report.parcels, report.changed, report.total_after), (2, 1, 6.0))
+        changed.refresh_from_db()
+        self.assertIsNone(changed.annual_tax_value)
+
+
+class ComparablesFingerprintTests(TestCase):
+    as_of = datetime.date(2026, 10, 19)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sales = []
+        for number, area in ((1, 100.0), (2, 200.0)):
+            parcel = LandParcel.objects.create(
+                location=f"Block {number}", area=area, land_use_type="Residential", land_use_zone="Residential",
+                mouza_name="North", cadastral_number=f"CAD-{number}", registration_date="2024-01-15",
+            )
+            cls.sales.append(LandTransaction.objects.create(
+                parcel=parcel, transaction_type="sale", transaction_date=datetime.date(2026, 2, number),
+                amount=Decimal(10000 * number), status="completed",
+            ))
+
+    def run_zones(self):
+        return set(comparables.run(as_of=self.as_of))
+
+    def test_unchanged_evidence_is_not_recomputed(self):
+        self.assertIn("Residential", self.run_zones())
+        self.assertEqual(self.run_zones(), set())
+
+    def test_edited_sales_with_the_same_totals_are_recomputed(self):
+        self.run_zones()
+        first, second = self.sales
+        first.amount, second.amount = second.amount, first.amount
+        first.save()
+        second.save()
+        self.assertEqual(self.run_zones(), {"Residential"})
+
+    def test_edited_parcels_are_recomputed(self):
+        self.run_zones()
+        parcel = self.sales[0].parcel
+        parcel.mouza_name = "South"
+        parcel.save()
+        self.assertEqual(self.run_zones(), {"Residential"})
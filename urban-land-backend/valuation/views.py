@@ -0,0 +1,38 @@
+# valuation/views.py
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from accounts.permissions import IsAdminOrOfficer
+from .models import PriceIndex, PriceIndexUpdate
+from .serializers import PriceIndexSerializer
+
+
+class PriceIndexViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Quarterly land price series, oldest quarter first. Whole-zone series
+    by default; pass ?mouza_name= for a mouza's series. Filter with
+    ?land_use_zone=, ?quarter__gte= and ?quarter__lte=. Sales saved since
+    the last update_price_index run show up under stale/ until it runs.
+    """
+    serializer_class = PriceIndexSerializer
+    permission_classes = [IsAdminOrOfficer]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        'land_use_zone': ['exact'],
+        'quarter': ['gte', 'lte'],
+    }
+    # A series is a few hundred quarters at most
+    pagination_class = None
+
+    def get_queryset(self):
+        mouza = self.request.query_params.get('mouza_name', '')
+        return PriceIndex.objects.filter(mouza_name=mouza).order_by('land_use_zone', 'quarter')
+
+    @action(detail=False, methods=['get'])
+    def stale(self, request):
+        """Zones with sales not yet reflected in the index"""
+        return Response(list(
+            PriceIndexUpdate.objects.order_by('land_use_zone').values('land_use_zone', 'requested_at')
+        ))